@@ -1,47 +1,145 @@
-from stockfish import Stockfish
-import os
-import subprocess
+import threading
+
+from engine_pool import ENGINE_POOL, START_FEN
+from eval_cache import get_eval_cache, position_key
+from opening_book import BookEngine, get_book
+from profiler import profiled
+from settings import BOOK_PATH, EVAL_CACHE_PATH
+
+# Puntuación de un mate en 0 jugadas (igual que en native_engine)
+MATE_SCORE = 100_000
+
+
+def parse_search_info(lines):
+    """
+    Extrae la puntuación (centipeones desde el bando que mueve; los mates
+    como MATE_SCORE menos las jugadas), la variante principal y la
+    profundidad alcanzada de la salida de una búsqueda de Stockfish.
+
+    Returns:
+        tuple: (puntuación o None, lista de jugadas UCI, profundidad)
+    """
+    for line in reversed(lines):
+        tokens = line.split()
+        if not tokens or tokens[0] != 'info' or 'score' not in tokens:
+            continue
+        index = tokens.index('score')
+        kind, value = tokens[index + 1], int(tokens[index + 2])
+        if kind == 'mate':
+            score = MATE_SCORE - abs(value) if value > 0 else -MATE_SCORE + abs(value)
+        else:
+            score = value
+        pv = tokens[tokens.index('pv') + 1:] if 'pv' in tokens else []
+        depth = int(tokens[tokens.index('depth') + 1]) if 'depth' in tokens else 0
+        return score, pv, depth
+    return None, [], 0
 
 
 class ChessAI:
-    def __init__(self, difficulty):
+    def __init__(self, difficulty, pool=None, eval_cache=None):
         """
         Inicializa el motor de IA de ajedrez con Stockfish.
 
+        El proceso de Stockfish se toma prestado de un pool compartido (ya
+        configurado con el nivel y la profundidad) y se devuelve con close().
+
         Args:
             difficulty (dict): Diccionario con la configuración de dificultad
+            pool (EnginePool): Pool de procesos (por defecto, el compartido)
+            eval_cache (EvalCache): Caché de análisis consultada antes de
+                buscar (None para no usarla)
+
+        Raises:
+            FileNotFoundError: Si no se encuentra el ejecutable de Stockfish
         """
-        stockfish_path = self._get_stockfish_path()
-        if not stockfish_path:
-            raise FileNotFoundError(
-                "No se pudo encontrar el ejecutable de Stockfish")
-
-        self.stockfish = Stockfish(stockfish_path)
-        self.stockfish.set_skill_level(difficulty['skill_level'])
-        self.stockfish.set_depth(difficulty['depth'])
-        self.reset_position()
-
-    def reset_position(self):
-        """Reinicia el tablero a la posición inicial"""
-        self.stockfish.set_fen_position(
-            'rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1')
-
-    def get_best_move(self, moves):
+        self.pool = pool or ENGINE_POOL
+        self.stockfish = self.pool.acquire(difficulty)
+        self.start_fen = START_FEN
+        self.depth = difficulty['depth']
+        self.move_time = difficulty.get('time')
+        self.eval_cache = eval_cache
+        self.cache_params = (f"stockfish:skill={difficulty['skill_level']}"
+                             f":depth={difficulty['depth']}")
+        self.last_pv = []
+        # Aviso de cancelación de la búsqueda en curso; el cerrojo ordena su
+        # "go" con el "stop" de stop() (un "stop" antes del "go" se perdería)
+        self.stop_event = threading.Event()
+        self.searching = False
+        self.lock = threading.Lock()
+
+    def reset_position(self, fen=START_FEN):
+        """Reinicia el tablero a la posición inicial (o a la FEN indicada)"""
+        self.start_fen = fen
+        self.stockfish.set_fen_position(fen)
+
+    @profiled('engine.get_best_move')
+    def get_best_move(self, moves, movetime=None, stop_event=None):
         """
-        Obtiene el mejor movimiento según Stockfish.
+        Obtiene el mejor movimiento según Stockfish, o de la caché de análisis
+        si la posición ya se analizó con los mismos parámetros.
+
+        La búsqueda se limita a la profundidad de la dificultad y a 'movetime'
+        milisegundos (por defecto, el 'time' de la dificultad), lo que llegue
+        antes.
 
         Args:
             moves (list): Lista de movimientos previos en notación UCI
+            movetime (int): Tiempo máximo de búsqueda en ms (ver time_manager)
+            stop_event (threading.Event): Aviso de cancelación de esta
+                búsqueda, creado al encargarla (ver AIWorker); si ya está
+                activo, Stockfish se detiene nada más empezar
 
         Returns:
             str: Mejor movimiento en notación UCI
         """
+        self.stop_event = stop_event or threading.Event()
         # Actualiza la posición con los movimientos previos
         if moves:
-            self.stockfish.set_position(moves)
-
-        # Obtiene el mejor movimiento con el tiempo límite configurado
-        return self.stockfish.get_best_move()
+            self.stockfish.set_fen_position(self.start_fen)
+            self.stockfish.make_moves_from_current_position(moves)
+
+        position = None
+        if self.eval_cache is not None:
+            position = position_key(self.stockfish.get_fen_position())
+            cached = self.eval_cache.get(position, self.cache_params)
+            if cached is not None:
+                self.last_pv = cached[2]
+                return cached[0]
+
+        # Obtiene el mejor movimiento con el tiempo límite configurado. La API
+        # pública de python-stockfish no combina profundidad y tiempo ni
+        # permite detener la búsqueda: se usan sus métodos internos, con la
+        # versión fijada en requirements.txt
+        movetime = movetime or self.move_time
+        command = f"go depth {self.depth}"
+        if movetime:
+            command += f" movetime {int(movetime)}"
+        # Con el cerrojo solo se escribe: la espera de "readyok" va antes,
+        # para que stop() no tenga que esperar a Stockfish
+        self.stockfish._is_ready()
+        with self.lock:
+            self._send(command)
+            self.searching = True
+            if self.stop_event.is_set():
+                self._send("stop")
+        try:
+            best_move = self.stockfish._get_best_move_from_sf_popen_process(
+                self.stockfish.get_best_move)
+        finally:
+            with self.lock:
+                self.searching = False
+        stopped = self.stop_event.is_set()
+
+        score, pv, depth = parse_search_info(
+            self.stockfish.raw_stockfish_output(self.stockfish.get_best_move))
+        self.last_pv = pv if pv[:1] == [best_move] else [best_move]
+
+        # Una búsqueda interrumpida (por stop() o por tiempo antes de llegar a
+        # la profundidad) no se guarda: no es el análisis completo
+        if (position is not None and best_move is not None and not stopped
+                and depth >= self.depth):
+            self.eval_cache.put(position, self.cache_params, best_move, score, pv)
+        return best_move
 
     def make_move(self, move):
         """
@@ -71,23 +169,77 @@ class ChessAI:
 
         return start_square + end_square
 
-    def _get_stockfish_path(self):
+    def stop(self, stop_event=None):
         """
-        Encuentra la ruta del ejecutable de Stockfish.
+        Pide a Stockfish que termine la búsqueda de 'stop_event' (por
+        defecto, la actual); get_best_move devuelve entonces la mejor jugada
+        encontrada hasta el momento. Si esa búsqueda aún no ha empezado, se
+        detendrá nada más empezar.
+        """
+        with self.lock:
+            stop_event = stop_event or self.stop_event
+            stop_event.set()
+            if self.searching and stop_event is self.stop_event:
+                self._send("stop")
+
+    def _send(self, command):
+        """
+        Escribe un comando directamente en la entrada de Stockfish. _put
+        enviaría antes "isready" y leería la salida hasta "readyok"; desde el
+        hilo que llama a stop() (el del juego) lo haría a la vez que el hilo
+        de la IA lee la misma salida esperando "bestmove", y uno de los dos se
+        quedaría bloqueado. Así la salida solo la lee el hilo de la IA.
         """
-        # Primero intenta encontrar Stockfish en el PATH
         try:
-            result = subprocess.run(['which', 'stockfish'],
-                                    capture_output=True,
-                                    text=True)
-            if result.returncode == 0:
-                return result.stdout.strip()
-        except:
+            stdin = self.stockfish._stockfish.stdin
+            stdin.write(f"{command}\n")
+            stdin.flush()
+        except (OSError, ValueError):
+            # Proceso ya terminado: la lectura del hilo de la IA dará el error
             pass
 
-        # Rutas comunes donde Stockfish podría estar instalado
-        possible_paths = [
-            '/usr/local/bin/stockfish',
-            '/opt/homebrew/bin/stockfish',
-            os.path.join(os.getcwd(), 'stockfish')
-        ]
+    def close(self):
+        """
+        Devuelve el proceso de Stockfish al pool. El motor no puede usarse
+        después.
+        """
+        if self.stockfish is not None:
+            self.pool.release(self.stockfish)
+            self.stockfish = None
+
+
+def create_engine(difficulty):
+    """
+    Crea el motor de IA indicado en la configuración de dificultad.
+
+    Con 'engine': 'nativo' se usa el motor alfa-beta propio (NativeAI). Con
+    'stockfish' (valor por defecto) se usa ChessAI, y si el ejecutable de
+    Stockfish no está disponible se recurre también al motor nativo. Si existe
+    el libro de aperturas (BOOK_PATH, o 'book' en la dificultad) el motor se
+    envuelve en un BookEngine con la variedad 'book_variety'. Los dos motores
+    consultan la caché de análisis EVAL_CACHE_PATH (o 'eval_cache' en la
+    dificultad; None la desactiva).
+
+    Args:
+        difficulty (dict): Diccionario con la configuración de dificultad
+
+    Returns:
+        ChessAI | NativeAI | BookEngine: Motor con get_best_move, make_move y
+        reset_position
+    """
+    eval_cache = get_eval_cache(difficulty.get('eval_cache', EVAL_CACHE_PATH))
+    engine = None
+    if difficulty.get('engine', 'stockfish') == 'stockfish':
+        try:
+            engine = ChessAI(difficulty, eval_cache=eval_cache)
+        except FileNotFoundError:
+            print("Warning: Stockfish no disponible, se usa el motor nativo.")
+
+    if engine is None:
+        from native_engine import NativeAI
+        engine = NativeAI(difficulty, eval_cache=eval_cache)
+
+    book = get_book(difficulty.get('book', BOOK_PATH))
+    if book is not None:
+        engine = BookEngine(engine, book, difficulty.get('book_variety', 0.0))
+    return engine
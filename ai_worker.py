@@ -0,0 +1,176 @@
+"""
+Ejecución de la IA en un hilo de trabajo para no bloquear el bucle de dibujado.
+
+Cada búsqueda lleva su propio aviso de cancelación (threading.Event), creado
+al encargarla: un stop que llega antes de que el motor empiece a buscar (por
+ejemplo, mientras repite las jugadas previas) no se pierde.
+"""
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from profiler import PROFILER
+
+
+class AIWorker:
+    """
+    Envuelve un motor (ChessAI o NativeAI) y ejecuta sus búsquedas en un hilo
+    dedicado. Todas las llamadas al motor pasan por el mismo hilo, de modo que
+    nunca hay dos operaciones simultáneas sobre él.
+
+    Atributos:
+    -----------
+    engine : ChessAI | NativeAI
+        Motor de IA envuelto.
+    future : concurrent.futures.Future
+        Búsqueda en curso (None si no hay ninguna).
+    ponder_future : concurrent.futures.Future
+        Búsqueda anticipada sobre la respuesta esperada del rival (None si no
+        hay ninguna).
+    ponder_line : list
+        Jugadas UCI (incluida la respuesta esperada) de la búsqueda anticipada.
+    ponder_hits : int
+        Búsquedas anticipadas aprovechadas porque el rival jugó lo esperado.
+    ponder_misses : int
+        Búsquedas anticipadas descartadas.
+    """
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.executor = ThreadPoolExecutor(max_workers=1,
+                                           thread_name_prefix='chess-ai')
+        self.future = None
+        self.ponder_future = None
+        self.ponder_line = None
+        self.ponder_hits = 0
+        self.ponder_misses = 0
+
+    def request_move(self, moves=(), movetime=None):
+        """
+        Lanza la búsqueda del mejor movimiento sin bloquear. Si hay una
+        búsqueda anticipada de exactamente esas jugadas se reutiliza (aunque
+        no haya terminado); si no, se cancela.
+
+        Args:
+            moves (iterable): Movimientos previos en notación UCI
+            movetime (int): Tiempo máximo de búsqueda en ms (None para el de
+                la dificultad)
+
+        Returns:
+            Future: Manejador que se consulta con done() y result().
+        """
+        moves = list(moves)
+        ponder, line = self.ponder_future, self.ponder_line
+        self.ponder_future = self.ponder_line = None
+        if ponder is not None:
+            if moves == line:
+                self.ponder_hits += 1
+                self.cancel()
+                self.future = ponder
+                return ponder
+            self.ponder_misses += 1
+            self._stop(ponder)
+
+        self.cancel()
+        self.future = self._submit_search(self.engine.get_best_move,
+                                          moves, movetime)
+        return self.future
+
+    def ponder(self, moves, predicted, movetime=None):
+        """
+        Empieza a buscar, durante el turno del rival, la respuesta a la jugada
+        que se espera de él. El resultado se recoge con request_move si el
+        rival juega 'predicted'.
+
+        Args:
+            moves (iterable): Movimientos de la partida en notación UCI
+            predicted (str): Respuesta esperada del rival (UCI)
+            movetime (int): Tiempo máximo de búsqueda en ms
+        """
+        self.cancel_ponder()
+        moves = list(moves)
+        self.ponder_line = moves + [predicted]
+        self.ponder_future = self._submit_search(self._ponder, moves,
+                                                 predicted, movetime)
+
+    def _submit_search(self, function, *args):
+        """
+        Encola una búsqueda con su aviso de cancelación, que se pasa como
+        último argumento y queda en el Future como stop_event.
+        """
+        stop_event = threading.Event()
+        future = self.executor.submit(function, *args, stop_event)
+        future.stop_event = stop_event
+        return future
+
+    def _ponder(self, moves, predicted, movetime, stop_event):
+        """
+        Busca la posición tras la jugada esperada y deja después el motor en
+        la posición real de la partida, para que las operaciones encoladas
+        detrás (como make_move con la jugada del rival) se apliquen bien. El
+        tiempo de la búsqueda se registra como engine.ponder, aparte de las
+        búsquedas pedidas con request_move.
+        """
+        engine = self.engine
+        try:
+            with PROFILER.aliased('engine.get_best_move', 'engine.ponder'):
+                return engine.get_best_move(moves + [predicted], movetime,
+                                            stop_event)
+        finally:
+            engine.reset_position(engine.start_fen)
+            for move in moves:
+                engine.make_move(move)
+
+    def cancel_ponder(self):
+        """
+        Cancela la búsqueda anticipada en curso (su resultado se descarta).
+        """
+        future = self.ponder_future
+        self.ponder_future = self.ponder_line = None
+        self._stop(future)
+
+    def submit(self, function, *args):
+        """
+        Encola otra operación sobre el motor (por ejemplo reset_position) detrás
+        de la búsqueda en curso.
+        """
+        return self.executor.submit(function, *args)
+
+    def is_searching(self):
+        """
+        Indica si hay una búsqueda pendiente o en curso.
+        """
+        return self.future is not None and not self.future.done()
+
+    def cancel(self):
+        """
+        Cancela la búsqueda actual y la anticipada. Si ya habían empezado se
+        le pide al motor que se detenga; su resultado se descarta.
+        """
+        future = self.future
+        self.future = None
+        self._stop(future)
+        self.cancel_ponder()
+
+    def _stop(self, future):
+        """
+        Cancela una búsqueda encolada o, si ya ha empezado, activa su aviso de
+        cancelación y detiene el motor si está buscando para ella.
+        """
+        if future is None or future.done():
+            return
+        if not future.cancel():
+            future.stop_event.set()
+            stop = getattr(self.engine, 'stop', None)
+            if stop:
+                stop(future.stop_event)
+
+    def shutdown(self):
+        """
+        Cancela cualquier búsqueda, cierra el motor (devolviéndolo al pool si
+        es Stockfish) y libera el hilo de trabajo.
+        """
+        self.cancel()
+        close = getattr(self.engine, 'close', None)
+        if close:
+            self.executor.submit(close)
+        self.executor.shutdown(wait=False)
@@ -0,0 +1,235 @@
+"""
+Mapas de casillas atacadas por cada bando, mantenidos de forma incremental.
+
+AttackMap guarda los ataques de cada pieza del tablero y, por bando, cuántas
+piezas atacan cada casilla. Tras un movimiento solo se recalculan las piezas
+de las casillas que han cambiado (origen, destino, torre del enroque, peón
+capturado al paso) y las piezas deslizantes cuyos rayos pasan por ellas; el
+resto de ataques no cambia. Con los mapas, el jaque es una sola operación de
+bits y la existencia de algún movimiento legal (jaque mate, ahogado) se decide
+casi siempre sin generar todos los movimientos.
+"""
+from attacks import (BETWEEN, KING_ATTACKS, KNIGHT_ATTACKS, PAWN_ATTACKS,
+                     bishop_attacks, rook_attacks)
+from bitboard import (BISHOP, CASTLE_ROOK_MOVES, FLAG_CASTLE, FLAG_EN_PASSANT,
+                      FULL_BB, KING, KNIGHT, PAWN, QUEEN, ROOK, SQUARE_BB,
+                      WHITE_SIDE, iter_bits)
+from legal_moves import attackers_to, generate_legal_moves, pins
+
+
+def piece_attacks(index, sq, occupied):
+    """
+    Casillas atacadas por la pieza 'index' (color * 6 + tipo) desde sq.
+    """
+    ptype = index % 6
+    if ptype == PAWN:
+        return PAWN_ATTACKS[index // 6][sq]
+    if ptype == KNIGHT:
+        return KNIGHT_ATTACKS[sq]
+    if ptype == KING:
+        return KING_ATTACKS[sq]
+    if ptype == BISHOP:
+        return bishop_attacks(sq, occupied)
+    if ptype == ROOK:
+        return rook_attacks(sq, occupied)
+    return rook_attacks(sq, occupied) | bishop_attacks(sq, occupied)
+
+
+def move_squares(move, color):
+    """
+    Casillas cuyo contenido cambia al hacer (o deshacer) un movimiento del
+    bando 'color'.
+    """
+    from_sq, to_sq = move & 63, (move >> 6) & 63
+    if move & FLAG_CASTLE:
+        return (from_sq, to_sq) + CASTLE_ROOK_MOVES[to_sq]
+    if move & FLAG_EN_PASSANT:
+        return from_sq, to_sq, to_sq + 8 if color == WHITE_SIDE else to_sq - 8
+    return from_sq, to_sq
+
+
+class AttackMap:
+    """
+    Casillas atacadas por cada bando en una posición.
+
+    Atributos:
+    -----------
+    attacks : list
+        Bitboard de ataques de la pieza de cada casilla (0 si está vacía).
+    owners : list
+        Color de la pieza cuyos ataques se guardan en cada casilla, o None.
+    counts : tuple
+        Por bando, número de piezas que atacan cada casilla.
+    maps : list
+        Por bando, bitboard de casillas atacadas (las de count > 0).
+    """
+
+    def __init__(self, board):
+        self.rebuild(board)
+
+    def rebuild(self, board):
+        """
+        Calcula los mapas desde cero para 'board'.
+        """
+        self.attacks = [0] * 64
+        self.owners = [None] * 64
+        self.counts = ([0] * 64, [0] * 64)
+        self.maps = [0, 0]
+        occupied = board.occupied
+        for sq in iter_bits(occupied):
+            index = board.mailbox[sq]
+            self._set(sq, index // 6, piece_attacks(index, sq, occupied))
+
+    def _set(self, sq, color, attacks):
+        """
+        Sustituye los ataques guardados de la casilla sq, actualizando los
+        recuentos solo en las casillas que cambian.
+        """
+        old = self.attacks[sq]
+        old_color = self.owners[sq]
+        if old_color == color:
+            if old == attacks:
+                return
+            removed, added = old & ~attacks, attacks & ~old
+        else:
+            removed, added = old, attacks
+        self.attacks[sq] = attacks
+        self.owners[sq] = color
+
+        if removed:
+            counts = self.counts[old_color]
+            cleared = 0
+            while removed:
+                lsb = removed & -removed
+                target = lsb.bit_length() - 1
+                counts[target] -= 1
+                if not counts[target]:
+                    cleared |= lsb
+                removed ^= lsb
+            self.maps[old_color] &= ~cleared
+        if added:
+            counts = self.counts[color]
+            attacked = 0
+            while added:
+                lsb = added & -added
+                target = lsb.bit_length() - 1
+                if not counts[target]:
+                    attacked |= lsb
+                counts[target] += 1
+                added ^= lsb
+            self.maps[color] |= attacked
+
+    def update(self, board, squares):
+        """
+        Actualiza los mapas después de que cambie el contenido de 'squares'
+        en 'board' (ver move_squares). Se recalculan esas casillas y los
+        deslizantes cuyos ataques guardados llegan a alguna de ellas: la
+        casilla cambiada más cercana en cada rayo es la única que puede
+        alargar o cortar el ataque, y ya estaba dentro de él.
+        """
+        pieces = board.pieces
+        changed = 0
+        for sq in squares:
+            changed |= SQUARE_BB[sq]
+
+        attacks = self.attacks
+        sliders = (pieces[BISHOP] | pieces[ROOK] | pieces[QUEEN] |
+                   pieces[6 + BISHOP] | pieces[6 + ROOK] | pieces[6 + QUEEN])
+        affected = changed
+        rest = sliders & ~changed
+        while rest:
+            lsb = rest & -rest
+            if attacks[lsb.bit_length() - 1] & changed:
+                affected |= lsb
+            rest ^= lsb
+
+        occupied = board.occupied
+        mailbox = board.mailbox
+        while affected:
+            lsb = affected & -affected
+            sq = lsb.bit_length() - 1
+            index = mailbox[sq]
+            if index is None:
+                self._set(sq, None, 0)
+            else:
+                self._set(sq, index // 6, piece_attacks(index, sq, occupied))
+            affected ^= lsb
+
+    def attacked(self, sq, color):
+        """
+        Indica si alguna pieza de 'color' ataca la casilla sq.
+        """
+        return bool(self.maps[color] & SQUARE_BB[sq])
+
+    def in_check(self, board, color=None):
+        """
+        Indica si el rey de 'color' (por defecto, el del turno) está en jaque.
+        """
+        if color is None:
+            color = board.turn
+        return bool(self.maps[color ^ 1] & board.pieces[color * 6 + KING])
+
+    def has_legal_move(self, board):
+        """
+        Indica si el bando al que le toca mover tiene algún movimiento legal.
+
+        Primero se buscan movimientos que los mapas demuestran legales: un paso
+        del rey a una casilla no atacada, o un movimiento de una pieza no
+        clavada que no deja el rey en jaque. Solo si no hay ninguno (casi
+        siempre, un mate o un ahogado) se generan todos los movimientos.
+        """
+        us = board.turn
+        them = us ^ 1
+        pieces = board.pieces
+        own = board.occupancy[us]
+        occupied = board.occupied
+        base = us * 6
+        king_bit = pieces[base + KING]
+        king_sq = king_bit.bit_length() - 1
+        checks = self.counts[them][king_sq]
+        not_own = FULL_BB ^ own
+
+        # El rey: con jaque, la casilla tampoco puede quedar en la línea del
+        # deslizante que da jaque (el mapa la ve tapada por el propio rey)
+        targets = KING_ATTACKS[king_sq] & not_own & ~self.maps[them]
+        if targets:
+            if not checks:
+                return True
+            without_king = occupied ^ king_bit
+            for to_sq in iter_bits(targets):
+                if not attackers_to(board, to_sq, them, without_king):
+                    return True
+        if checks > 1:
+            return False
+
+        if checks:
+            checker_sq = attackers_to(board, king_sq, them, occupied).bit_length() - 1
+            target_mask = SQUARE_BB[checker_sq] | BETWEEN[king_sq][checker_sq]
+        else:
+            target_mask = not_own
+
+        pinned = pins(board, king_sq, us)[0]
+        movable = own & ~pinned & ~king_bit
+        for sq in iter_bits(movable & ~pieces[base + PAWN]):
+            if self.attacks[sq] & target_mask:
+                return True
+
+        pawns = pieces[base + PAWN] & movable
+        empty = FULL_BB ^ occupied
+        pushes = (pawns >> 8) if us == WHITE_SIDE else (pawns << 8) & FULL_BB
+        if pushes & empty & target_mask:
+            return True
+
+        return bool(generate_legal_moves(board))
+
+    def is_checkmate(self, board):
+        """
+        Indica si el bando al que le toca mover está en jaque mate.
+        """
+        return self.in_check(board) and not self.has_legal_move(board)
+
+    def is_stalemate(self, board):
+        """
+        Indica si el bando al que le toca mover está ahogado.
+        """
+        return not self.in_check(board) and not self.has_legal_move(board)
@@ -0,0 +1,189 @@
+"""
+Tablas de ataque precalculadas para la generación de movimientos.
+
+Las tablas se construyen una sola vez al importar el módulo a partir de los
+desplazamientos definidos en settings.py. Hay dos variantes de cada tabla:
+
+- Bitboards de ataque (KNIGHT_ATTACKS, rook_attacks, ...), para consultas de
+  casillas atacadas. En las piezas deslizantes el primer bloqueador de cada
+  rayo se localiza con operaciones de bits y se descarta la parte del rayo que
+  queda detrás de él.
+- Listas de destinos (KNIGHT_TARGETS, ROOK_RAY_TARGETS, ...), con pares
+  (bit, (fila, columna)) ya calculados, para que los generadores de movimientos
+  produzcan coordenadas sin comprobar límites del tablero.
+"""
+from settings import knight_moves, rook_moves, bishop_moves, king_moves
+from bitboard import SQUARE_BB, iter_bits
+
+# Coordenadas (fila, columna) de cada índice de casilla
+SQUARE_COORDS = tuple(divmod(sq, 8) for sq in range(64))
+
+
+def _offset_table(offsets):
+    """
+    Construye para cada casilla el bitboard de destinos a un salto.
+    """
+    table = []
+    for sq in range(64):
+        row, col = SQUARE_COORDS[sq]
+        bb = 0
+        for d_row, d_col in offsets:
+            new_row, new_col = row + d_row, col + d_col
+            if 0 <= new_row < 8 and 0 <= new_col < 8:
+                bb |= SQUARE_BB[new_row * 8 + new_col]
+        table.append(bb)
+    return tuple(table)
+
+
+def _ray_table(direction):
+    """
+    Construye para cada casilla el rayo completo (sin bloqueadores) en una
+    dirección dada.
+    """
+    d_row, d_col = direction
+    table = []
+    for sq in range(64):
+        row, col = SQUARE_COORDS[sq]
+        bb = 0
+        new_row, new_col = row + d_row, col + d_col
+        while 0 <= new_row < 8 and 0 <= new_col < 8:
+            bb |= SQUARE_BB[new_row * 8 + new_col]
+            new_row, new_col = new_row + d_row, new_col + d_col
+        table.append(bb)
+    return tuple(table)
+
+
+def _target_table(offsets):
+    """
+    Construye para cada casilla la lista de destinos a un salto como pares
+    (bit, (fila, columna)).
+    """
+    return tuple(tuple((SQUARE_BB[sq], SQUARE_COORDS[sq])
+                       for sq in iter_bits(bb))
+                 for bb in _offset_table(offsets))
+
+
+def _ray_target_table(directions):
+    """
+    Construye para cada casilla sus rayos como tuplas ordenadas de pares
+    (bit, (fila, columna)), desde la casilla más cercana a la más lejana.
+    """
+    table = []
+    for sq in range(64):
+        row, col = SQUARE_COORDS[sq]
+        rays = []
+        for d_row, d_col in directions:
+            ray = []
+            new_row, new_col = row + d_row, col + d_col
+            while 0 <= new_row < 8 and 0 <= new_col < 8:
+                target = new_row * 8 + new_col
+                ray.append((SQUARE_BB[target], SQUARE_COORDS[target]))
+                new_row, new_col = new_row + d_row, new_col + d_col
+            if ray:
+                rays.append(tuple(ray))
+        table.append(tuple(rays))
+    return tuple(table)
+
+
+def _split_rays(directions):
+    """
+    Separa los rayos en crecientes (el bloqueador más cercano es el bit menos
+    significativo) y decrecientes (el más significativo).
+    """
+    positive = tuple(_ray_table(d) for d in directions if d[0] * 8 + d[1] > 0)
+    negative = tuple(_ray_table(d) for d in directions if d[0] * 8 + d[1] < 0)
+    return positive, negative
+
+
+KNIGHT_ATTACKS = _offset_table(knight_moves)
+KING_ATTACKS = _offset_table(king_moves)
+
+# Capturas de peón por color: las blancas avanzan hacia la fila 0
+PAWN_ATTACKS = (
+    _offset_table([(-1, -1), (-1, 1)]),   # WHITE_SIDE
+    _offset_table([(1, -1), (1, 1)]),     # BLACK_SIDE
+)
+
+KNIGHT_TARGETS = _target_table(knight_moves)
+KING_TARGETS = _target_table(king_moves)
+PAWN_CAPTURE_TARGETS = (
+    _target_table([(-1, -1), (-1, 1)]),
+    _target_table([(1, -1), (1, 1)]),
+)
+
+ROOK_RAY_TARGETS = _ray_target_table(rook_moves)
+BISHOP_RAY_TARGETS = _ray_target_table(bishop_moves)
+QUEEN_RAY_TARGETS = _ray_target_table(rook_moves + bishop_moves)
+
+ROOK_RAYS = _split_rays(rook_moves)
+BISHOP_RAYS = _split_rays(bishop_moves)
+
+# Rayos completos por casilla (útiles para detectar clavadas y jaques)
+ROOK_MASKS = tuple(sum(rays[sq] for rays in ROOK_RAYS[0] + ROOK_RAYS[1])
+                   for sq in range(64))
+BISHOP_MASKS = tuple(sum(rays[sq] for rays in BISHOP_RAYS[0] + BISHOP_RAYS[1])
+                     for sq in range(64))
+
+
+def _between_table():
+    """
+    Construye para cada par de casillas alineadas el bitboard de las casillas
+    estrictamente intermedias (0 si no están en la misma línea).
+    """
+    rays = ROOK_RAYS[0] + ROOK_RAYS[1] + BISHOP_RAYS[0] + BISHOP_RAYS[1]
+    table = []
+    for a in range(64):
+        row = [0] * 64
+        for ray in rays:
+            for b in iter_bits(ray[a]):
+                row[b] = ray[a] & ~ray[b] & ~SQUARE_BB[b]
+        table.append(tuple(row))
+    return tuple(table)
+
+
+# BETWEEN[a][b]: casillas entre a y b (para bloquear jaques y detectar clavadas)
+BETWEEN = _between_table()
+
+
+def _slider_attacks(rays, sq, occupied):
+    """
+    Calcula los ataques de una pieza deslizante a partir de sus tablas de rayos.
+    """
+    positive, negative = rays
+    attacks = 0
+    for table in positive:
+        ray = table[sq]
+        blockers = ray & occupied
+        if blockers:
+            ray ^= table[(blockers & -blockers).bit_length() - 1]
+        attacks |= ray
+    for table in negative:
+        ray = table[sq]
+        blockers = ray & occupied
+        if blockers:
+            ray ^= table[blockers.bit_length() - 1]
+        attacks |= ray
+    return attacks
+
+
+def rook_attacks(sq, occupied):
+    """
+    Devuelve el bitboard de casillas atacadas por una torre en sq.
+    """
+    return _slider_attacks(ROOK_RAYS, sq, occupied)
+
+
+def bishop_attacks(sq, occupied):
+    """
+    Devuelve el bitboard de casillas atacadas por un alfil en sq.
+    """
+    return _slider_attacks(BISHOP_RAYS, sq, occupied)
+
+
+def queen_attacks(sq, occupied):
+    """
+    Devuelve el bitboard de casillas atacadas por una dama en sq.
+    """
+    return (_slider_attacks(ROOK_RAYS, sq, occupied) |
+            _slider_attacks(BISHOP_RAYS, sq, occupied))
+
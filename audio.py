@@ -0,0 +1,99 @@
+"""
+Sonidos del juego, compartidos por todas las partidas del proceso.
+
+El mezclador se inicializa una sola vez con un búfer pequeño (menos latencia
+entre la jugada y su sonido) y todos los ficheros de assets/sounds se cargan
+en memoria al empezar. Cada sonido tiene un canal reservado: reproducirlo no
+bloquea el bucle del juego y, si vuelve a sonar antes de terminar, sustituye a
+la reproducción anterior en lugar de superponerse. Sin dispositivo de audio
+(o con SDL_AUDIODRIVER=dummy) el gestor no hace nada.
+"""
+import os
+
+import pygame
+
+SOUNDS_DIR = "assets/sounds"
+SOUND_EXTENSIONS = ('.wav', '.ogg')
+
+# Parámetros del mezclador: el búfer (en muestras) fija la latencia mínima
+MIXER_FREQUENCY = 44100
+MIXER_SIZE = -16
+MIXER_CHANNELS = 2
+MIXER_BUFFER = 512
+
+
+class AudioManager:
+    """
+    Mezclador y sonidos precargados.
+
+    Atributos:
+    -----------
+    enabled : bool
+        Si hay audio; si no, play() no hace nada.
+    sounds : dict
+        Sonido cargado por nombre (el del fichero sin extensión).
+    channels : dict
+        Canal reservado de cada sonido.
+    """
+
+    def __init__(self, sounds_dir=SOUNDS_DIR, buffer=MIXER_BUFFER):
+        self.enabled = False
+        self.sounds = {}
+        self.channels = {}
+        if os.environ.get('SDL_AUDIODRIVER') == 'dummy':
+            return
+
+        try:
+            # pygame.init() ya puede haber abierto el mezclador con el búfer por
+            # defecto; se vuelve a abrir con el nuestro
+            if pygame.mixer.get_init():
+                pygame.mixer.quit()
+            pygame.mixer.init(MIXER_FREQUENCY, MIXER_SIZE, MIXER_CHANNELS, buffer)
+            self._load(sounds_dir)
+        except pygame.error as error:
+            print(f"Warning: audio desactivado ({error}).")
+            self.sounds.clear()
+            self.channels.clear()
+            return
+        self.enabled = True
+
+    def _load(self, sounds_dir):
+        """
+        Carga los sonidos de 'sounds_dir' y reserva un canal para cada uno.
+        """
+        if not os.path.isdir(sounds_dir):
+            print(f"Warning: {sounds_dir} does not exist.")
+            return
+        for filename in sorted(os.listdir(sounds_dir)):
+            name, extension = os.path.splitext(filename)
+            if extension.lower() in SOUND_EXTENSIONS:
+                self.sounds[name] = pygame.mixer.Sound(os.path.join(sounds_dir, filename))
+
+        if pygame.mixer.get_num_channels() < len(self.sounds):
+            pygame.mixer.set_num_channels(len(self.sounds))
+        pygame.mixer.set_reserved(len(self.sounds))
+        self.channels = {name: pygame.mixer.Channel(index)
+                         for index, name in enumerate(self.sounds)}
+
+    def play(self, name):
+        """
+        Reproduce un sonido en su canal sin esperar a que termine.
+        """
+        if not self.enabled:
+            return
+        sound = self.sounds.get(name)
+        if sound is not None:
+            self.channels[name].play(sound)
+
+
+_audio = None
+
+
+def get_audio():
+    """
+    Devuelve el gestor de audio del proceso, creándolo la primera vez.
+    """
+    global _audio
+    if _audio is None:
+        _audio = AudioManager()
+    return _audio
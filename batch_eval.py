@@ -0,0 +1,246 @@
+"""
+Análisis por lotes de muchas posiciones con operaciones vectorizadas de NumPy.
+
+Las posiciones se representan como un array (N, 12) de uint64 con los mismos
+doce bitboards que BitBoard.pieces (índice color * 6 + tipo, casilla
+fila * 8 + columna) y un array (N,) con el turno. Cada operación recorre las
+direcciones de movimiento desplazando a la vez los bitboards de todo el lote,
+en lugar de recorrer casillas y piezas una a una en Python.
+
+Los recuentos de movimientos son pseudolegales (no descartan los que dejan al
+rey en jaque) y no incluyen enroques ni capturas al paso, que dependen de
+información que no está en los bitboards.
+"""
+import numpy as np
+
+from bitboard import (BitBoard, BISHOP, BLACK_SIDE, KING, KNIGHT, PAWN, QUEEN,
+                      ROOK, WHITE_SIDE)
+from native_engine import PIECE_SQUARE_VALUES
+
+# Peso de cada movimiento pseudolegal en la evaluación (centipeones)
+MOBILITY_WEIGHT = 4
+
+_U64 = np.uint64
+_FILE_A = _U64(sum(1 << (row * 8) for row in range(8)))
+_FILE_H = _U64(sum(1 << (row * 8 + 7) for row in range(8)))
+_NOT_FILE_A = ~_FILE_A
+_NOT_FILE_H = ~_FILE_H
+_NOT_FILE_AB = ~(_FILE_A | (_FILE_A << _U64(1)))
+_NOT_FILE_GH = ~(_FILE_H | (_FILE_H >> _U64(1)))
+_ROWS = tuple(_U64(0xFF << (row * 8)) for row in range(8))
+
+# Direcciones como (desplazamiento, máscara): positivo hacia casillas mayores
+# (hacia la primera fila o la columna h); la máscara descarta lo que cruza el
+# borde del tablero
+NORTH, SOUTH = (-8, None), (8, None)
+EAST, WEST = (1, _NOT_FILE_A), (-1, _NOT_FILE_H)
+NORTH_EAST, NORTH_WEST = (-7, _NOT_FILE_A), (-9, _NOT_FILE_H)
+SOUTH_EAST, SOUTH_WEST = (9, _NOT_FILE_A), (7, _NOT_FILE_H)
+
+ROOK_DIRECTIONS = (NORTH, SOUTH, EAST, WEST)
+BISHOP_DIRECTIONS = (NORTH_EAST, NORTH_WEST, SOUTH_EAST, SOUTH_WEST)
+KING_DIRECTIONS = ROOK_DIRECTIONS + BISHOP_DIRECTIONS
+KNIGHT_JUMPS = ((-17, _NOT_FILE_H), (-15, _NOT_FILE_A), (-10, _NOT_FILE_GH),
+                (-6, _NOT_FILE_AB), (6, _NOT_FILE_GH), (10, _NOT_FILE_AB),
+                (15, _NOT_FILE_H), (17, _NOT_FILE_A))
+
+# Capturas de peón por color y fila en la que promociona
+PAWN_CAPTURES = ((NORTH_EAST, NORTH_WEST), (SOUTH_EAST, SOUTH_WEST))
+PAWN_PUSH = (NORTH, SOUTH)
+PAWN_DOUBLE_ROW = (5, 2)  # Fila a la que llega el primer paso de un doble avance
+PROMOTION_ROW = (0, 7)
+
+# Tablas pieza-casilla del motor nativo como matriz (12, 64)
+_PST = np.array(PIECE_SQUARE_VALUES, dtype=np.int32)
+
+if hasattr(np, 'bitwise_count'):
+    popcount = np.bitwise_count
+else:
+    _POPCOUNT8 = np.array([bin(byte).count('1') for byte in range(256)],
+                          dtype=np.uint8)
+
+    def popcount(array):
+        """
+        Número de bits a 1 de cada elemento de un array de uint64.
+        """
+        array = np.ascontiguousarray(array, dtype=_U64)
+        return _POPCOUNT8[array.view(np.uint8)].reshape(
+            array.shape + (8,)).sum(axis=-1, dtype=np.uint8)
+
+
+def shift(bitboards, direction):
+    """
+    Desplaza un array de bitboards una casilla (o un salto) en una dirección.
+    """
+    offset, mask = direction
+    if offset > 0:
+        moved = bitboards << _U64(offset)
+    else:
+        moved = bitboards >> _U64(-offset)
+    return moved if mask is None else moved & mask
+
+
+def ray_attacks(sliders, empty, direction):
+    """
+    Casillas atacadas en una dirección por un conjunto de piezas deslizantes
+    (hasta la primera pieza, incluida).
+    """
+    attacks = np.zeros_like(sliders)
+    front = sliders
+    for _ in range(7):
+        front = shift(front, direction)
+        attacks |= front
+        front = front & empty
+    return attacks
+
+
+def boards_to_array(boards):
+    """
+    Convierte una secuencia de BitBoard en arrays de bitboards y turnos.
+
+    Returns:
+        tuple: (array (N, 12) de uint64, array (N,) de uint8 con el turno)
+    """
+    pieces = np.array([board.pieces for board in boards], dtype=_U64)
+    turns = np.array([board.turn for board in boards], dtype=np.uint8)
+    return pieces.reshape(-1, 12), turns
+
+
+def fens_to_array(fens):
+    """
+    Convierte una secuencia de FEN en arrays de bitboards y turnos.
+    """
+    return boards_to_array([BitBoard.from_fen(fen) for fen in fens])
+
+
+def planes_to_array(planes):
+    """
+    Convierte un tensor (N, 12, 8, 8) de planos de piezas (0/1, en el orden de
+    BitBoard.pieces y con la fila 0 como octava fila) en un array (N, 12) de
+    uint64.
+    """
+    planes = np.asarray(planes, dtype=bool).reshape(-1, 12, 64)
+    packed = np.packbits(planes, axis=-1, bitorder='little')
+    return np.ascontiguousarray(packed).view('<u8').astype(_U64).reshape(-1, 12)
+
+
+def occupancy(pieces):
+    """
+    Máscaras de ocupación por color, como array (N, 2).
+    """
+    return np.stack([np.bitwise_or.reduce(pieces[:, :6], axis=1),
+                     np.bitwise_or.reduce(pieces[:, 6:], axis=1)], axis=1)
+
+
+def _side_analysis(pieces, color, own, enemies):
+    """
+    Casillas atacadas y número de movimientos pseudolegales de un color.
+
+    Dentro de una dirección, los movimientos de distintas piezas del mismo
+    tipo nunca llegan a la misma casilla (la de atrás se detiene en la de
+    delante), así que contar los bits de cada dirección por separado da el
+    número exacto de movimientos.
+    """
+    base = color * 6
+    occupied = own | enemies
+    empty = ~occupied
+    not_own = ~own
+    attacks = np.zeros(len(pieces), dtype=_U64)
+    moves = np.zeros(len(pieces), dtype=np.int32)
+
+    def add(targets):
+        nonlocal attacks, moves
+        attacks |= targets
+        moves += popcount(targets & not_own)
+
+    for direction in KNIGHT_JUMPS:
+        add(shift(pieces[:, base + KNIGHT], direction))
+    for direction in KING_DIRECTIONS:
+        add(shift(pieces[:, base + KING], direction))
+    for ptype, directions in ((BISHOP, BISHOP_DIRECTIONS),
+                              (ROOK, ROOK_DIRECTIONS),
+                              (QUEEN, KING_DIRECTIONS)):
+        for direction in directions:
+            add(ray_attacks(pieces[:, base + ptype], empty, direction))
+
+    # Peones: las capturas solo cuentan como movimiento sobre piezas rivales,
+    # y las promociones cuentan por cuatro
+    pawns = pieces[:, base + PAWN]
+    last_row = _ROWS[PROMOTION_ROW[color]]
+    for direction in PAWN_CAPTURES[color]:
+        targets = shift(pawns, direction)
+        attacks |= targets
+        captures = targets & enemies
+        moves += popcount(captures) + 3 * popcount(captures & last_row)
+    single = shift(pawns, PAWN_PUSH[color]) & empty
+    double = shift(single & _ROWS[PAWN_DOUBLE_ROW[color]], PAWN_PUSH[color]) & empty
+    moves += popcount(single) + 3 * popcount(single & last_row) + popcount(double)
+    return attacks, moves
+
+
+def analyse(pieces):
+    """
+    Mapas de ataque y movimientos pseudolegales de los dos colores.
+
+    Args:
+        pieces (np.ndarray): Array (N, 12) de uint64
+
+    Returns:
+        tuple: (ataques (N, 2) de uint64, movimientos (N, 2) de int32), con
+        el índice 0 para las blancas y el 1 para las negras.
+    """
+    pieces = np.asarray(pieces, dtype=_U64).reshape(-1, 12)
+    occupied = occupancy(pieces)
+    white = _side_analysis(pieces, WHITE_SIDE, occupied[:, 0], occupied[:, 1])
+    black = _side_analysis(pieces, BLACK_SIDE, occupied[:, 1], occupied[:, 0])
+    return (np.stack([white[0], black[0]], axis=1),
+            np.stack([white[1], black[1]], axis=1))
+
+
+def attack_maps(pieces):
+    """
+    Casillas atacadas por cada color, como array (N, 2) de uint64.
+    """
+    return analyse(pieces)[0]
+
+
+def move_counts(pieces, turns):
+    """
+    Número de movimientos pseudolegales del bando al que le toca mover.
+    """
+    moves = analyse(pieces)[1]
+    return moves[np.arange(len(moves)), np.asarray(turns, dtype=np.intp)]
+
+
+def material(pieces):
+    """
+    Material y tablas pieza-casilla del motor nativo desde el punto de vista
+    de las blancas, como array (N,) de int32.
+    """
+    pieces = np.ascontiguousarray(pieces, dtype=_U64).reshape(-1, 12)
+    # (N, 12, 64) con un 1 en cada casilla ocupada por cada tipo de pieza
+    bits = np.unpackbits(pieces.view(np.uint8), bitorder='little').reshape(-1, 12, 64)
+    return np.einsum('npk,pk->n', bits, _PST, dtype=np.int32)
+
+
+def evaluate_batch(pieces, turns, mobility_weight=MOBILITY_WEIGHT, moves=None):
+    """
+    Evalúa un lote de posiciones: material, tablas pieza-casilla (como
+    native_engine.evaluate) y movilidad pseudolegal.
+
+    Args:
+        pieces (np.ndarray): Array (N, 12) de uint64
+        turns (np.ndarray): Array (N,) con el bando al que le toca mover
+        mobility_weight (int): Centipeones por movimiento de diferencia
+        moves (np.ndarray): Movimientos (N, 2) ya calculados con analyse
+
+    Returns:
+        np.ndarray: Puntuaciones (N,) de int32 desde el punto de vista del
+        bando al que le toca mover.
+    """
+    score = material(pieces)
+    if mobility_weight:
+        if moves is None:
+            moves = analyse(pieces)[1]
+        score += mobility_weight * (moves[:, 0] - moves[:, 1])
+    return np.where(np.asarray(turns) == WHITE_SIDE, score, -score)
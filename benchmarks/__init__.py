@@ -0,0 +1,13 @@
+"""
+Benchmarks de rendimiento del juego.
+
+Cada módulo se ejecuta desde la raíz del repositorio, por ejemplo:
+
+    python -m benchmarks.attack_tables
+
+benchmarks.suite reúne las medidas principales (generación de movimientos,
+move_piece, dibujado y latencia del motor) en un fichero JSON y compara con
+resultados anteriores:
+
+    python -m benchmarks.suite --output nuevo.json --compare base.json
+"""
@@ -0,0 +1,134 @@
+"""
+Compara los generadores de movimientos basados en tablas de ataque con la
+implementación anterior que recorría los desplazamientos de settings.py
+comprobando los límites del tablero en cada paso.
+
+Uso:
+    python -m benchmarks.attack_tables [--positions N] [--repeat N]
+"""
+import argparse
+import time
+
+from settings import knight_moves, rook_moves, bishop_moves, king_moves
+from bitboard import PIECE_COLOR, SQUARE_BB, WHITE_SIDE, BLACK_SIDE
+from movements import (get_knight_moves, get_king_moves, get_rook_moves,
+                       get_bishop_moves, get_queen_moves, can_castle,
+                       can_castle_kingside, can_castle_queenside)
+from benchmarks.positions import sample_positions, side_pieces
+
+
+def legacy_step_moves(piece, possible_moves, row, col, board, offsets):
+    """
+    Versión anterior de los saltos de caballo y rey (bucle de desplazamientos).
+    """
+    own = board.occupancy[PIECE_COLOR[piece]]
+    for move in offsets:
+        new_row, new_col = row + move[0], col + move[1]
+        if 0 <= new_row < 8 and 0 <= new_col < 8:
+            if not own & SQUARE_BB[new_row * 8 + new_col]:
+                possible_moves.append((new_row, new_col))
+    return possible_moves
+
+
+def legacy_king_moves(piece, possible_moves, row, col, board):
+    """
+    Versión anterior del rey: bucle de desplazamientos más el enroque.
+    """
+    legacy_step_moves(piece, possible_moves, row, col, board, king_moves)
+    if can_castle(piece, row, col, board):
+        if can_castle_kingside(piece, row, board):
+            possible_moves.append((row, 6))
+        if can_castle_queenside(piece, row, board):
+            possible_moves.append((row, 2))
+    return possible_moves
+
+
+def legacy_slide_moves(piece, possible_moves, row, col, board, directions):
+    """
+    Versión anterior de las piezas deslizantes (un paso por casilla del rayo).
+    """
+    color = PIECE_COLOR[piece]
+    occupied = board.occupied
+    enemies = board.occupancy[color ^ 1]
+    for direction in directions:
+        for i in range(1, 8):
+            new_row, new_col = row + direction[0] * i, col + direction[1] * i
+            if 0 <= new_row < 8 and 0 <= new_col < 8:
+                bit = SQUARE_BB[new_row * 8 + new_col]
+                if not occupied & bit:
+                    possible_moves.append((new_row, new_col))
+                elif enemies & bit:
+                    possible_moves.append((new_row, new_col))
+                    break
+                else:
+                    break
+            else:
+                break
+    return possible_moves
+
+
+LEGACY = {
+    'knight': lambda p, m, r, c, b: legacy_step_moves(p, m, r, c, b, knight_moves),
+    'king': legacy_king_moves,
+    'rook': lambda p, m, r, c, b: legacy_slide_moves(p, m, r, c, b, rook_moves),
+    'bishop': lambda p, m, r, c, b: legacy_slide_moves(p, m, r, c, b, bishop_moves),
+    'queen': lambda p, m, r, c, b: legacy_slide_moves(
+        p, m, r, c, b, rook_moves + bishop_moves),
+}
+
+TABLES = {
+    'knight': lambda p, m, r, c, b: get_knight_moves(p, m, r, c, b, 'pvp'),
+    'king': lambda p, m, r, c, b: get_king_moves(p, m, r, c, b, 'pvp'),
+    'rook': lambda p, m, r, c, b: get_rook_moves(p, m, r, c, b, 'pvp'),
+    'bishop': lambda p, m, r, c, b: get_bishop_moves(p, m, r, c, b, 'pvp'),
+    'queen': lambda p, m, r, c, b: get_queen_moves(p, m, r, c, b, 'pvp'),
+}
+
+
+def collect_cases(positions):
+    """
+    Agrupa por tipo de pieza todas las piezas de las posiciones de prueba.
+    """
+    cases = {ptype: [] for ptype in LEGACY}
+    for board in positions:
+        for color in (WHITE_SIDE, BLACK_SIDE):
+            for piece, row, col in side_pieces(board, color):
+                ptype = piece.split('_')[1]
+                if ptype in cases:
+                    cases[ptype].append((piece, row, col, board))
+    return cases
+
+
+def time_generator(generator, cases, repeat):
+    """
+    Devuelve las llamadas por segundo de un generador sobre los casos dados.
+    """
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for piece, row, col, board in cases:
+            generator(piece, [], row, col, board)
+    elapsed = time.perf_counter() - start
+    return len(cases) * repeat / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--positions', type=int, default=200)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    cases = collect_cases(sample_positions(args.positions))
+
+    print(f"{'pieza':<8}{'desplazamientos/s':>20}{'tablas/s':>16}{'mejora':>10}")
+    for ptype, items in cases.items():
+        # Ambas implementaciones deben producir los mismos destinos
+        for piece, row, col, board in items:
+            assert (sorted(LEGACY[ptype](piece, [], row, col, board)) ==
+                    sorted(TABLES[ptype](piece, [], row, col, board)))
+        legacy = time_generator(LEGACY[ptype], items, args.repeat)
+        tables = time_generator(TABLES[ptype], items, args.repeat)
+        print(f"{ptype:<8}{legacy:>20,.0f}{tables:>16,.0f}{tables / legacy:>9.2f}x")
+
+
+if __name__ == '__main__':
+    main()
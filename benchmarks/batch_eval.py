@@ -0,0 +1,63 @@
+"""
+Compara el análisis por lotes con NumPy (batch_eval.py) con el camino escalar
+(native_engine.evaluate y generate_legal_moves posición a posición) en
+posiciones por segundo.
+
+Uso:
+    python -m benchmarks.batch_eval [--positions N] [--batch N]
+"""
+import argparse
+import time
+
+from batch_eval import analyse, boards_to_array, evaluate_batch
+from legal_moves import generate_legal_moves
+from native_engine import evaluate
+from benchmarks.positions import game_positions
+
+
+def timed(function):
+    """
+    Ejecuta 'function' y devuelve (resultado, segundos).
+    """
+    start = time.perf_counter()
+    result = function()
+    return result, time.perf_counter() - start
+
+
+def report(label, count, elapsed):
+    """
+    Muestra una línea de resultados en posiciones por segundo.
+    """
+    print(f"{label:<34} {elapsed:8.3f}s {count / elapsed:>12,.0f} posiciones/s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Análisis por lotes frente al escalar")
+    parser.add_argument('--positions', type=int, default=20000)
+    parser.add_argument('--batch', type=int, default=4096,
+                        help="posiciones por llamada vectorizada")
+    args = parser.parse_args()
+
+    boards = game_positions(args.positions)
+    count = len(boards)
+    print(f"{count} posiciones")
+
+    _, elapsed = timed(lambda: [(evaluate(board), len(generate_legal_moves(board)))
+                                for board in boards])
+    report("escalar (evaluate + movimientos)", count, elapsed)
+
+    (pieces, turns), elapsed = timed(lambda: boards_to_array(boards))
+    report("conversión a array (N, 12)", count, elapsed)
+
+    def batched():
+        for start in range(0, count, args.batch):
+            chunk = slice(start, start + args.batch)
+            _, moves = analyse(pieces[chunk])
+            evaluate_batch(pieces[chunk], turns[chunk], moves=moves)
+
+    _, elapsed = timed(batched)
+    report(f"lotes de {args.batch} (ataques + eval)", count, elapsed)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,61 @@
+"""
+Mide los nodos por segundo del motor nativo (native_engine.py) con búsquedas
+de profundidad fija sobre posiciones de referencia.
+
+Uso:
+    python -m benchmarks.native_engine [--depth N] [--min-nps N]
+
+Termina con código 1 si el rendimiento queda por debajo de --min-nps.
+"""
+import argparse
+import time
+
+from legal_moves import move_to_uci
+from native_engine import NativeAI
+from perft import PERFT_SUITE
+
+# Objetivo mínimo de nodos por segundo (búsqueda + quietud) en CPython
+DEFAULT_MIN_NPS = 20_000
+
+
+def run(depth):
+    """
+    Busca cada posición de PERFT_SUITE a profundidad fija.
+
+    Returns:
+        tuple: (nodos totales, segundos totales)
+    """
+    engine = NativeAI({'native_depth': depth})
+    total_nodes = 0
+    total_time = 0.0
+    for name, fen, _ in PERFT_SUITE:
+        engine.reset_position(fen)
+
+        start = time.perf_counter()
+        move, score = engine.search(depth)
+        elapsed = time.perf_counter() - start
+
+        total_nodes += engine.nodes
+        total_time += elapsed
+        print(f"{name:<12} {move_to_uci(move):<6} {score:>7} "
+              f"{engine.nodes:>8} nodos {elapsed:7.3f}s "
+              f"{engine.nodes / elapsed:>9,.0f} nps")
+    return total_nodes, total_time
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rendimiento del motor nativo")
+    parser.add_argument('--depth', type=int, default=4)
+    parser.add_argument('--min-nps', type=int, default=DEFAULT_MIN_NPS)
+    args = parser.parse_args()
+
+    nodes, elapsed = run(args.depth)
+    nps = nodes / elapsed
+    print(f"\nTotal: {nodes} nodos en {elapsed:.2f}s, {nps:,.0f} nps "
+          f"(objetivo {args.min_nps:,})")
+    if nps < args.min_nps:
+        raise SystemExit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,88 @@
+"""
+Mide la latencia de las respuestas del libro de aperturas (opening_book.py)
+frente a una búsqueda del motor nativo en las mismas posiciones.
+
+Uso:
+    python -m benchmarks.opening_book [--book libro.bin] [--depth N]
+
+Sin --book se genera un libro temporal con las primeras jugadas de partidas
+aleatorias (para medir la búsqueda binaria sobre un fichero de tamaño real,
+usa un libro Polyglot de verdad).
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from bitboard import BitBoard, START_FEN
+from legal_moves import generate_legal_moves
+from native_engine import NativeAI
+from opening_book import OpeningBook, write_book
+from profiler import percentile
+
+
+def opening_positions(count, plies=10, seed=2024):
+    """
+    Genera entradas (posición, movimiento, peso) de aperturas aleatorias.
+    """
+    rng = random.Random(seed)
+    for _ in range(count):
+        board = BitBoard.from_fen(START_FEN)
+        for _ in range(plies):
+            moves = generate_legal_moves(board)
+            if not moves:
+                break
+            move = rng.choice(moves)
+            yield board.copy(), move, rng.randint(1, 1000)
+            board.apply_move(move)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Latencia del libro de aperturas")
+    parser.add_argument('--book', help="libro Polyglot existente")
+    parser.add_argument('--games', type=int, default=5000,
+                        help="aperturas del libro generado")
+    parser.add_argument('--depth', type=int, default=3,
+                        help="profundidad del motor nativo de referencia")
+    args = parser.parse_args()
+
+    path = args.book
+    if path is None:
+        handle, path = tempfile.mkstemp(suffix='.bin')
+        os.close(handle)
+        write_book(path, opening_positions(args.games))
+
+    book = OpeningBook(path)
+    try:
+        # Posiciones de consulta: las del libro recorridas por sus propias jugadas
+        rng = random.Random(7)
+        samples = []
+        for _ in range(200):
+            board = BitBoard.from_fen(START_FEN)
+            while True:
+                start = time.perf_counter()
+                move = book.choose(board, 1.0, rng)
+                samples.append((time.perf_counter() - start) * 1000)
+                if move is None:
+                    break
+                board.apply_move(move)
+        samples.sort()
+        print(f"Libro: {len(book)} entradas, {len(samples)} consultas")
+        print(f"  p50={percentile(samples, 0.5):.3f} ms "
+              f"p99={percentile(samples, 0.99):.3f} ms max={samples[-1]:.3f} ms")
+
+        engine = NativeAI({'native_depth': args.depth})
+        start = time.perf_counter()
+        engine.search(args.depth)
+        elapsed = (time.perf_counter() - start) * 1000
+        print(f"Motor nativo a profundidad {args.depth} desde la posición "
+              f"inicial: {elapsed:.1f} ms")
+    finally:
+        book.close()
+        if args.book is None:
+            os.remove(path)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,87 @@
+"""
+Mide el rendimiento del lector y el escritor PGN (pgn.py) en partidas por
+segundo: solo lectura (etiquetas y SAN) y lectura con validación de las
+jugadas contra las reglas.
+
+Uso:
+    python -m benchmarks.pgn_parse [--games N] [--file partidas.pgn]
+
+Sin --file se genera un fichero temporal con partidas de jugadas aleatorias.
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from bitboard import BitBoard, START_FEN
+from legal_moves import generate_legal_moves
+from pgn import PgnGame, read_games, write_games
+
+
+def random_games(count, max_plies=120, seed=2024):
+    """
+    Genera partidas de jugadas legales al azar.
+    """
+    rng = random.Random(seed)
+    for index in range(count):
+        board = BitBoard.from_fen(START_FEN)
+        moves = []
+        for _ in range(rng.randint(20, max_plies)):
+            legal = generate_legal_moves(board)
+            if not legal:
+                break
+            move = rng.choice(legal)
+            board.apply_move(move)
+            moves.append(move)
+        yield PgnGame.from_moves(moves, {'Event': f"Benchmark {index}",
+                                         'White': "random", 'Black': "random"})
+
+
+def timed(function):
+    """
+    Ejecuta 'function' y devuelve (resultado, segundos).
+    """
+    start = time.perf_counter()
+    result = function()
+    return result, time.perf_counter() - start
+
+
+def report(label, count, elapsed, extra=''):
+    """
+    Muestra una línea de resultados en partidas por segundo.
+    """
+    print(f"{label:<26} {count:>7} partidas {elapsed:8.3f}s "
+          f"{count / elapsed:>10,.0f} partidas/s{extra}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rendimiento del lector PGN")
+    parser.add_argument('--games', type=int, default=500)
+    parser.add_argument('--file', help="fichero PGN existente a leer")
+    args = parser.parse_args()
+
+    path = args.file
+    if path is None:
+        handle, path = tempfile.mkstemp(suffix='.pgn')
+        os.close(handle)
+        written, elapsed = timed(lambda: write_games(path, random_games(args.games)))
+        report("generar y escribir", written, elapsed)
+
+    try:
+        size = os.path.getsize(path)
+        count, elapsed = timed(lambda: sum(1 for _ in read_games(path)))
+        report("leer (etiquetas y SAN)", count, elapsed,
+               f" {size / elapsed / 1e6:6.1f} MB/s")
+
+        plies, elapsed = timed(
+            lambda: sum(len(game.decode()) for game in read_games(path)))
+        report("leer y validar jugadas", count, elapsed,
+               f" {plies / elapsed:>10,.0f} medios movimientos/s")
+    finally:
+        if args.file is None:
+            os.remove(path)
+
+
+if __name__ == '__main__':
+    main()
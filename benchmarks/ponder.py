@@ -0,0 +1,159 @@
+"""
+Comprueba la búsqueda anticipada (ponder) de AIWorker con el motor real.
+
+Juega una partida en la que el "jugador" acierta la respuesta esperada una
+vez de cada dos: en los fallos, request_move detiene la búsqueda anticipada
+en curso desde el hilo que llama (el del juego). Se mide cuánto tardan en ese
+hilo las llamadas a request_move y ponder, que no deben esperar al motor, y
+la latencia hasta cada respuesta. Con Stockfish comprueba además que el stop
+no compite con el hilo de la IA por la salida del proceso (si lo hiciera,
+alguna llamada o búsqueda se quedaría bloqueada).
+
+Uso:
+    python -m benchmarks.ponder [--engine stockfish|nativo] [--rounds N]
+                                [--movetime ms] [--max-call-ms N]
+
+Termina con código 1 si alguna llamada supera --max-call-ms o alguna
+búsqueda no termina a tiempo.
+"""
+import argparse
+import os
+import random
+import threading
+import time
+from concurrent.futures import TimeoutError as FutureTimeout
+
+from ai_engine import create_engine
+from ai_worker import AIWorker
+from bitboard import START_FEN
+from core import GameState
+from legal_moves import move_to_uci
+from profiler import percentile
+from settings import DIFFICULTY
+
+# Tiempo máximo (ms) de request_move o ponder en el hilo que llama
+DEFAULT_MAX_CALL_MS = 50
+
+# Margen (s) sobre el tiempo de búsqueda antes de dar una búsqueda o una
+# llamada por colgada
+SEARCH_TIMEOUT = 10
+
+
+def hung(name):
+    """
+    Termina el proceso si una llamada del hilo del juego no vuelve: ese hilo
+    está bloqueado y no puede informar por sí mismo.
+    """
+    print(f"ERROR: {name} bloqueado más de {SEARCH_TIMEOUT} s")
+    os._exit(1)
+
+
+def timed(function, *args):
+    """
+    Ejecuta function(*args) y devuelve (resultado, ms).
+    """
+    watchdog = threading.Timer(SEARCH_TIMEOUT, hung, (function.__name__,))
+    watchdog.daemon = True
+    watchdog.start()
+    start = time.perf_counter()
+    try:
+        result = function(*args)
+    finally:
+        watchdog.cancel()
+    return result, (time.perf_counter() - start) * 1000
+
+
+def run(args):
+    """
+    Juega --rounds turnos del motor con búsqueda anticipada entre ellos.
+
+    Returns:
+        tuple: (motor, ms de las llamadas, ms hasta cada respuesta, worker,
+        error o None)
+    """
+    difficulty = dict(DIFFICULTY[args.difficulty], engine=args.engine,
+                      eval_cache=None, book=None)
+    engine = create_engine(difficulty)
+    worker = AIWorker(engine)
+    rng = random.Random(args.seed)
+    state = GameState()
+    timeout = args.movetime / 1000 + SEARCH_TIMEOUT
+    calls, replies = [], []
+
+    for turn in range(args.rounds):
+        if state.game_over:
+            state.reset()
+            worker.cancel()
+            worker.submit(engine.reset_position, START_FEN)
+
+        # Turno del motor (reutiliza la búsqueda anticipada si acertó)
+        start = time.perf_counter()
+        search, elapsed = timed(worker.request_move, state.uci_moves(),
+                                args.movetime)
+        calls.append(elapsed)
+        try:
+            best_move = search.result(timeout=timeout)
+        except FutureTimeout:
+            return engine, calls, replies, worker, f"búsqueda colgada (turno {turn})"
+        replies.append((time.perf_counter() - start) * 1000)
+        if best_move is None:
+            return engine, calls, replies, worker, f"sin jugada (turno {turn})"
+        pv = list(getattr(engine, 'last_pv', None) or [])
+        state.play_uci(best_move)
+        worker.submit(engine.make_move, best_move)
+        if state.game_over:
+            continue
+
+        # Turno del "jugador": el motor piensa la respuesta esperada mientras
+        # tanto; la mitad de las veces se juega otra para forzar el stop
+        legal = [move_to_uci(move) for move in state.legal_moves()]
+        expected = pv[1] if len(pv) >= 2 and pv[0] == best_move else None
+        if expected in legal:
+            _, elapsed = timed(worker.ponder, state.uci_moves(), expected,
+                               args.movetime)
+            calls.append(elapsed)
+        time.sleep(args.movetime / 2000)
+        others = [uci for uci in legal if uci != expected]
+        if expected in legal and (turn % 2 or not others):
+            reply = expected
+        else:
+            reply = rng.choice(others)
+        state.play_uci(reply)
+        worker.submit(engine.make_move, reply)
+    return engine, calls, replies, worker, None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Búsqueda anticipada del motor")
+    parser.add_argument('--engine', choices=('stockfish', 'nativo'),
+                        default='stockfish')
+    parser.add_argument('--difficulty', choices=list(DIFFICULTY), default='MEDIO')
+    parser.add_argument('--rounds', type=int, default=20,
+                        help="jugadas del motor")
+    parser.add_argument('--movetime', type=int, default=300,
+                        help="ms por búsqueda")
+    parser.add_argument('--max-call-ms', type=float, default=DEFAULT_MAX_CALL_MS)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    engine, calls, replies, worker, error = run(args)
+    calls.sort()
+    replies.sort()
+    print(f"Motor: {type(getattr(engine, 'engine', engine)).__name__}  "
+          f"aciertos: {worker.ponder_hits}  fallos: {worker.ponder_misses}")
+    print(f"Llamadas en el hilo del juego: p50 {percentile(calls, 0.50):.2f} ms"
+          f"  máx {calls[-1] if calls else 0:.2f} ms")
+    print(f"Respuesta del motor: p50 {percentile(replies, 0.50):.0f} ms"
+          f"  p90 {percentile(replies, 0.90):.0f} ms")
+
+    if error is None and calls and calls[-1] > args.max_call_ms:
+        error = f"llamada de {calls[-1]:.1f} ms (máximo {args.max_call_ms} ms)"
+    if error is not None:
+        print(f"ERROR: {error}")
+        # El hilo de la IA puede seguir bloqueado: no se espera a que termine
+        os._exit(1)
+    worker.shutdown()
+
+
+if __name__ == '__main__':
+    main()
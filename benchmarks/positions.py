@@ -0,0 +1,82 @@
+"""
+Conjuntos de posiciones fijas y reproducibles para los benchmarks.
+"""
+import random
+
+from bitboard import BitBoard, KING, PIECE_NAMES, START_FEN, iter_bits
+from legal_moves import generate_legal_moves
+from movements import MOVE_GENERATORS
+
+START_ROWS = [
+    ["black_rook", "black_knight", "black_bishop", "black_queen",
+        "black_king", "black_bishop", "black_knight", "black_rook"],
+    ["black_pawn"] * 8,
+    [None] * 8,
+    [None] * 8,
+    [None] * 8,
+    [None] * 8,
+    ["white_pawn"] * 8,
+    ["white_rook", "white_knight", "white_bishop", "white_queen",
+        "white_king", "white_bishop", "white_knight", "white_rook"]
+]
+
+
+def sample_positions(count=200, plies=40, seed=2024):
+    """
+    Genera posiciones jugando movimientos aleatorios (con semilla fija) desde
+    la posición inicial.
+
+    Returns:
+        list: Lista de BitBoard con posiciones de apertura y medio juego.
+    """
+    rng = random.Random(seed)
+    positions = []
+    while len(positions) < count:
+        board = BitBoard.from_rows(START_ROWS)
+        for ply in range(rng.randint(4, plies)):
+            color = ply % 2
+            moves = []
+            for sq in iter_bits(board.occupancy[color]):
+                piece = PIECE_NAMES[board.mailbox[sq]]
+                row, col = divmod(sq, 8)
+                targets = MOVE_GENERATORS[board.mailbox[sq] % 6](
+                    piece, [], row, col, board, 'pvp')
+                moves.extend((sq, t[0] * 8 + t[1]) for t in targets)
+            # Evitar capturar reyes: el benchmark necesita posiciones completas
+            moves = [m for m in moves
+                     if board.mailbox[m[1]] is None or board.mailbox[m[1]] % 6 != KING]
+            if not moves:
+                break
+            board.move_piece(*rng.choice(moves))
+        positions.append(board)
+    return positions
+
+
+def game_positions(count, seed=2024):
+    """
+    Genera posiciones de partidas con jugadas legales al azar (con semilla
+    fija), con turno, enroques y captura al paso coherentes.
+
+    Returns:
+        list: Lista de BitBoard.
+    """
+    rng = random.Random(seed)
+    positions = []
+    while len(positions) < count:
+        board = BitBoard.from_fen(START_FEN)
+        for _ in range(rng.randint(10, 120)):
+            moves = generate_legal_moves(board)
+            if not moves or len(positions) >= count:
+                break
+            board.apply_move(rng.choice(moves))
+            positions.append(board.copy())
+    return positions
+
+
+def side_pieces(board, color):
+    """
+    Devuelve las piezas (nombre, fila, columna) de un color en la posición.
+    """
+    return [(PIECE_NAMES[board.mailbox[sq]],) + divmod(sq, 8)
+            for sq in iter_bits(board.occupancy[color])]
+
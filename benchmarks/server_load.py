@@ -0,0 +1,161 @@
+"""
+Prueba de carga del servidor de partidas (server.py).
+
+Arranca el servidor en un puerto libre y abre varias conexiones, cada una con
+varias partidas simultáneas en las que el cliente juega movimientos legales al
+azar contra el motor. Mide las jugadas por segundo atendidas y la latencia de
+cada petición (del envío de la jugada a la respuesta del motor).
+
+Uso:
+    python -m benchmarks.server_load [--clients 8] [--games 8] [--plies 40]
+    python -m benchmarks.server_load --port 8765  # contra un servidor ya arrancado
+"""
+import argparse
+import asyncio
+import json
+import random
+import time
+
+from core import GameState
+from legal_moves import move_to_uci
+from profiler import percentile
+from server import GameServer
+from settings import DIFFICULTY
+
+
+async def play_game(writer, lock, responses, args, rng, latencies):
+    """
+    Juega una partida por la conexión compartida.
+
+    Returns:
+        int: Jugadas enviadas.
+    """
+    request_id = rng.getrandbits(48)
+    color = rng.choice(('white', 'black'))
+    response = await request(writer, lock, responses, {
+        'id': request_id, 'op': 'new', 'difficulty': args.difficulty,
+        'color': color})
+    game_id = response['game']
+
+    # Copia local de la partida para elegir jugadas legales
+    state = GameState()
+    if response['reply']:
+        state.play_uci(response['reply'])
+
+    sent = 0
+    while not state.game_over and len(state.move_stack) < args.plies:
+        move = move_to_uci(rng.choice(state.legal_moves()))
+        state.play_uci(move)
+        start = time.perf_counter()
+        response = await request(writer, lock, responses, {
+            'id': request_id, 'op': 'move', 'game': game_id, 'move': move})
+        latencies.append((time.perf_counter() - start) * 1000)
+        sent += 1
+        if not response['ok']:
+            raise RuntimeError(response['error'])
+        if response['reply']:
+            state.play_uci(response['reply'])
+        if response['fen'] != state.fen():
+            raise RuntimeError(f"Posición distinta en la partida {game_id}")
+
+    await request(writer, lock, responses,
+                  {'id': request_id, 'op': 'close', 'game': game_id})
+    return sent
+
+
+async def request(writer, lock, responses, message):
+    """
+    Envía una petición y espera la respuesta con su mismo 'id'.
+    """
+    future = asyncio.get_running_loop().create_future()
+    responses[message['id']] = future
+    async with lock:
+        writer.write((json.dumps(message) + '\n').encode())
+        await writer.drain()
+    return await future
+
+
+async def read_responses(reader, responses):
+    """
+    Reparte las respuestas de una conexión entre las partidas que esperan.
+    """
+    while True:
+        line = await reader.readline()
+        if not line:
+            break
+        response = json.loads(line)
+        future = responses.pop(response.get('id'), None)
+        if future is not None and not future.done():
+            future.set_result(response)
+
+
+async def run_client(host, port, args, seed, latencies):
+    """
+    Abre una conexión y juega args.games partidas a la vez por ella.
+    """
+    reader, writer = await asyncio.open_connection(host, port)
+    responses = {}
+    lock = asyncio.Lock()
+    receiver = asyncio.create_task(read_responses(reader, responses))
+    rng = random.Random(seed)
+    try:
+        counts = await asyncio.gather(*(
+            play_game(writer, lock, responses, args,
+                      random.Random(rng.getrandbits(32)), latencies)
+            for _ in range(args.games)))
+    finally:
+        receiver.cancel()
+        writer.close()
+    return sum(counts)
+
+
+async def run(args):
+    server = None
+    host, port = '127.0.0.1', args.port
+    if port is None:
+        server = GameServer(port=0, workers=args.workers, engine_type=args.engine,
+                            movetime=args.movetime)
+        await server.start()
+        port = server.port
+
+    latencies = []
+    try:
+        start = time.perf_counter()
+        counts = await asyncio.gather(*(
+            run_client(host, port, args, args.seed + client, latencies)
+            for client in range(args.clients)))
+        elapsed = time.perf_counter() - start
+    finally:
+        if server is not None:
+            await server.close()
+
+    moves = sum(counts)
+    latencies.sort()
+    print(f"{args.clients * args.games} partidas simultáneas, {moves} jugadas "
+          f"en {elapsed:.2f}s: {moves / elapsed:.1f} jugadas/s")
+    print(f"Latencia por jugada (ms): p50={percentile(latencies, 0.5):.1f} "
+          f"p90={percentile(latencies, 0.9):.1f} p99={percentile(latencies, 0.99):.1f} "
+          f"max={latencies[-1] if latencies else 0.0:.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Prueba de carga del servidor")
+    parser.add_argument('--clients', type=int, default=8, help="conexiones")
+    parser.add_argument('--games', type=int, default=8,
+                        help="partidas simultáneas por conexión")
+    parser.add_argument('--plies', type=int, default=40,
+                        help="medios movimientos máximos por partida")
+    parser.add_argument('--difficulty', choices=list(DIFFICULTY), default='FÁCIL')
+    parser.add_argument('--engine', choices=('stockfish', 'nativo'),
+                        help="forzar el motor de las dificultades")
+    parser.add_argument('--movetime', type=int, default=100,
+                        help="tiempo por jugada del motor en ms")
+    parser.add_argument('--workers', type=int, help="procesos de motor")
+    parser.add_argument('--port', type=int,
+                        help="usar un servidor ya arrancado en este puerto")
+    parser.add_argument('--seed', type=int, default=0)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == '__main__':
+    main()
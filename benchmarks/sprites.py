@@ -0,0 +1,82 @@
+"""
+Mide la carga de las imágenes de las piezas y el coste de dibujarlas: la
+carga anterior (PNG de 128 px escalados en cada partida y sin convertir al
+formato de la pantalla) frente al atlas compartido de utils.py.
+
+Uso:
+    python -m benchmarks.sprites [--frames N]
+
+Con SDL_VIDEODRIVER=dummy funciona sin ventana.
+"""
+import argparse
+import os
+import time
+
+import pygame
+
+import utils
+from bitboard import BitBoard, START_FEN
+from settings import HEIGHT, MARGIN_TOP, SQUARE_SIZE, WIDTH
+
+
+def legacy_load_images():
+    """
+    Carga anterior: doce PNG de 128 px leídos y escalados en cada llamada.
+    """
+    pieces = {}
+    for name in utils.PIECE_NAMES:
+        path = os.path.join(f"assets/images/imgs-128px/{name}.png")
+        image = pygame.image.load(path)
+        pieces[name] = pygame.transform.scale(image, (SQUARE_SIZE, SQUARE_SIZE))
+    return pieces
+
+
+def timed(function, repeat=1):
+    """
+    Ejecuta 'function' 'repeat' veces y devuelve los milisegundos por llamada.
+    """
+    start = time.perf_counter()
+    for _ in range(repeat):
+        function()
+    return (time.perf_counter() - start) * 1000 / repeat
+
+
+def draw_frame(screen, images, placements):
+    """
+    Dibuja todas las piezas de la posición (un repintado completo).
+    """
+    for name, position in placements:
+        screen.blit(images[name], position)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Carga y dibujado de piezas")
+    parser.add_argument('--frames', type=int, default=2000)
+    parser.add_argument('--loads', type=int, default=20)
+    args = parser.parse_args()
+
+    pygame.init()
+    screen = pygame.display.set_mode((WIDTH, HEIGHT))
+    board = BitBoard.from_fen(START_FEN)
+    placements = [(board.piece_at(row, col),
+                   (col * SQUARE_SIZE, row * SQUARE_SIZE + MARGIN_TOP))
+                  for row in range(8) for col in range(8)
+                  if board.piece_at(row, col)]
+
+    print(f"Casilla de {SQUARE_SIZE} px, imágenes de "
+          f"{utils.source_image_size()} px")
+    print(f"  carga anterior (por partida)    {timed(legacy_load_images, args.loads):8.2f} ms")
+    utils._atlases.clear()
+    print(f"  atlas, primera carga            {timed(utils.load_images):8.2f} ms")
+    print(f"  atlas, partidas siguientes      {timed(utils.load_images, args.loads):8.4f} ms")
+
+    legacy = legacy_load_images()
+    atlas = utils.load_images()
+    for label, images in (("sin convertir", legacy), ("atlas convertido", atlas)):
+        elapsed = timed(lambda: draw_frame(screen, images, placements), args.frames)
+        print(f"  {len(placements)} piezas, {label:<17} {elapsed * 1000:8.1f} us/fotograma")
+    pygame.quit()
+
+
+if __name__ == '__main__':
+    main()
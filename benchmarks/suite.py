@@ -0,0 +1,380 @@
+"""
+Conjunto de benchmarks reproducibles con resultados en JSON.
+
+Mide, sobre conjuntos de posiciones fijos (semilla fija, ver positions.py):
+
+- movegen.<pieza>: llamadas por segundo de cada generador de movements.py
+- movegen.legal: posiciones por segundo de generate_legal_moves
+- move_piece: coste de ChessGame.move_piece (con sus repintados y sonido)
+- render.*: dibujado sin ventana de ChessGame.draw_* y de un fotograma
+  completo e incremental del BoardRenderer
+- engine.<dificultad>: latencia de get_best_move con cada nivel de DIFFICULTY
+  (sin libro ni caché de análisis)
+
+Los resultados se guardan en --output. Con --compare se comparan con otro
+fichero de resultados y el programa termina con código 1 si alguna medida
+empeora más que --threshold, para detectar regresiones en cada cambio.
+
+Uso:
+    python -m benchmarks.suite [--quick] [--output fichero.json]
+                               [--compare base.json] [--threshold 0.1]
+                               [--only movegen,render]
+
+Con SDL_VIDEODRIVER=dummy funciona sin ventana.
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+
+import pygame
+
+from bitboard import PROMOTION_SHIFT, QUEEN
+from core import GameState
+from legal_moves import generate_legal_moves
+from movements import MOVE_GENERATORS
+from perft import PERFT_SUITE
+from profiler import PROFILER, percentile
+from settings import DIFFICULTY, HEIGHT, WIDTH
+from benchmarks.positions import game_positions, sample_positions, side_pieces
+
+DEFAULT_OUTPUT = 'bench_results.json'
+
+# Empeoramiento relativo a partir del cual una medida cuenta como regresión
+DEFAULT_THRESHOLD = 0.10
+
+PIECE_TYPES = ('pawn', 'knight', 'bishop', 'rook', 'queen', 'king')
+
+# Tamaño de los conjuntos (normal, --quick)
+SIZES = {
+    'positions': (200, 40),
+    'repeat': (5, 2),
+    'moves': (400, 80),
+    'frames': (200, 40),
+    'engine_positions': (len(PERFT_SUITE), 2),
+}
+
+
+def best_time(function, repeat):
+    """
+    Mejor tiempo (segundos) de 'repeat' ejecuciones de 'function'. El mejor
+    tiempo es el menos afectado por el resto de procesos de la máquina.
+    """
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def throughput(count, elapsed, unit):
+    """
+    Resultado de una medida de rendimiento (más es mejor).
+    """
+    return {'value': count / elapsed, 'unit': unit, 'better': 'higher'}
+
+
+def latency(samples):
+    """
+    Resultado de una medida de latencia en ms (menos es mejor): mediana, con
+    el percentil 90 y el máximo como referencia.
+    """
+    values = sorted(samples)
+    return {'value': percentile(values, 0.50), 'unit': 'ms', 'better': 'lower',
+            'p90': percentile(values, 0.90), 'max': values[-1],
+            'samples': len(values)}
+
+
+def bench_movegen(sizes):
+    """
+    Generadores por pieza de movements.py y generación legal completa.
+    """
+    results = {}
+    cases = {ptype: [] for ptype in PIECE_TYPES}
+    for board in sample_positions(sizes['positions']):
+        for color in (0, 1):
+            for piece, row, col in side_pieces(board, color):
+                cases[piece.split('_')[1]].append((piece, row, col, board))
+
+    for index, ptype in enumerate(PIECE_TYPES):
+        generator = MOVE_GENERATORS[index]
+        items = cases[ptype]
+
+        def run():
+            for piece, row, col, board in items:
+                generator(piece, [], row, col, board, 'pvp')
+
+        results[f'movegen.{ptype}'] = throughput(
+            len(items), best_time(run, sizes['repeat']), 'calls/s')
+
+    boards = game_positions(sizes['positions'])
+
+    def run_legal():
+        for board in boards:
+            generate_legal_moves(board)
+
+    results['movegen.legal'] = throughput(
+        len(boards), best_time(run_legal, sizes['repeat']), 'positions/s')
+    return results
+
+
+def move_cases(count):
+    """
+    Posiciones (FEN) con jugadas legales que no terminan la partida (el
+    mensaje de fin de partida espera unos segundos).
+    """
+    state = GameState()
+    cases = []
+    for board in game_positions(count):
+        fen = board.to_fen()
+        state.reset(fen)
+        if state.game_over:
+            continue
+        moves = []
+        for move in state.legal_moves():
+            state.push_move(move)
+            if not state.game_over:
+                moves.append((divmod(move & 63, 8), divmod((move >> 6) & 63, 8),
+                              (move >> PROMOTION_SHIFT) & 7 or QUEEN))
+            state.undo()
+        if moves:
+            cases.append((fen, moves))
+    return cases
+
+
+def bench_move_piece(game, sizes):
+    """
+    Coste de ChessGame.move_piece sobre jugadas de posiciones fijas. Cada
+    jugada se deshace fuera de la medida.
+    """
+    samples = []
+    remaining = sizes['moves']
+    for fen, moves in move_cases(sizes['positions']):
+        game.state.reset(fen)
+        for start_pos, end_pos, promotion in moves[:remaining]:
+            start = time.perf_counter()
+            game.move_piece(start_pos, end_pos, promotion)
+            samples.append((time.perf_counter() - start) * 1000)
+            game.undo_move()
+        remaining -= min(remaining, len(moves))
+        if not remaining:
+            break
+    return {'move_piece': latency(samples)}
+
+
+def bench_render(game, sizes):
+    """
+    Dibujado sin ventana de cada parte del tablero y de fotogramas completos
+    e incrementales.
+    """
+    from renderer import draw_highlighted_moves
+
+    fens = [board.to_fen() for board in game_positions(sizes['frames'])]
+    renderer = game.renderer
+
+    # Destinos de todas las piezas del bando al que le toca, por posición
+    targets = {}
+    state = GameState()
+    for fen in fens:
+        state.reset(fen)
+        targets[fen] = [divmod(to_sq, 8) for moves in state.move_table().values()
+                        for to_sq in moves]
+
+    def each_position(draw):
+        def run():
+            for fen in fens:
+                game.state.reset(fen)
+                draw(fen)
+        return run
+
+    def highlighted(fen):
+        draw_highlighted_moves(game.screen, targets[fen])
+
+    def full_frame(fen):
+        renderer.mark_all()
+        renderer.render(game)
+
+    def incremental_frame(fen):
+        renderer.mark_squares(((6, 4), (4, 4)))
+        renderer.render(game)
+
+    # El reinicio de la posición también se mide: se descuenta después
+    reset = best_time(each_position(lambda fen: None), sizes['repeat'])
+    parts = (('render.draw_board', lambda fen: game.draw_board()),
+             ('render.draw_pieces', lambda fen: game.draw_pieces()),
+             ('render.draw_time', lambda fen: game.draw_time()),
+             ('render.draw_highlighted_moves', highlighted),
+             ('render.frame_full', full_frame),
+             ('render.frame_incremental', incremental_frame))
+    results = {}
+    for name, draw in parts:
+        elapsed = best_time(each_position(draw), sizes['repeat']) - reset
+        results[name] = throughput(len(fens), max(elapsed, 1e-9), 'frames/s')
+    return results
+
+
+def bench_engine(sizes, movetime=None):
+    """
+    Latencia de get_best_move por dificultad en las posiciones de PERFT_SUITE.
+    """
+    from ai_engine import create_engine
+
+    fens = [fen for _, fen, _ in PERFT_SUITE[:sizes['engine_positions']]]
+    results = {}
+    for name, settings in DIFFICULTY.items():
+        difficulty = dict(settings, eval_cache=None, book=None)
+        engine = create_engine(difficulty)
+        samples = []
+        nodes = 0
+        for fen in fens:
+            engine.reset_position(fen)
+            start = time.perf_counter()
+            engine.get_best_move([], movetime)
+            samples.append((time.perf_counter() - start) * 1000)
+            # Nodos del motor nativo: no dependen de la carga de la máquina
+            nodes += getattr(engine, 'nodes', 0)
+        result = results[f'engine.{name}'] = latency(samples)
+        result['engine'] = type(engine).__name__
+        if nodes:
+            result['nodes'] = nodes
+        engine.close()
+    return results
+
+
+def git_revision():
+    """
+    Commit actual del repositorio (None si no se puede consultar).
+    """
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'],
+                              capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_suite(args):
+    """
+    Ejecuta los grupos de benchmarks seleccionados.
+
+    Returns:
+        dict: Resultados por nombre de medida.
+    """
+    sizes = {key: value[1 if args.quick else 0] for key, value in SIZES.items()}
+    groups = set(args.only.split(',')) if args.only else None
+    # Sin las medidas del perfilador: se mide el coste real de cada función
+    PROFILER.enabled = False
+
+    results = {}
+    if groups is None or 'movegen' in groups:
+        results.update(bench_movegen(sizes))
+
+    if groups is None or groups & {'move_piece', 'render'}:
+        from game import ChessGame
+
+        pygame.init()
+        screen = pygame.display.set_mode((WIDTH, HEIGHT))
+        game = ChessGame(screen)
+        if groups is None or 'move_piece' in groups:
+            results.update(bench_move_piece(game, sizes))
+        if groups is None or 'render' in groups:
+            results.update(bench_render(game, sizes))
+        game.close()
+        pygame.quit()
+
+    if groups is None or 'engine' in groups:
+        results.update(bench_engine(sizes, args.movetime))
+    return results
+
+
+def compare(results, baseline, threshold):
+    """
+    Muestra la diferencia con unos resultados anteriores. Las latencias del
+    motor solo se comparan si las midió el mismo motor (sin Stockfish se
+    usa NativeAI).
+
+    Returns:
+        list: Nombres de las medidas que han empeorado más que 'threshold'.
+    """
+    regressions = []
+    print(f"\n{'medida':<32}{'base':>14}{'actual':>14}{'cambio':>10}")
+    for name, result in results.items():
+        base = baseline.get(name)
+        if base is None or not base['value']:
+            print(f"{name:<32}{'-':>14}{result['value']:>14,.3f}{'nueva':>10}")
+            continue
+        if result.get('engine') != base.get('engine'):
+            print(f"{name:<32}{base['value']:>14,.3f}{result['value']:>14,.3f}"
+                  f"  motor distinto ({base.get('engine')} -> "
+                  f"{result.get('engine')})")
+            continue
+        change = (result['value'] - base['value']) / base['value']
+        worse = -change if result['better'] == 'higher' else change
+        flag = ""
+        if worse > threshold:
+            regressions.append(name)
+            flag = "  REGRESIÓN"
+        print(f"{name:<32}{base['value']:>14,.3f}{result['value']:>14,.3f}"
+              f"{change:>+9.1%}{flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks del juego")
+    parser.add_argument('--output', default=DEFAULT_OUTPUT,
+                        help="fichero JSON de resultados")
+    parser.add_argument('--compare', metavar='BASE',
+                        help="resultados anteriores con los que comparar")
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help="empeoramiento relativo que cuenta como regresión")
+    parser.add_argument('--quick', action='store_true',
+                        help="conjuntos pequeños (para una comprobación rápida)")
+    parser.add_argument('--only',
+                        help="grupos separados por comas: movegen, move_piece, "
+                             "render, engine")
+    parser.add_argument('--movetime', type=int,
+                        help="ms por jugada del motor (por defecto, el 'time' "
+                             "de cada dificultad)")
+    args = parser.parse_args()
+
+    # La base se lee antes de escribir los resultados: --compare puede ser
+    # el mismo fichero que --output
+    baseline = None
+    if args.compare:
+        if not os.path.exists(args.compare):
+            sys.exit(f"No existe {args.compare}")
+        with open(args.compare, encoding='utf-8') as handle:
+            baseline = json.load(handle)['results']
+
+    results = run_suite(args)
+    for name, result in results.items():
+        print(f"{name:<32}{result['value']:>14,.3f} {result['unit']}")
+
+    report = {
+        'meta': {
+            'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'revision': git_revision(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'quick': args.quick,
+            'movetime': args.movetime,
+        },
+        'results': results,
+    }
+    with open(args.output, 'w', encoding='utf-8') as handle:
+        json.dump(report, handle, indent=2, ensure_ascii=False)
+    print(f"Resultados guardados en {args.output}")
+
+    if baseline is not None:
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} regresiones: {', '.join(regressions)}")
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
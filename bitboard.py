@@ -0,0 +1,463 @@
+"""
+Representación del tablero de ajedrez mediante bitboards de 64 bits.
+
+Cada casilla se identifica con un índice 0..63 calculado como fila * 8 + columna,
+usando las mismas coordenadas (fila, columna) que el resto del juego: la fila 0
+es la octava fila (lado de las negras) y la columna 0 es la columna 'a'.
+"""
+from zobrist import (ZOBRIST_PIECES, ZOBRIST_CASTLING, ZOBRIST_EP,
+                     ZOBRIST_BLACK_TO_MOVE, compute_key)
+
+COLORS = ('white', 'black')
+WHITE_SIDE, BLACK_SIDE = 0, 1
+COLOR_INDEX = {'white': WHITE_SIDE, 'black': BLACK_SIDE}
+
+PIECE_TYPES = ('pawn', 'knight', 'bishop', 'rook', 'queen', 'king')
+PAWN, KNIGHT, BISHOP, ROOK, QUEEN, KING = range(6)
+
+# Nombre de cada pieza ("white_pawn", ...) indexado por color * 6 + tipo
+PIECE_NAMES = tuple(f"{color}_{ptype}"
+                    for color in COLORS for ptype in PIECE_TYPES)
+PIECE_INDEX = {name: index for index, name in enumerate(PIECE_NAMES)}
+PIECE_COLOR = {name: index // 6 for index, name in enumerate(PIECE_NAMES)}
+
+SQUARE_BB = tuple(1 << sq for sq in range(64))
+FULL_BB = (1 << 64) - 1
+
+# Derechos de enroque
+CASTLE_WHITE_KINGSIDE = 1
+CASTLE_WHITE_QUEENSIDE = 2
+CASTLE_BLACK_KINGSIDE = 4
+CASTLE_BLACK_QUEENSIDE = 8
+CASTLE_ALL = 15
+
+# Derechos que se conservan cuando una pieza sale de (o llega a) cada casilla
+CASTLING_MASK = [CASTLE_ALL] * 64
+CASTLING_MASK[60] = CASTLE_ALL ^ (CASTLE_WHITE_KINGSIDE | CASTLE_WHITE_QUEENSIDE)
+CASTLING_MASK[63] = CASTLE_ALL ^ CASTLE_WHITE_KINGSIDE
+CASTLING_MASK[56] = CASTLE_ALL ^ CASTLE_WHITE_QUEENSIDE
+CASTLING_MASK[4] = CASTLE_ALL ^ (CASTLE_BLACK_KINGSIDE | CASTLE_BLACK_QUEENSIDE)
+CASTLING_MASK[7] = CASTLE_ALL ^ CASTLE_BLACK_KINGSIDE
+CASTLING_MASK[0] = CASTLE_ALL ^ CASTLE_BLACK_QUEENSIDE
+CASTLING_MASK = tuple(CASTLING_MASK)
+
+# Movimiento de la torre (origen, destino) según la casilla final del rey
+CASTLE_ROOK_MOVES = {62: (63, 61), 58: (56, 59), 6: (7, 5), 2: (0, 3)}
+
+# Codificación de movimientos como enteros:
+# bits 0-5 origen, 6-11 destino, 12-14 pieza de promoción y bits de tipo
+PROMOTION_SHIFT = 12
+FLAG_EN_PASSANT = 1 << 15
+FLAG_CASTLE = 1 << 16
+FLAG_DOUBLE_PUSH = 1 << 17
+
+FEN_PIECES = 'PNBRQKpnbrqk'
+START_FEN = 'rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1'
+
+
+def square(row, col):
+    """
+    Convierte coordenadas (fila, columna) en el índice de casilla 0..63.
+    """
+    return row * 8 + col
+
+
+def piece_index(color, ptype):
+    """
+    Devuelve el índice de pieza (0..11) para un color y un tipo.
+    """
+    return color * 6 + ptype
+
+
+def encode_move(from_sq, to_sq, promotion=0, flags=0):
+    """
+    Codifica un movimiento como entero (ver PROMOTION_SHIFT y FLAG_*).
+    """
+    return from_sq | to_sq << 6 | promotion << PROMOTION_SHIFT | flags
+
+
+def move_from(move):
+    """
+    Devuelve la casilla de origen de un movimiento codificado.
+    """
+    return move & 63
+
+
+def move_to(move):
+    """
+    Devuelve la casilla de destino de un movimiento codificado.
+    """
+    return (move >> 6) & 63
+
+
+def move_promotion(move):
+    """
+    Devuelve el tipo de pieza de promoción (KNIGHT..QUEEN) o 0.
+    """
+    return (move >> PROMOTION_SHIFT) & 7
+
+
+def iter_bits(bb):
+    """
+    Itera sobre los índices de las casillas activas de un bitboard.
+    """
+    while bb:
+        lsb = bb & -bb
+        yield lsb.bit_length() - 1
+        bb ^= lsb
+
+
+class BitBoard:
+    """
+    Posición de ajedrez almacenada en bitboards.
+
+    Atributos:
+    -----------
+    pieces : list
+        Doce bitboards, uno por combinación de color y tipo de pieza
+        (índice color * 6 + tipo).
+    occupancy : list
+        Máscara de ocupación de cada color (blancas, negras).
+    occupied : int
+        Máscara con todas las casillas ocupadas.
+    mailbox : list
+        Índice de pieza de cada casilla (o None) para consultas directas.
+    turn : int
+        Color al que le toca mover (WHITE_SIDE o BLACK_SIDE).
+    castling : int
+        Derechos de enroque (combinación de CASTLE_*).
+    ep_square : int
+        Casilla de captura al paso disponible, o None.
+    halfmove_clock : int
+        Medios movimientos desde la última captura o movimiento de peón.
+    fullmove_number : int
+        Número de jugada completa.
+    key : int
+        Clave Zobrist de la posición, actualizada de forma incremental.
+    """
+
+    __slots__ = ('pieces', 'occupancy', 'occupied', 'mailbox', 'turn',
+                 'castling', 'ep_square', 'halfmove_clock', 'fullmove_number',
+                 'key')
+
+    def __init__(self):
+        self.pieces = [0] * 12
+        self.occupancy = [0, 0]
+        self.occupied = 0
+        self.mailbox = [None] * 64
+        self.turn = WHITE_SIDE
+        self.castling = 0
+        self.ep_square = None
+        self.halfmove_clock = 0
+        self.fullmove_number = 1
+        self.key = compute_key(self)
+
+    @classmethod
+    def from_rows(cls, rows):
+        """
+        Construye un BitBoard a partir de la representación por listas de
+        cadenas ("white_pawn", None, ...).
+        """
+        board = cls()
+        for row in range(8):
+            for col in range(8):
+                name = rows[row][col]
+                if name:
+                    board.put_piece(PIECE_INDEX[name], square(row, col))
+
+        # Sin historial, se conceden los enroques con rey y torre en su sitio
+        mailbox = board.mailbox
+        for right, king_sq, rook_sq, king, rook in (
+                (CASTLE_WHITE_KINGSIDE, 60, 63, KING, ROOK),
+                (CASTLE_WHITE_QUEENSIDE, 60, 56, KING, ROOK),
+                (CASTLE_BLACK_KINGSIDE, 4, 7, 6 + KING, 6 + ROOK),
+                (CASTLE_BLACK_QUEENSIDE, 4, 0, 6 + KING, 6 + ROOK)):
+            if mailbox[king_sq] == king and mailbox[rook_sq] == rook:
+                board.castling |= right
+        board.key = compute_key(board)
+        return board
+
+    @classmethod
+    def from_fen(cls, fen):
+        """
+        Construye un BitBoard a partir de una cadena FEN.
+
+        Raises:
+            ValueError: Si la cadena FEN no es válida.
+        """
+        fields = fen.split()
+        if len(fields) < 4:
+            raise ValueError(f"FEN no válido: {fen!r}")
+
+        board = cls()
+        ranks = fields[0].split('/')
+        if len(ranks) != 8:
+            raise ValueError(f"FEN no válido: {fen!r}")
+        for row, rank in enumerate(ranks):
+            col = 0
+            for char in rank:
+                if char.isdigit():
+                    col += int(char)
+                elif char in FEN_PIECES and col < 8:
+                    board.put_piece(FEN_PIECES.index(char), square(row, col))
+                    col += 1
+                else:
+                    raise ValueError(f"FEN no válido: {fen!r}")
+            if col != 8:
+                raise ValueError(f"FEN no válido: {fen!r}")
+
+        if fields[1] not in ('w', 'b'):
+            raise ValueError(f"FEN no válido: {fen!r}")
+        board.turn = WHITE_SIDE if fields[1] == 'w' else BLACK_SIDE
+
+        for char, right in zip('KQkq', (CASTLE_WHITE_KINGSIDE, CASTLE_WHITE_QUEENSIDE,
+                                        CASTLE_BLACK_KINGSIDE, CASTLE_BLACK_QUEENSIDE)):
+            if char in fields[2]:
+                board.castling |= right
+
+        if fields[3] != '-':
+            col = 'abcdefgh'.find(fields[3][0])
+            if col < 0 or fields[3][1:] not in ('3', '6'):
+                raise ValueError(f"FEN no válido: {fen!r}")
+            board.ep_square = square(8 - int(fields[3][1]), col)
+
+        if len(fields) >= 6:
+            board.halfmove_clock = int(fields[4])
+            board.fullmove_number = int(fields[5])
+        board.key = compute_key(board)
+        return board
+
+    def to_rows(self):
+        """
+        Devuelve la vista derivada del tablero como lista de ocho listas de
+        cadenas, tal y como la usa el dibujado de piezas.
+        """
+        mailbox = self.mailbox
+        return [[PIECE_NAMES[mailbox[sq]] if mailbox[sq] is not None else None
+                 for sq in range(row * 8, row * 8 + 8)]
+                for row in range(8)]
+
+    def to_fen(self):
+        """
+        Devuelve la posición como cadena FEN. La casilla de captura al paso
+        solo aparece si algún peón puede realizarla.
+        """
+        mailbox = self.mailbox
+        ranks = []
+        for row in range(8):
+            rank = ''
+            empty = 0
+            for sq in range(row * 8, row * 8 + 8):
+                index = mailbox[sq]
+                if index is None:
+                    empty += 1
+                    continue
+                if empty:
+                    rank += str(empty)
+                    empty = 0
+                rank += FEN_PIECES[index]
+            if empty:
+                rank += str(empty)
+            ranks.append(rank)
+
+        castling = ''.join(
+            char for char, right in zip('KQkq', (CASTLE_WHITE_KINGSIDE, CASTLE_WHITE_QUEENSIDE,
+                                                 CASTLE_BLACK_KINGSIDE, CASTLE_BLACK_QUEENSIDE))
+            if self.castling & right) or '-'
+        if self.ep_square is None:
+            ep = '-'
+        else:
+            ep = 'abcdefgh'[self.ep_square & 7] + str(8 - (self.ep_square >> 3))
+        return (f"{'/'.join(ranks)} {'wb'[self.turn]} {castling} {ep} "
+                f"{self.halfmove_clock} {self.fullmove_number}")
+
+    def copy(self):
+        """
+        Devuelve una copia independiente de la posición.
+        """
+        board = BitBoard.__new__(BitBoard)
+        board.pieces = self.pieces[:]
+        board.occupancy = self.occupancy[:]
+        board.occupied = self.occupied
+        board.mailbox = self.mailbox[:]
+        board.turn = self.turn
+        board.castling = self.castling
+        board.ep_square = self.ep_square
+        board.halfmove_clock = self.halfmove_clock
+        board.fullmove_number = self.fullmove_number
+        board.key = self.key
+        return board
+
+    def piece_at(self, row, col):
+        """
+        Devuelve el nombre de la pieza en (fila, columna) o None si está vacía.
+        """
+        index = self.mailbox[row * 8 + col]
+        return PIECE_NAMES[index] if index is not None else None
+
+    def color_at(self, sq):
+        """
+        Devuelve el color (WHITE_SIDE o BLACK_SIDE) de la pieza en la casilla,
+        o None si está vacía.
+        """
+        bit = SQUARE_BB[sq]
+        if self.occupancy[WHITE_SIDE] & bit:
+            return WHITE_SIDE
+        if self.occupancy[BLACK_SIDE] & bit:
+            return BLACK_SIDE
+        return None
+
+    def pieces_of(self, color, ptype):
+        """
+        Devuelve el bitboard de las piezas de un color y tipo.
+        """
+        return self.pieces[color * 6 + ptype]
+
+    def put_piece(self, index, sq):
+        """
+        Coloca la pieza de índice dado en una casilla vacía.
+        """
+        bit = SQUARE_BB[sq]
+        self.pieces[index] |= bit
+        self.occupancy[index // 6] |= bit
+        self.occupied |= bit
+        self.mailbox[sq] = index
+        self.key ^= ZOBRIST_PIECES[index][sq]
+
+    def remove_piece(self, sq):
+        """
+        Retira la pieza de una casilla y devuelve su índice (o None).
+        """
+        index = self.mailbox[sq]
+        if index is None:
+            return None
+        mask = FULL_BB ^ SQUARE_BB[sq]
+        self.pieces[index] &= mask
+        self.occupancy[index // 6] &= mask
+        self.occupied &= mask
+        self.mailbox[sq] = None
+        self.key ^= ZOBRIST_PIECES[index][sq]
+        return index
+
+    def move_piece(self, from_sq, to_sq):
+        """
+        Mueve la pieza de from_sq a to_sq, capturando lo que hubiera en destino.
+
+        Returns:
+            int: Índice de la pieza capturada o None.
+        """
+        captured = self.remove_piece(to_sq)
+        index = self.remove_piece(from_sq)
+        if index is not None:
+            self.put_piece(index, to_sq)
+        return captured
+
+    def king_square(self, color):
+        """
+        Devuelve la casilla del rey de un color.
+        """
+        return self.pieces[color * 6 + KING].bit_length() - 1
+
+    def apply_move(self, move):
+        """
+        Aplica un movimiento codificado (ver encode_move) y actualiza el turno,
+        los derechos de enroque, la casilla de captura al paso y los relojes.
+
+        Returns:
+            int: Índice de la pieza capturada o None.
+        """
+        from_sq = move & 63
+        to_sq = (move >> 6) & 63
+        color = self.turn
+        moving = self.mailbox[from_sq]
+
+        if move & FLAG_EN_PASSANT:
+            # El peón capturado está detrás de la casilla de destino
+            captured = self.remove_piece(to_sq + 8 if color == WHITE_SIDE else to_sq - 8)
+            self.move_piece(from_sq, to_sq)
+        elif move & FLAG_CASTLE:
+            captured = self.move_piece(from_sq, to_sq)
+            rook_from, rook_to = CASTLE_ROOK_MOVES[to_sq]
+            self.move_piece(rook_from, rook_to)
+        else:
+            captured = self.move_piece(from_sq, to_sq)
+            promotion = (move >> PROMOTION_SHIFT) & 7
+            if promotion:
+                self.remove_piece(to_sq)
+                self.put_piece(color * 6 + promotion, to_sq)
+
+        key = self.key ^ ZOBRIST_CASTLING[self.castling] ^ ZOBRIST_BLACK_TO_MOVE
+        if self.ep_square is not None:
+            key ^= ZOBRIST_EP[self.ep_square & 7]
+        self.castling &= CASTLING_MASK[from_sq] & CASTLING_MASK[to_sq]
+        key ^= ZOBRIST_CASTLING[self.castling]
+
+        # Solo se anota la captura al paso si algún peón rival puede hacerla
+        self.ep_square = None
+        if move & FLAG_DOUBLE_PUSH:
+            ep_square = (from_sq + to_sq) // 2
+            col = to_sq & 7
+            enemy_pawns = self.pieces[(color ^ 1) * 6 + PAWN]
+            if ((col > 0 and enemy_pawns & SQUARE_BB[to_sq - 1]) or
+                    (col < 7 and enemy_pawns & SQUARE_BB[to_sq + 1])):
+                self.ep_square = ep_square
+                key ^= ZOBRIST_EP[ep_square & 7]
+        self.key = key
+
+        if moving % 6 == PAWN or captured is not None:
+            self.halfmove_clock = 0
+        else:
+            self.halfmove_clock += 1
+        if color == BLACK_SIDE:
+            self.fullmove_number += 1
+        self.turn = color ^ 1
+        return captured
+
+    def make_move(self, move):
+        """
+        Aplica un movimiento de forma reversible.
+
+        Returns:
+            tuple: Registro de deshacer (movimiento, pieza capturada, enroques,
+            casilla de captura al paso, reloj de medios movimientos, clave)
+            que se pasa a unmake_move para restaurar la posición.
+        """
+        undo = (move, None, self.castling, self.ep_square,
+                self.halfmove_clock, self.key)
+        captured = self.apply_move(move)
+        if captured is not None:
+            undo = (move, captured) + undo[2:]
+        return undo
+
+    def unmake_move(self, undo):
+        """
+        Deshace el movimiento descrito por un registro de make_move y deja la
+        posición exactamente como estaba.
+        """
+        move, captured, castling, ep_square, halfmove_clock, key = undo
+        from_sq = move & 63
+        to_sq = (move >> 6) & 63
+        color = self.turn ^ 1
+
+        if move & FLAG_EN_PASSANT:
+            self.move_piece(to_sq, from_sq)
+            self.put_piece(captured, to_sq + 8 if color == WHITE_SIDE else to_sq - 8)
+        elif move & FLAG_CASTLE:
+            self.move_piece(to_sq, from_sq)
+            rook_from, rook_to = CASTLE_ROOK_MOVES[to_sq]
+            self.move_piece(rook_to, rook_from)
+        else:
+            index = self.remove_piece(to_sq)
+            if (move >> PROMOTION_SHIFT) & 7:
+                index = color * 6 + PAWN
+            self.put_piece(index, from_sq)
+            if captured is not None:
+                self.put_piece(captured, to_sq)
+
+        self.castling = castling
+        self.ep_square = ep_square
+        self.halfmove_clock = halfmove_clock
+        self.key = key
+        if color == BLACK_SIDE:
+            self.fullmove_number -= 1
+        self.turn = color
@@ -1,4 +1,5 @@
 import pygame
+from text_cache import render_text
 
 
 class Button:
@@ -26,12 +27,11 @@ class Button:
         pygame.draw.rect(screen, border_color, self.rect, 2, border_radius=2)
 
         # Mejorar el texto
-        font = pygame.font.Font(None, 32)
-        text_surface = font.render(self.text, True, (220, 220, 220))
+        text_surface = render_text(self.text, 32, (220, 220, 220))
         text_rect = text_surface.get_rect(center=self.rect.center)
 
         # Agregar sombra al texto
-        shadow_surface = font.render(self.text, True, (20, 20, 20))
+        shadow_surface = render_text(self.text, 32, (20, 20, 20))
         shadow_rect = text_rect.copy()
         shadow_rect.x += 1
         shadow_rect.y += 1
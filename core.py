@@ -0,0 +1,291 @@
+"""
+Núcleo de reglas y estado de una partida, sin dependencias de pygame.
+
+GameState guarda la posición, el historial de repeticiones, la pila de jugadas
+para deshacer y los relojes, y decide cuándo termina la partida. No dibuja, no
+reproduce sonidos ni espera: ChessGame lo envuelve para la interfaz gráfica, y
+los servidores o procesos por lotes pueden importarlo sin inicializar SDL.
+"""
+import time
+
+from attack_map import AttackMap, move_squares
+from bitboard import BitBoard, COLORS, PROMOTION_SHIFT, QUEEN, START_FEN, square
+from legal_moves import generate_legal_moves, matches_uci, move_to_uci, uci_squares
+from settings import INITIAL_TIME
+from zobrist import PositionHistory
+
+
+class GameState:
+    """
+    Estado completo de una partida.
+
+    Atributos:
+    -----------
+    position : BitBoard
+        La posición actual.
+    history : PositionHistory
+        Claves Zobrist de la partida para detectar repeticiones.
+    attack_map : AttackMap
+        Casillas atacadas por cada bando, actualizadas con cada jugada.
+    start_fen : str
+        Posición (FEN) en la que empezó la partida.
+    move_stack : list
+        Registros de deshacer (ver BitBoard.make_move) de las jugadas hechas.
+    current_turn : str
+        Color del jugador al que le toca mover ('white' o 'black').
+    white_time : float
+        Tiempo restante de las blancas en segundos.
+    black_time : float
+        Tiempo restante de las negras en segundos.
+    game_over : bool
+        Si la partida ha terminado.
+    winner : str
+        Color ganador ('white' o 'black'), o None si son tablas o no ha
+        terminado.
+    result_reason : str
+        Motivo del final ('jaque mate', 'ahogado', 'repetición',
+        'regla de 50 movimientos'), o None.
+    """
+
+    def __init__(self, initial_time=INITIAL_TIME, clock=time.monotonic):
+        """
+        Parámetros:
+        -----------
+        initial_time : float
+            Tiempo inicial de cada jugador en segundos.
+        clock : callable
+            Función que devuelve el instante actual en segundos.
+        """
+        self.initial_time = initial_time
+        self.clock = clock
+        self.reset()
+
+    def reset(self, fen=START_FEN):
+        """
+        Reinicia la partida en la posición dada.
+
+        Raises:
+            ValueError: Si la cadena FEN no es válida.
+        """
+        self.position = BitBoard.from_fen(fen)
+        self.start_fen = fen
+        self.history = PositionHistory(self.position.key)
+        self.attack_map = AttackMap(self.position)
+        self.move_stack = []
+        self.current_turn = COLORS[self.position.turn]
+        self.white_time = self.initial_time
+        self.black_time = self.initial_time
+        self.last_time_update = self.clock()
+        self.game_over = False
+        self.winner = None
+        self.result_reason = None
+        self._table_key = None
+        # Una FEN de partida puede ser ya mate o ahogado
+        self._check_game_end()
+
+    def fen(self):
+        """
+        Devuelve la posición actual en notación FEN.
+        """
+        return self.position.to_fen()
+
+    def move_table(self):
+        """
+        Índice de los movimientos legales del turno: casilla de origen ->
+        {casilla de destino -> movimientos codificados} (varios solo en las
+        promociones). Se genera de una pasada la primera vez que se pide en
+        cada posición y se reutiliza para clics, resaltados, validación y
+        detección del final de la partida.
+        """
+        key = self.position.key
+        if self._table_key != key:
+            moves = generate_legal_moves(self.position)
+            table = {}
+            for move in moves:
+                table.setdefault(move & 63, {}).setdefault(
+                    (move >> 6) & 63, []).append(move)
+            self._legal_moves = moves
+            self._move_table = table
+            self._table_key = key
+        return self._move_table
+
+    def legal_moves(self):
+        """
+        Devuelve los movimientos legales de la posición (codificados). La
+        lista es la de la tabla del turno: no debe modificarse.
+        """
+        self.move_table()
+        return self._legal_moves
+
+    def possible_moves(self, position):
+        """
+        Devuelve las casillas (fila, columna) a las que puede ir la pieza de
+        'position' (las promociones comparten destino).
+        """
+        targets = self.move_table().get(square(*position), {})
+        return [divmod(target, 8) for target in targets]
+
+    def find_move(self, start_pos, end_pos, promotion=QUEEN):
+        """
+        Busca en la tabla del turno el movimiento legal de start_pos a end_pos
+        (con la promoción indicada si la hubiera).
+
+        Returns:
+            int: Movimiento codificado, o None si no es legal.
+        """
+        return self._lookup(square(*start_pos), square(*end_pos), promotion)
+
+    def _lookup(self, from_sq, to_sq, promotion=QUEEN):
+        """
+        Busca un movimiento por casillas (índices 0-63) en la tabla del turno.
+        """
+        moves = self.move_table().get(from_sq, {}).get(to_sq)
+        for move in moves or ():
+            move_promotion = (move >> PROMOTION_SHIFT) & 7
+            if not move_promotion or move_promotion == promotion:
+                return move
+        return None
+
+    def play(self, start_pos, end_pos, promotion=QUEEN):
+        """
+        Realiza el movimiento de start_pos a end_pos si es legal.
+
+        Returns:
+            int: Movimiento codificado, o None si no es legal o la partida
+            ha terminado.
+        """
+        if self.game_over:
+            return None
+        move = self.find_move(start_pos, end_pos, promotion)
+        if move is not None:
+            self.push_move(move)
+        return move
+
+    def play_uci(self, uci):
+        """
+        Realiza un movimiento en notación UCI.
+
+        Raises:
+            ValueError: Si el movimiento no es legal en la posición actual o
+            la partida ya ha terminado.
+        """
+        if self.game_over:
+            raise ValueError("La partida ha terminado")
+        squares = uci_squares(uci)
+        move = self._lookup(*squares) if squares else None
+        if not matches_uci(move, uci):
+            raise ValueError(f"Movimiento ilegal: {uci}")
+        self.push_move(move)
+        return move
+
+    def push_move(self, move):
+        """
+        Aplica un movimiento legal ya codificado: descuenta el tiempo de quien
+        mueve, registra la posición, cambia el turno y comprueba el final.
+
+        Raises:
+            ValueError: Si la partida ya ha terminado.
+        """
+        if self.game_over:
+            raise ValueError("La partida ha terminado")
+        self.update_time()
+        position = self.position
+        color = position.turn
+        self.move_stack.append(position.make_move(move))
+        self.attack_map.update(position, move_squares(move, color))
+        self.history.push(position.key,
+                          irreversible=position.halfmove_clock == 0)
+        self.current_turn = COLORS[position.turn]
+        self._check_game_end()
+
+    def undo(self):
+        """
+        Deshace la última jugada.
+
+        Returns:
+            int: El movimiento deshecho, o None si no había jugadas.
+        """
+        if not self.move_stack:
+            return None
+        self.update_time()
+        undo = self.move_stack.pop()
+        self.position.unmake_move(undo)
+        self.attack_map.update(self.position,
+                               move_squares(undo[0], self.position.turn))
+        self.history.pop()
+        self.current_turn = COLORS[self.position.turn]
+        self.game_over = False
+        self.winner = None
+        self.result_reason = None
+        return undo[0]
+
+    def uci_moves(self):
+        """
+        Devuelve las jugadas de la partida en notación UCI.
+        """
+        return [move_to_uci(undo[0]) for undo in self.move_stack]
+
+    def update_time(self, now=None):
+        """
+        Descuenta del reloj del jugador actual el tiempo transcurrido.
+        """
+        if now is None:
+            now = self.clock()
+        elapsed = now - self.last_time_update
+        if not self.game_over:
+            if self.current_turn == 'white':
+                self.white_time -= elapsed
+            else:
+                self.black_time -= elapsed
+        self.last_time_update = now
+
+    def in_check(self):
+        """
+        Indica si el rey del jugador al que le toca mover está en jaque.
+        """
+        return self.attack_map.in_check(self.position)
+
+    def is_checkmate(self):
+        """
+        Indica si el jugador al que le toca mover está en jaque mate.
+        """
+        return self.attack_map.is_checkmate(self.position)
+
+    def is_stalemate(self):
+        """
+        Indica si el jugador al que le toca mover está ahogado.
+        """
+        return self.attack_map.is_stalemate(self.position)
+
+    def is_threefold_repetition(self):
+        """
+        Indica si la posición actual ha aparecido tres veces.
+        """
+        return self.history.is_threefold(self.position.key)
+
+    def is_fifty_move_draw(self):
+        """
+        Indica si se han jugado 50 movimientos por bando sin capturas ni
+        movimientos de peón.
+        """
+        return self.position.halfmove_clock >= 100
+
+    def _check_game_end(self):
+        """
+        Marca el final de la partida por jaque mate, ahogado, repetición o
+        regla de 50 movimientos. Los mapas de ataque evitan generar todos los
+        movimientos del turno siguiente salvo cuando apenas tiene jugadas.
+        """
+        if not self.attack_map.has_legal_move(self.position):
+            if self.in_check():
+                self.winner = 'black' if self.current_turn == 'white' else 'white'
+                self.result_reason = 'jaque mate'
+            else:
+                self.result_reason = 'ahogado'
+            self.game_over = True
+        elif self.is_threefold_repetition():
+            self.result_reason = 'repetición'
+            self.game_over = True
+        elif self.is_fifty_move_draw():
+            self.result_reason = 'regla de 50 movimientos'
+            self.game_over = True
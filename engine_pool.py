@@ -0,0 +1,160 @@
+"""
+Pool de procesos de Stockfish compartido por todas las partidas.
+
+Arrancar Stockfish cuesta tiempo (búsqueda del ejecutable, creación del
+proceso, negociación UCI), y cada ChessGame en modo PvC creaba uno nuevo que
+nunca se cerraba. El pool mantiene procesos ya arrancados: una partida toma uno
+prestado con acquire() y lo devuelve con release(). Al prestarlo se ajustan
+nivel y profundidad y se envía 'ucinewgame' en lugar de arrancar otro proceso.
+"""
+import atexit
+import os
+import shutil
+import threading
+
+from stockfish import Stockfish
+
+START_FEN = 'rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1'
+
+
+def find_stockfish_path():
+    """
+    Encuentra la ruta del ejecutable de Stockfish (None si no existe).
+    """
+    # Primero intenta encontrar Stockfish en el PATH
+    path = shutil.which('stockfish')
+    if path:
+        return path
+
+    # Rutas comunes donde Stockfish podría estar instalado
+    possible_paths = [
+        '/usr/local/bin/stockfish',
+        '/opt/homebrew/bin/stockfish',
+        os.path.join(os.getcwd(), 'stockfish')
+    ]
+    for path in possible_paths:
+        if os.path.exists(path):
+            return path
+    return None
+
+
+class EnginePool:
+    """
+    Conjunto acotado de procesos de Stockfish reutilizables.
+
+    Atributos:
+    -----------
+    max_size : int
+        Número máximo de procesos vivos a la vez.
+    idle : list
+        Procesos libres listos para prestarse.
+    in_use : int
+        Procesos prestados actualmente.
+    spawned : int
+        Procesos arrancados desde la creación del pool (para métricas).
+    """
+
+    def __init__(self, max_size=4, stockfish_path=None):
+        self.max_size = max_size
+        self._path = stockfish_path
+        self._path_checked = stockfish_path is not None
+        self.idle = []
+        self.in_use = 0
+        self.spawned = 0
+        self._condition = threading.Condition()
+
+    @property
+    def stockfish_path(self):
+        """
+        Ruta del ejecutable, buscada una sola vez por pool.
+        """
+        if not self._path_checked:
+            self._path = find_stockfish_path()
+            self._path_checked = True
+        return self._path
+
+    def acquire(self, difficulty, timeout=None):
+        """
+        Presta un proceso configurado para la dificultad dada. Si todos están
+        ocupados y se alcanzó max_size, espera a que se libere uno.
+
+        Raises:
+            FileNotFoundError: Si no se encuentra el ejecutable de Stockfish.
+            TimeoutError: Si no se libera ningún proceso antes de 'timeout'.
+        """
+        path = self.stockfish_path
+        if not path:
+            raise FileNotFoundError(
+                "No se pudo encontrar el ejecutable de Stockfish")
+
+        with self._condition:
+            while not self.idle and self.in_use >= self.max_size:
+                if not self._condition.wait(timeout):
+                    raise TimeoutError("No hay procesos de Stockfish libres")
+            engine = self.idle.pop() if self.idle else None
+            self.in_use += 1
+
+        try:
+            if engine is not None:
+                try:
+                    self._configure(engine, difficulty)
+                    return engine
+                except Exception:
+                    # El proceso murió mientras estaba libre: se reemplaza
+                    self._quit(engine)
+            engine = Stockfish(path)
+            with self._condition:
+                self.spawned += 1
+            self._configure(engine, difficulty)
+            return engine
+        except Exception:
+            with self._condition:
+                self.in_use -= 1
+                self._condition.notify()
+            raise
+
+    def release(self, engine):
+        """
+        Devuelve un proceso prestado al pool.
+        """
+        with self._condition:
+            self.in_use -= 1
+            if len(self.idle) + self.in_use < self.max_size:
+                self.idle.append(engine)
+                engine = None
+            self._condition.notify()
+        if engine is not None:
+            self._quit(engine)
+
+    def shutdown(self):
+        """
+        Cierra todos los procesos libres (los prestados se cierran al volver).
+        """
+        with self._condition:
+            idle, self.idle = self.idle, []
+            self.max_size = 0
+        for engine in idle:
+            self._quit(engine)
+
+    def _configure(self, engine, difficulty):
+        """
+        Prepara un proceso para una partida nueva sin reiniciarlo.
+        """
+        engine.set_skill_level(difficulty['skill_level'])
+        engine.set_depth(difficulty['depth'])
+        engine.send_ucinewgame_command()
+        engine.set_fen_position(START_FEN)
+
+    def _quit(self, engine):
+        """
+        Termina un proceso de Stockfish ignorando errores de un proceso ya muerto.
+        """
+        try:
+            engine.send_quit_command()
+        except Exception:
+            pass
+
+
+# Pool compartido por todas las partidas del proceso
+ENGINE_POOL = EnginePool()
+atexit.register(ENGINE_POOL.shutdown)
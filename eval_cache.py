@@ -0,0 +1,200 @@
+"""
+Caché persistente de análisis de los motores.
+
+Las mismas posiciones (sobre todo aperturas y medios juegos habituales) se
+analizan una y otra vez entre sesiones. EvalCache guarda, por posición y
+parámetros de búsqueda (motor, nivel, profundidad), la mejor jugada, la
+puntuación y la variante principal en una base SQLite local, con una LRU en
+memoria delante. Cuando la base supera su tamaño máximo se expulsan las
+entradas usadas hace más tiempo.
+"""
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS evals (
+    position TEXT NOT NULL,
+    params TEXT NOT NULL,
+    best_move TEXT,
+    score INTEGER,
+    pv TEXT,
+    last_used REAL NOT NULL,
+    PRIMARY KEY (position, params)
+)
+"""
+_LAST_USED_INDEX = "CREATE INDEX IF NOT EXISTS evals_last_used ON evals (last_used)"
+
+
+def position_key(fen):
+    """
+    Clave de posición de una FEN: piezas, turno, enroques y captura al paso
+    (sin los relojes, que no cambian el análisis).
+    """
+    return ' '.join(fen.split()[:4])
+
+
+class EvalCache:
+    """
+    Resultados de búsqueda guardados en SQLite con una LRU en memoria.
+
+    Atributos:
+    -----------
+    path : str
+        Ruta de la base SQLite (':memory:' para no persistir).
+    memory_size : int
+        Entradas máximas de la LRU en memoria.
+    max_entries : int
+        Entradas máximas en disco antes de expulsar las más antiguas.
+    memory_hits : int
+        Consultas servidas desde la LRU en memoria.
+    disk_hits : int
+        Consultas servidas desde la base en disco.
+    misses : int
+        Consultas sin resultado guardado.
+    """
+
+    def __init__(self, path, memory_size=4096, max_entries=200_000):
+        self.path = path
+        self.memory_size = memory_size
+        self.max_entries = max_entries
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        # La conexión se usa desde el hilo de la IA: se protege con el lock
+        self._db = sqlite3.connect(path, timeout=10, check_same_thread=False)
+        if path != ':memory:':
+            self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(_SCHEMA)
+        self._db.execute(_LAST_USED_INDEX)
+        self._db.commit()
+        self._count = self._db.execute("SELECT COUNT(*) FROM evals").fetchone()[0]
+
+    def get(self, position, params):
+        """
+        Busca el análisis de una posición.
+
+        Returns:
+            tuple: (mejor jugada UCI, puntuación, variante principal como lista
+            UCI), o None si no está guardado.
+        """
+        cache_key = (position, params)
+        with self._lock:
+            entry = self._memory.get(cache_key)
+            if entry is not None:
+                self._memory.move_to_end(cache_key)
+                self.memory_hits += 1
+                return entry
+
+            row = self._db.execute(
+                "SELECT best_move, score, pv FROM evals WHERE position = ? AND params = ?",
+                cache_key).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+
+            self.disk_hits += 1
+            self._db.execute(
+                "UPDATE evals SET last_used = ? WHERE position = ? AND params = ?",
+                (time.time(),) + cache_key)
+            self._db.commit()
+            entry = (row[0], row[1], row[2].split() if row[2] else [])
+            self._remember(cache_key, entry)
+            return entry
+
+    def put(self, position, params, best_move, score=None, pv=()):
+        """
+        Guarda el análisis de una posición (reemplaza el anterior).
+        """
+        cache_key = (position, params)
+        entry = (best_move, score, list(pv))
+        with self._lock:
+            self._remember(cache_key, entry)
+            cursor = self._db.execute(
+                "INSERT OR REPLACE INTO evals VALUES (?, ?, ?, ?, ?, ?)",
+                cache_key + (best_move, score, ' '.join(pv), time.time()))
+            # El recuento es aproximado (un reemplazo también suma) y se
+            # corrige con COUNT(*) al expulsar
+            self._count += cursor.rowcount
+            if self._count > self.max_entries:
+                self._evict()
+            self._db.commit()
+
+    def _remember(self, cache_key, entry):
+        """
+        Guarda una entrada en la LRU en memoria expulsando la más antigua.
+        """
+        self._memory[cache_key] = entry
+        self._memory.move_to_end(cache_key)
+        if len(self._memory) > self.memory_size:
+            self._memory.popitem(last=False)
+
+    def _evict(self):
+        """
+        Borra de disco el 10 % de las entradas usadas hace más tiempo.
+        """
+        count = self._db.execute("SELECT COUNT(*) FROM evals").fetchone()[0]
+        excess = count - self.max_entries
+        if excess > 0:
+            excess += self.max_entries // 10
+            self._db.execute(
+                "DELETE FROM evals WHERE rowid IN "
+                "(SELECT rowid FROM evals ORDER BY last_used LIMIT ?)", (excess,))
+            count -= excess
+        self._count = count
+
+    def stats(self):
+        """
+        Devuelve los contadores de aciertos y fallos y la tasa de acierto.
+        """
+        with self._lock:
+            lookups = self.memory_hits + self.disk_hits + self.misses
+            hits = self.memory_hits + self.disk_hits
+            return {
+                'memory_hits': self.memory_hits,
+                'disk_hits': self.disk_hits,
+                'misses': self.misses,
+                'hit_rate': hits / lookups if lookups else 0.0,
+                'entries': self._count,
+            }
+
+    def clear(self):
+        """
+        Borra todas las entradas (en memoria y en disco).
+        """
+        with self._lock:
+            self._memory.clear()
+            self._db.execute("DELETE FROM evals")
+            self._db.commit()
+            self._count = 0
+
+    def close(self):
+        """
+        Cierra la base de datos.
+        """
+        with self._lock:
+            self._db.close()
+
+
+_caches = {}
+_caches_lock = threading.Lock()
+
+
+def get_eval_cache(path):
+    """
+    Devuelve la caché compartida de una ruta, abriéndola la primera vez (None
+    si la ruta es None o la base no puede abrirse).
+    """
+    if not path:
+        return None
+    with _caches_lock:
+        if path not in _caches:
+            try:
+                _caches[path] = EvalCache(path)
+            except sqlite3.Error as error:
+                print(f"Warning: no se pudo abrir la caché de análisis: {error}")
+                _caches[path] = None
+        return _caches[path]
@@ -1,8 +1,20 @@
 import pygame
-from settings import BOARD_SIZE, HEIGHT, MOVEMENT_BOX, ROWS, COLS, SQUARE_SIZE, WHITE, BLACK, DIFFICULTY, MARGIN_TOP, WIDTH, TIME_HEIGHT, background_color
+from settings import BOARD_SIZE, HEIGHT, MOVEMENT_BOX, SQUARE_SIZE, DIFFICULTY, MARGIN_TOP, WIDTH, TIME_HEIGHT, PONDER, background_color
 from utils import load_images
-from movements import *
-import pygame.mixer
+from audio import get_audio
+from bitboard import (BLACK_SIDE, COLOR_INDEX, QUEEN, PIECE_COLOR, iter_bits,
+                      square)
+from attack_map import move_squares
+from core import GameState
+from profiler import PROFILER, profiled
+from renderer import BoardRenderer, get_board_surface, square_rect
+from text_cache import render_text
+from ai_worker import AIWorker
+from time_manager import move_time
+from legal_moves import move_to_uci, PROMOTION_FROM_CHAR
+
+# Nombres de los colores en los mensajes de fin de partida
+WINNER_NAMES = {'white': "Blancas", 'black': "Negras"}
 
 
 class ChessGame:
@@ -13,8 +25,14 @@ class ChessGame:
     -----------
     screen : pygame.Surface
         La superficie de la pantalla donde se dibuja el juego.
+    state : GameState
+        Reglas, posición y relojes de la partida (sin pygame).
+    position : BitBoard
+        La posición del tablero en bitboards.
     board : list
-        La representación del tablero de ajedrez con las piezas.
+        Vista derivada del tablero como listas de cadenas (solo lectura).
+    history : PositionHistory
+        Claves Zobrist desde el último movimiento irreversible.
     pieces_images : dict
         Diccionario que contiene las imágenes de las piezas.
     game_mode : str
@@ -29,8 +47,8 @@ class ChessGame:
         Tiempo restante para el jugador negro en segundos.
     selected_piece : tuple
         Posición de la pieza seleccionada.
-    highlighted_moves : list
-        Lista de movimientos posibles para la pieza seleccionada.
+    highlighted_moves : set
+        Casillas (fila, columna) a las que puede ir la pieza seleccionada.
     waiting_for_player : bool
         Controlar el flujo de turnos.
     game_over : bool
@@ -39,9 +57,28 @@ class ChessGame:
         Controlar el movimiento de la CPU.
     last_move_time : int
         Tiempo del último movimiento de la CPU.
+    ai_worker : AIWorker
+        Hilo de trabajo donde se ejecutan las búsquedas de la CPU.
+    cpu_search : concurrent.futures.Future
+        Búsqueda de la CPU en curso (None si no hay ninguna).
+    cpu_search_started : int
+        Instante (ms) en que se pidió la búsqueda en curso.
+    pending_cpu_move : tuple
+        Movimiento de la CPU ya calculado que se aplica tras el resaltado.
+    cpu_pv : list
+        Variante principal (UCI) de la última jugada de la CPU, cuya segunda
+        jugada es la respuesta esperada del jugador.
+    renderer : BoardRenderer
+        Registro de casillas que han cambiado y deben repintarse.
+    move_stack : list
+        Registros de deshacer (ver BitBoard.make_move) de las jugadas hechas.
+
+    Las reglas y el estado viven en 'state'; esta clase añade el dibujado, el
+    sonido, los clics y la CPU.
     """
 
-    def __init__(self, screen, game_mode='pvp', difficulty_level=None):
+    def __init__(self, screen, game_mode='pvp', difficulty_level=None,
+                 fen=None):
         """
         Inicializa un nuevo juego de ajedrez.
 
@@ -53,109 +90,231 @@ class ChessGame:
             Modo de juego ('pvp' o 'pvc').
         difficulty_level : str
             Nivel de dificultad para modo PvC (None para pvp).
+        fen : str
+            Posición inicial en notación FEN (None para la posición inicial).
         """
         self.screen = screen
-        self.board = self.create_start_board()
+        self.state = GameState()
+        if fen:
+            self.state.reset(fen)
         self.pieces_images = load_images()
+        self.renderer = BoardRenderer()
+        self.time_rect = pygame.Rect(0, 0, WIDTH, TIME_HEIGHT)
 
         # Configuración del juego
         self.game_mode = game_mode
         self.difficulty = None
         self.ai_engine = None
+        self.ai_worker = None
 
         if game_mode == 'pvc' and difficulty_level:
             self.difficulty = DIFFICULTY[difficulty_level]
-            from ai_engine import ChessAI
-            self.ai_engine = ChessAI(self.difficulty)
-
-        # Turno por jugadores y tiempo máximo por jugador
-        self.current_turn = 'white'
-        self.white_time = 600  # 10 minutos
-        self.black_time = 600
-        self.last_time_update = pygame.time.get_ticks()
+            from ai_engine import create_engine
+            self.ai_engine = create_engine(self.difficulty)
+            self.ai_worker = AIWorker(self.ai_engine)
+            if fen:
+                self.ai_worker.submit(self.ai_engine.reset_position, fen)
 
         self.selected_piece = None
-        self.highlighted_moves = []
+        self.highlighted_moves = set()
         self.waiting_for_player = True
-        self.game_over = False
         self.waiting_for_cpu = False
         self.last_move_time = pygame.time.get_ticks()
 
         self.cpu_start_pos = None
         self.cpu_end_pos = None
         self.cpu_move_time = 0
+        self.cpu_search = None
+        self.cpu_search_started = 0
+        self.pending_cpu_move = None
+        self.cpu_pv = []
+
+        # Si la posición de partida deja el turno a la CPU, empieza ella
+        if self.ai_engine and self.current_turn == 'black':
+            self.waiting_for_cpu = True
+
+        self.audio = get_audio()
+
+    @property
+    def position(self):
+        """
+        Posición actual de la partida.
+        """
+        return self.state.position
+
+    @property
+    def history(self):
+        """
+        Historial de claves de la partida.
+        """
+        return self.state.history
 
-        pygame.mixer.init()
-        self.move_sound = pygame.mixer.Sound('assets/sounds/move.wav')
+    @property
+    def move_stack(self):
+        """
+        Registros de deshacer de las jugadas hechas.
+        """
+        return self.state.move_stack
+
+    @property
+    def current_turn(self):
+        """
+        Color del jugador al que le toca mover ('white' o 'black').
+        """
+        return self.state.current_turn
+
+    @property
+    def white_time(self):
+        """
+        Tiempo restante de las blancas en segundos.
+        """
+        return self.state.white_time
+
+    @property
+    def black_time(self):
+        """
+        Tiempo restante de las negras en segundos.
+        """
+        return self.state.black_time
+
+    @property
+    def game_over(self):
+        """
+        Si la partida ha terminado.
+        """
+        return self.state.game_over
+
+    @property
+    def board(self):
+        """
+        Vista del tablero como lista de ocho listas de cadenas, derivada de
+        los bitboards de la posición.
+        """
+        return self.position.to_rows()
 
     def make_cpu_move(self):
         """
-        Realiza el movimiento de la CPU y pinta el resaltado
+        Lanza la búsqueda de la CPU en el hilo de trabajo sin bloquear el
+        bucle de dibujado; update() recoge el resultado cuando esté listo.
         """
-        if not self.ai_engine or self.current_turn != 'black':
+        if not self.ai_engine or self.current_turn != 'black' or self.game_over:
             return
 
-        # Obtener el mejor movimiento
-        best_move = self.ai_engine.get_best_move([])
+        if self.cpu_search is None:
+            # Tiempo de la jugada según el reloj de la CPU y la dificultad
+            movetime = move_time(self.black_time, self.difficulty['time'],
+                                 len(self.move_stack))
+            # Con las jugadas de la partida el worker reconoce si ya pensó
+            # esta posición durante el turno del jugador
+            self.cpu_search_started = pygame.time.get_ticks()
+            self.cpu_search = self.ai_worker.request_move(
+                self.state.uci_moves(), movetime)
+
+    def start_ponder(self, cpu_move):
+        """
+        Tras mover la CPU, empieza a pensar su siguiente jugada suponiendo que
+        el jugador responderá con la segunda jugada de la variante principal.
+        La búsqueda tiene el mismo límite que tendría la jugada normal.
+        """
+        pv = self.cpu_pv
+        if not PONDER or self.game_over or len(pv) < 2 or pv[0] != cpu_move:
+            return
+        movetime = move_time(self.black_time, self.difficulty['time'],
+                             len(self.move_stack) + 1)
+        self.ai_worker.ponder(self.state.uci_moves(), pv[1], movetime)
+
+    def poll_cpu_move(self, current_time):
+        """
+        Comprueba si la búsqueda de la CPU ha terminado y, en ese caso, marca
+        el movimiento para resaltarlo antes de aplicarlo.
+        """
+        search = self.cpu_search
+        if search is None or not search.done():
+            return
+        self.cpu_search = None
+        if search.cancelled():
+            return
 
+        best_move = search.result()
+        if PROFILER.enabled:
+            # Latencia vista por el jugador (incluye libro, caché y ponder)
+            PROFILER.record('cpu_move', current_time - self.cpu_search_started)
+        self.cpu_pv = list(getattr(self.ai_engine, 'last_pv', None) or [])
         if best_move:
             # Convertir notación UCI a coordenadas del tablero
             start_file = ord(best_move[0]) - ord('a')
             start_rank = 8 - int(best_move[1])
             end_file = ord(best_move[2]) - ord('a')
             end_rank = 8 - int(best_move[3])
+            promotion = PROMOTION_FROM_CHAR.get(best_move[4:5], QUEEN)
+
+            # El movimiento se aplica tras mostrar el resaltado (ver update)
+            self.clear_cpu_highlight()
+            self.cpu_start_pos = (start_rank, start_file)
+            self.cpu_end_pos = (end_rank, end_file)
+            self.renderer.mark_squares((self.cpu_start_pos, self.cpu_end_pos))
+            self.cpu_move_time = current_time
+            self.pending_cpu_move = (self.cpu_start_pos, self.cpu_end_pos,
+                                     promotion)
+
+    def cancel_cpu_move(self):
+        """
+        Cancela la búsqueda de la CPU en curso y el movimiento pendiente.
+        """
+        if self.ai_worker:
+            self.ai_worker.cancel()
+        self.cpu_search = None
+        self.pending_cpu_move = None
+        self.waiting_for_cpu = False
 
-            # Pintar cuadrado en posición inicial
-            pygame.draw.rect(self.screen, (255, 150, 150),
-                             (start_file * SQUARE_SIZE,
-                             start_rank * SQUARE_SIZE + MARGIN_TOP,
-                             SQUARE_SIZE, SQUARE_SIZE))
-
-            # Pintar cuadrado en posición final
-            pygame.draw.rect(self.screen, (255, 150, 150),
-                             (end_file * SQUARE_SIZE,
-                             end_rank * SQUARE_SIZE + MARGIN_TOP,
-                             SQUARE_SIZE, SQUARE_SIZE))
-
-            # Redibujar la pieza en la posición final
-            piece = self.board[start_rank][start_file]
-            if piece:
-                self.screen.blit(
-                    self.pieces_images[piece],
-                    (end_file * SQUARE_SIZE,
-                     end_rank * SQUARE_SIZE + MARGIN_TOP))
-
-            # Actualizar el display para mostrar los cambios
-            pygame.display.update()
+    def close(self):
+        """
+        Detiene la IA al abandonar la partida (por ejemplo, al volver al menú).
+        """
+        self.cancel_cpu_move()
+        if self.ai_worker:
+            self.ai_worker.shutdown()
 
-            # Pequeña pausa para que se vea el efecto
-            pygame.time.wait(1000)
+    def clear_cpu_highlight(self):
+        """
+        Quita el resaltado del último movimiento de la CPU.
+        """
+        self.renderer.mark_squares((self.cpu_start_pos, self.cpu_end_pos))
+        self.cpu_start_pos = None
+        self.cpu_end_pos = None
+        self.cpu_move_time = 0
 
-            # Realizar el movimiento
-            self.move_piece((start_rank, start_file), (end_rank, end_file))
+    def draw_cpu_move(self, squares=None):
+        """
+        Pinta las casillas de origen y destino del último movimiento de la CPU
+        (solo las incluidas en 'squares', si se indica).
+        """
+        for position in (self.cpu_start_pos, self.cpu_end_pos):
+            if position and (squares is None or position in squares):
+                pygame.draw.rect(self.screen, MOVEMENT_BOX,
+                                 (position[1] * SQUARE_SIZE,
+                                  position[0] * SQUARE_SIZE + MARGIN_TOP,
+                                  SQUARE_SIZE, SQUARE_SIZE))
 
-    def create_start_board(self):
+    def set_highlighted_moves(self, moves):
         """
-        Crea y devuelve la configuración inicial del tablero.
+        Cambia los movimientos destacados marcando para repintar tanto los
+        anteriores como los nuevos.
         """
-        return [
-            ["black_rook", "black_knight", "black_bishop", "black_queen",
-                "black_king", "black_bishop", "black_knight", "black_rook"],
-            ["black_pawn"] * 8,
-            [None] * 8,
-            [None] * 8,
-            [None] * 8,
-            [None] * 8,
-            ["white_pawn"] * 8,
-            ["white_rook", "white_knight", "white_bishop", "white_queen",
-                "white_king", "white_bishop", "white_knight", "white_rook"]
-        ]
+        moves = set(moves)
+        self.renderer.mark_squares(self.highlighted_moves)
+        self.renderer.mark_squares(moves)
+        self.highlighted_moves = moves
 
     def handle_click(self, mouse_pos):
         """
         Maneja los clicks del usuario
         """
 
+        # Con la partida terminada (mate, ahogado o tablas) no se mueve nada
+        if self.game_over:
+            return False
+
         # si es el turno de la computadora en modo PvC, no hacer nada
         if self.current_turn == 'black' and self.game_mode == 'pvc':
             return False
@@ -170,15 +329,15 @@ class ChessGame:
             row = adjusted_y // SQUARE_SIZE
 
             # identificamos la pieza seleccionada
-            piece = self.board[row][col]
+            piece = self.position.piece_at(row, col)
 
             if self.selected_piece:
-                if self.highlighted_moves and (row, col) in self.highlighted_moves:
+                if (row, col) in self.highlighted_moves:
                     # Realizar el movimiento
                     self.move_piece(self.selected_piece, (row, col))
                     # reiniciar la pieza seleccionada y sus movimientos posibles
                     self.selected_piece = None
-                    self.highlighted_moves = []
+                    self.set_highlighted_moves(())
 
                     # Después de mover la pieza, cambiar de turno (si es pvc se mueve solo)
                     if self.game_mode == 'pvc':
@@ -187,77 +346,104 @@ class ChessGame:
                     return True
 
                 self.selected_piece = None
-                self.highlighted_moves = []
+                self.set_highlighted_moves(())
 
             # Si se selecciona una nueva pieza
-            elif piece and piece.startswith(self.current_turn):
+            elif (piece and self.position.color_at(square(row, col)) ==
+                  COLOR_INDEX[self.current_turn]):
                 self.selected_piece = (row, col)
-                self.highlighted_moves = self.get_possible_moves(
-                    piece, (row, col))
+                self.set_highlighted_moves(self.get_possible_moves(
+                    piece, (row, col)))
 
         return False
 
-    def move_piece(self, start_pos, end_pos):
+    def move_piece(self, start_pos, end_pos, promotion=QUEEN):
         """
-        Mueve una pieza y maneja el enroque si es necesario
+        Mueve una pieza si el movimiento es legal. El enroque, la captura al
+        paso y la promoción (a dama por defecto) se aplican en la posición.
         """
-        start_row, start_col = start_pos
-        end_row, end_col = end_pos
-
-        moving_piece = self.board[start_row][start_col]
-        captured_piece = self.board[end_row][end_col]
-
-        # Verificar si es un enroque
-        if moving_piece and "king" in moving_piece:
-            # Enroque corto
-            if end_col - start_col == 2:
-                # Mover la torre
-                self.board[end_row][end_col-1] = self.board[end_row][7]
-                self.board[end_row][7] = None
-
-            # Enroque largo
-            elif end_col - start_col == -2:
-                # Mover la torre
-                self.board[end_row][end_col+1] = self.board[end_row][0]
-                self.board[end_row][0] = None
-
-        # Realizar el movimiento normal
-        self.board[end_row][end_col] = moving_piece
-        self.board[start_row][start_col] = None
+        if self.game_over:
+            return
+        move = self.state.find_move(start_pos, end_pos, promotion)
+        if move is None:
+            return
 
-        self.move_sound.play()
+        # Marcar las casillas afectadas para repintarlas
+        changed = move_squares(move, self.position.turn)
+        self.renderer.mark_squares(divmod(sq, 8) for sq in changed)
 
-        if captured_piece and 'king' in captured_piece:
-            # Realizar el movimiento
-            self.board[end_row][end_col] = moving_piece
-            self.board[start_row][start_col] = None
+        # Realizar el movimiento (el núcleo cambia el turno, descuenta el
+        # tiempo y detecta el final de la partida)
+        self.state.push_move(move)
 
-            # Reproducir sonido de movimiento
-            self.move_sound.play()
+        # El registro de deshacer guarda la pieza capturada (o None)
+        self.audio.play('capture' if self.state.move_stack[-1][1] is not None else 'move')
 
-            # Determinar ganador y terminar partida
-            winner = "Blancas" if moving_piece.startswith(
-                'white') else "Negras"
-            print(f"¡Partida terminada! Ganan las {winner}")
+        # Si estamos en modo PvC, actualizar el estado del motor de IA (en su
+        # hilo, detrás de cualquier operación pendiente)
+        if self.game_mode == 'pvc' and self.ai_engine:
+            uci = move_to_uci(move)
+            self.ai_worker.submit(self.ai_engine.make_move, uci)
+            if self.current_turn == 'white':
+                self.start_ponder(uci)
+
+        if self.game_over:
+            winner = WINNER_NAMES.get(self.state.winner)
+            if winner:
+                print(f"¡Partida terminada! Ganan las {winner}")
+            else:
+                print(f"¡Partida terminada! Tablas por {self.state.result_reason}")
 
             # Mostrar mensaje en pantalla
             self.show_winner_message(winner)
 
-            self.game_over = True
+    def undo_move(self):
+        """
+        Deshace la última jugada. En modo PvC también se deshace la respuesta
+        de la CPU para devolver el turno al jugador, y el motor se sincroniza
+        repitiendo las jugadas que quedan.
+        """
+        plies = 1
+        if self.game_mode == 'pvc':
+            self.cancel_cpu_move()
+            self.clear_cpu_highlight()
+            if self.current_turn == 'white':
+                plies = 2
+        plies = min(plies, len(self.move_stack))
+        if not plies:
             return
 
-        # Si estamos en modo PvC, actualizar el estado del motor de IA
+        for _ in range(plies):
+            self.state.undo()
+
+        self.selected_piece = None
+        self.highlighted_moves = set()
+        self.renderer.mark_all()
+
         if self.game_mode == 'pvc' and self.ai_engine:
-            move_uci = self.ai_engine.convert_to_uci(start_pos, end_pos)
-            self.ai_engine.make_move(move_uci)
+            self.ai_worker.submit(self.ai_engine.reset_position,
+                                  self.state.start_fen)
+            for uci in self.state.uci_moves():
+                self.ai_worker.submit(self.ai_engine.make_move, uci)
+            # Si se vuelve a una posición con turno de la CPU, que juegue
+            self.waiting_for_cpu = self.current_turn == 'black'
+
+    def is_threefold_repetition(self):
+        """
+        Indica si la posición actual ha aparecido tres veces.
+        """
+        return self.state.is_threefold_repetition()
 
-        # Cambiar turno
-        self.current_turn = 'black' if self.current_turn == 'white' else 'white'
-        self.last_time_update = pygame.time.get_ticks()
+    def is_fifty_move_draw(self):
+        """
+        Indica si se han jugado cincuenta movimientos por bando sin capturas
+        ni movimientos de peón.
+        """
+        return self.state.is_fifty_move_draw()
 
     def show_winner_message(self, winner):
         """
-        Muestra un mensaje con el ganador en la pantalla
+        Muestra un mensaje con el ganador en la pantalla (None si son tablas)
         """
         # Crear una superficie semitransparente para el fondo del mensaje
         overlay = pygame.Surface((WIDTH, HEIGHT))
@@ -266,8 +452,8 @@ class ChessGame:
         self.screen.blit(overlay, (0, 0))
 
         # Crear el mensaje
-        font = pygame.font.Font(None, 74)
-        text = font.render(f"¡Ganan las {winner}!", True, (255, 255, 255))
+        message = f"¡Ganan las {winner}!" if winner else "¡Tablas!"
+        text = render_text(message, 74, (255, 255, 255))
         text_rect = text.get_rect(center=(WIDTH//2, HEIGHT//2))
 
         # Mostrar el mensaje
@@ -277,97 +463,67 @@ class ChessGame:
         # Esperar unos segundos
         pygame.time.wait(5000)
 
-    def switch_turn(self):
-        """
-        Cambia el turno y actualiza el tiempo.
-        """
-        self.current_turn = 'black' if self.current_turn == 'white' else 'white'
-        self.last_time_update = pygame.time.get_ticks()
-
-        # Si es modo PvC y es turno de la CPU
-        if self.game_mode == 'pvc':
-            self.waiting_for_player = (self.current_turn == 'white')
-        else:
-            self.waiting_for_player = True
+        # El mensaje tapa el tablero: repintarlo entero en el próximo fotograma
+        self.renderer.mark_all()
 
     def get_possible_moves(self, piece, position):
         """
         Obtiene los movimientos posibles para una pieza.
         """
         # Verificar si es el turno correcto
-        piece_color = 'white' if piece.startswith('white') else 'black'
-        if piece_color != self.current_turn:
+        piece_color = PIECE_COLOR[piece]
+        if piece_color != COLOR_INDEX[self.current_turn]:
             return []
-        if self.game_mode == 'pvc' and piece_color == 'black':
+        if self.game_mode == 'pvc' and piece_color == BLACK_SIDE:
             return []
 
-        possible_moves = []
-        row, col = position
-
-        game_state = 'pvc' if self.difficulty is not None else 'pvp'
-
-        if "pawn" in piece:
-            return get_pawn_moves(piece, possible_moves, row, col, self.board, game_state)
-        elif "knight" in piece:
-            return get_knight_moves(piece, possible_moves, row, col, self.board, game_state)
-        elif "rook" in piece:
-            return get_rook_moves(piece, possible_moves, row, col, self.board, game_state)
-        elif "bishop" in piece:
-            return get_bishop_moves(piece, possible_moves, row, col, self.board, game_state)
-        elif "queen" in piece:
-            return get_queen_moves(piece, possible_moves, row, col, self.board, game_state)
-        elif "king" in piece:
-            return get_king_moves(piece, possible_moves, row, col, self.board, game_state)
+        # Movimientos legales de la pieza (las promociones comparten destino)
+        return self.state.possible_moves(position)
 
     def update_time(self):
         """
         Actualiza el tiempo del jugador actual.
         """
-        current_time = pygame.time.get_ticks()
-        elapsed = (current_time - self.last_time_update) / 1000
+        self.state.update_time()
 
-        if self.current_turn == 'white':
-            self.white_time -= elapsed
-        else:
-            self.black_time -= elapsed
-
-        self.last_time_update = current_time
-
-    def draw_board(self):
+    @profiled('draw_board')
+    def draw_board(self, squares=None):
         """
-        Dibuja el tablero de ajedrez.
+        Dibuja el tablero de ajedrez a partir de la superficie pre-renderizada:
+        completo, o solo las casillas indicadas en 'squares'.
         """
-        for row in range(ROWS):
-            for col in range(COLS):
-                color = WHITE if (row + col) % 2 == 0 else BLACK
+        board_surface = get_board_surface()
+        if squares is None:
+            self.screen.blit(board_surface, (0, MARGIN_TOP))
+            return
 
-                pygame.draw.rect(self.screen, color,
-                                 (col * SQUARE_SIZE,
-                                  row * SQUARE_SIZE + MARGIN_TOP,
-                                  SQUARE_SIZE, SQUARE_SIZE))
+        for row, col in squares:
+            rect = square_rect(row, col)
+            self.screen.blit(board_surface, rect,
+                             (col * SQUARE_SIZE, row * SQUARE_SIZE,
+                              SQUARE_SIZE, SQUARE_SIZE))
 
-    def draw_pieces(self):
+    @profiled('draw_pieces')
+    def draw_pieces(self, squares=None):
         """
-        Dibuja las piezas en el tablero.
+        Dibuja las piezas en el tablero (solo las de 'squares', si se indica).
         """
-        for row in range(ROWS):
-            for col in range(COLS):
-                piece = self.board[row][col]
-                if piece:
-                    self.screen.blit(
-                        self.pieces_images[piece],
-                        (col * SQUARE_SIZE,
-                         row * SQUARE_SIZE + MARGIN_TOP))
+        if squares is None:
+            # Casillas ocupadas, leídas una sola vez de los bitboards
+            squares = [divmod(sq, 8) for sq in iter_bits(self.position.occupied)]
 
-    def draw_time(self):
+        for row, col in squares:
+            piece = self.position.piece_at(row, col)
+            if piece:
+                self.screen.blit(
+                    self.pieces_images[piece],
+                    (col * SQUARE_SIZE,
+                     row * SQUARE_SIZE + MARGIN_TOP))
+
+    def time_texts(self):
         """
-        Dibuja los temporizadores y el estado del juego.
+        Devuelve los textos del marcador (tiempos en mm:ss y modo de juego).
         """
-        time_rect = pygame.Rect(0, 0, WIDTH, TIME_HEIGHT)
-        pygame.draw.rect(self.screen, background_color, time_rect)
-
-        font = pygame.font.Font(None, 36)
-
         # Formato mm:ss
         white_minutes = int(self.white_time // 60)
         white_seconds = int(self.white_time % 60)
@@ -380,11 +536,23 @@ class ChessGame:
         mode_text = f"Modo: {'JvJ' if self.game_mode == 'pvp' else ''}"
         if self.difficulty:
             mode_text += f" {self.difficulty['name']}"
+        return white_text, black_text, mode_text
+
+    @profiled('draw_time')
+    def draw_time(self):
+        """
+        Dibuja los temporizadores y el estado del juego. El renderer solo la
+        llama cuando cambia el texto mostrado (mm:ss), y los textos que no
+        cambian salen de la caché.
+        """
+        pygame.draw.rect(self.screen, background_color, self.time_rect)
+
+        white_text, black_text, mode_text = self.time_texts()
 
         # Renderizar y posicionar textos
-        white_surface = font.render(white_text, True, (255, 255, 255))
-        black_surface = font.render(black_text, True, (255, 255, 255))
-        mode_surface = font.render(mode_text, True, (255, 255, 255))
+        white_surface = render_text(white_text, 36, (255, 255, 255))
+        black_surface = render_text(black_text, 36, (255, 255, 255))
+        mode_surface = render_text(mode_text, 36, (255, 255, 255))
 
         self.screen.blit(white_surface, (20, TIME_HEIGHT//2 - 15))
         self.screen.blit(black_surface, (WIDTH - 170, TIME_HEIGHT//2 - 15))
@@ -392,17 +560,24 @@ class ChessGame:
 
     def reset_game(self):
         """
-        Reinicia el estado del juego.
+        Reinicia el estado del juego (desde su posición de partida).
         """
-        self.board = self.create_start_board()
-        self.current_turn = 'white'
-        self.white_time = 600
-        self.black_time = 600
-        self.last_time_update = pygame.time.get_ticks()
+        self.state.reset(self.state.start_fen)
+
+        self.selected_piece = None
+        self.highlighted_moves = set()
+        self.renderer.mark_all()
 
         if self.ai_engine:
-            self.ai_engine.reset_position()
+            self.cancel_cpu_move()
+            self.cpu_start_pos = None
+            self.cpu_end_pos = None
+            self.cpu_move_time = 0
+            self.ai_worker.submit(self.ai_engine.reset_position,
+                                  self.state.start_fen)
+            self.waiting_for_cpu = self.current_turn == 'black'
 
+    @profiled('update')
     def update(self):
         """
         Actualiza el estado del juego
@@ -414,9 +589,7 @@ class ChessGame:
 
         # Limpiar el resaltado después de 3 segundos
         if self.cpu_move_time and current_time - self.cpu_move_time > 3000:
-            self.cpu_start_pos = None
-            self.cpu_end_pos = None
-            self.cpu_move_time = 0
+            self.clear_cpu_highlight()
 
         # Verificar si el juego terminó por tiempo
         if self.white_time <= 0:
@@ -430,3 +603,12 @@ class ChessGame:
         if self.waiting_for_cpu and current_time - self.last_move_time > 500:  # 500ms de delay
             self.make_cpu_move()
             self.waiting_for_cpu = False
+
+        # Recoger el resultado de la búsqueda sin bloquear
+        self.poll_cpu_move(current_time)
+
+        # Aplicar el movimiento de la CPU tras un segundo de resaltado
+        if self.pending_cpu_move and current_time - self.cpu_move_time >= 1000:
+            start_pos, end_pos, promotion = self.pending_cpu_move
+            self.pending_cpu_move = None
+            self.move_piece(start_pos, end_pos, promotion)
@@ -0,0 +1,322 @@
+"""
+Generador de movimientos legales.
+
+Trabaja sobre una posición completa (BitBoard con turno, enroques y captura
+al paso) y devuelve solo movimientos legales, teniendo en cuenta jaques,
+clavadas, captura al paso, promociones y enroques a través de casillas
+atacadas.
+
+Se construye directamente sobre los bitboards de attacks.py y no sobre los
+generadores por pieza de movements.py: estos devuelven listas de (fila,
+columna) sin turno, enroques ni captura al paso, y filtrar jaques y clavadas
+sobre esas listas obligaría a probar cada destino por separado.
+
+Los movimientos se devuelven codificados como enteros (ver bitboard.encode_move).
+"""
+from bitboard import (WHITE_SIDE, PAWN, KNIGHT, BISHOP, ROOK, QUEEN, KING,
+                      SQUARE_BB, FULL_BB, PROMOTION_SHIFT, FLAG_EN_PASSANT,
+                      FLAG_CASTLE, FLAG_DOUBLE_PUSH, CASTLE_WHITE_KINGSIDE,
+                      CASTLE_WHITE_QUEENSIDE, CASTLE_BLACK_KINGSIDE,
+                      CASTLE_BLACK_QUEENSIDE)
+from attacks import (KNIGHT_ATTACKS, KING_ATTACKS, PAWN_ATTACKS, ROOK_MASKS,
+                     BISHOP_MASKS, BETWEEN, rook_attacks, bishop_attacks)
+
+FILE_A = sum(SQUARE_BB[row * 8] for row in range(8))
+FILE_H = sum(SQUARE_BB[row * 8 + 7] for row in range(8))
+NOT_FILE_A = FULL_BB ^ FILE_A
+NOT_FILE_H = FULL_BB ^ FILE_H
+
+# Filas como bitboards (fila 0 = octava fila)
+RANKS = tuple(0xFF << (row * 8) for row in range(8))
+
+PROMOTION_TYPES = (QUEEN, ROOK, BISHOP, KNIGHT)
+PROMOTION_CHARS = {KNIGHT: 'n', BISHOP: 'b', ROOK: 'r', QUEEN: 'q'}
+PROMOTION_FROM_CHAR = {char: ptype for ptype, char in PROMOTION_CHARS.items()}
+
+# Enroques por color: (derecho, destino del rey, casillas vacías, casillas
+# que el rey no puede atravesar atacadas)
+CASTLING_RULES = (
+    ((CASTLE_WHITE_KINGSIDE, 62, SQUARE_BB[61] | SQUARE_BB[62], (61, 62)),
+     (CASTLE_WHITE_QUEENSIDE, 58,
+      SQUARE_BB[57] | SQUARE_BB[58] | SQUARE_BB[59], (59, 58))),
+    ((CASTLE_BLACK_KINGSIDE, 6, SQUARE_BB[5] | SQUARE_BB[6], (5, 6)),
+     (CASTLE_BLACK_QUEENSIDE, 2,
+      SQUARE_BB[1] | SQUARE_BB[2] | SQUARE_BB[3], (3, 2))),
+)
+
+
+def attackers_to(board, sq, color, occupied):
+    """
+    Devuelve el bitboard de piezas de 'color' que atacan la casilla sq con la
+    ocupación dada.
+    """
+    pieces = board.pieces
+    base = color * 6
+    queens = pieces[base + QUEEN]
+    return ((PAWN_ATTACKS[color ^ 1][sq] & pieces[base + PAWN]) |
+            (KNIGHT_ATTACKS[sq] & pieces[base + KNIGHT]) |
+            (KING_ATTACKS[sq] & pieces[base + KING]) |
+            (rook_attacks(sq, occupied) & (pieces[base + ROOK] | queens)) |
+            (bishop_attacks(sq, occupied) & (pieces[base + BISHOP] | queens)))
+
+
+def is_square_attacked(board, sq, color):
+    """
+    Indica si alguna pieza de 'color' ataca la casilla sq.
+    """
+    return bool(attackers_to(board, sq, color, board.occupied))
+
+
+def in_check(board, color=None):
+    """
+    Indica si el rey de 'color' (por defecto, el del turno) está en jaque.
+    """
+    if color is None:
+        color = board.turn
+    return is_square_attacked(board, board.king_square(color), color ^ 1)
+
+
+def pins(board, king_sq, color):
+    """
+    Clavadas: piezas de 'color' que son la única entre su rey (en king_sq) y
+    un deslizante enemigo.
+
+    Returns:
+        tuple: (bitboard de piezas clavadas, dict casilla clavada -> casillas
+        a las que puede moverse sin dejar la línea de la clavada)
+    """
+    pieces = board.pieces
+    enemy_base = (color ^ 1) * 6
+    own = board.occupancy[color]
+    occupied = board.occupied
+    enemy_queens = pieces[enemy_base + QUEEN]
+    snipers = (((pieces[enemy_base + ROOK] | enemy_queens) & ROOK_MASKS[king_sq]) |
+               ((pieces[enemy_base + BISHOP] | enemy_queens) & BISHOP_MASKS[king_sq]))
+    pinned = 0
+    pin_masks = {}
+    while snipers:
+        lsb = snipers & -snipers
+        sniper_sq = lsb.bit_length() - 1
+        between = BETWEEN[king_sq][sniper_sq]
+        blockers = between & occupied
+        if blockers and not blockers & (blockers - 1) and blockers & own:
+            pinned |= blockers
+            pin_masks[blockers.bit_length() - 1] = between | lsb
+        snipers ^= lsb
+    return pinned, pin_masks
+
+
+def _add_pawn_moves(moves, from_sq, to_sq, promotion_rank, flags=0):
+    """
+    Añade un movimiento de peón, desdoblándolo en las cuatro promociones si
+    llega a la última fila.
+    """
+    if SQUARE_BB[to_sq] & promotion_rank:
+        base = from_sq | to_sq << 6
+        for ptype in PROMOTION_TYPES:
+            moves.append(base | ptype << PROMOTION_SHIFT)
+    else:
+        moves.append(from_sq | to_sq << 6 | flags)
+
+
+def generate_legal_moves(board):
+    """
+    Genera todos los movimientos legales del bando al que le toca mover.
+
+    Returns:
+        list: Movimientos codificados como enteros.
+    """
+    us = board.turn
+    them = us ^ 1
+    pieces = board.pieces
+    own = board.occupancy[us]
+    enemies = board.occupancy[them]
+    occupied = board.occupied
+    base = us * 6
+    moves = []
+
+    king_sq = pieces[base + KING].bit_length() - 1
+    king_bit = SQUARE_BB[king_sq]
+    not_own = FULL_BB ^ own
+
+    # Movimientos del rey: la casilla destino no puede estar atacada una vez
+    # que el rey deja su casilla (evita retroceder en la línea de un jaque)
+    without_king = occupied ^ king_bit
+    targets = KING_ATTACKS[king_sq] & not_own
+    while targets:
+        lsb = targets & -targets
+        to_sq = lsb.bit_length() - 1
+        if not attackers_to(board, to_sq, them, without_king):
+            moves.append(king_sq | to_sq << 6)
+        targets ^= lsb
+
+    checkers = attackers_to(board, king_sq, them, occupied)
+    if checkers & (checkers - 1):
+        # Jaque doble: solo puede moverse el rey
+        return moves
+
+    if checkers:
+        checker_sq = checkers.bit_length() - 1
+        check_mask = checkers | BETWEEN[king_sq][checker_sq]
+    else:
+        check_mask = FULL_BB
+
+    pinned, pin_masks = pins(board, king_sq, us)
+
+    target_mask = not_own & check_mask
+
+    # Caballos (un caballo clavado nunca puede moverse)
+    knights = pieces[base + KNIGHT] & ~pinned
+    while knights:
+        lsb = knights & -knights
+        from_sq = lsb.bit_length() - 1
+        targets = KNIGHT_ATTACKS[from_sq] & target_mask
+        while targets:
+            to_lsb = targets & -targets
+            moves.append(from_sq | (to_lsb.bit_length() - 1) << 6)
+            targets ^= to_lsb
+        knights ^= lsb
+
+    # Piezas deslizantes
+    queens = pieces[base + QUEEN]
+    for sliders, attack_fn in ((pieces[base + BISHOP] | queens, bishop_attacks),
+                               (pieces[base + ROOK] | queens, rook_attacks)):
+        while sliders:
+            lsb = sliders & -sliders
+            from_sq = lsb.bit_length() - 1
+            targets = attack_fn(from_sq, occupied) & target_mask
+            if pinned & lsb:
+                targets &= pin_masks[from_sq]
+            while targets:
+                to_lsb = targets & -targets
+                moves.append(from_sq | (to_lsb.bit_length() - 1) << 6)
+                targets ^= to_lsb
+            sliders ^= lsb
+
+    # Peones
+    pawns = pieces[base + PAWN]
+    empty = FULL_BB ^ occupied
+    if us == WHITE_SIDE:
+        push = -8
+        single = (pawns >> 8) & empty
+        double = ((single & RANKS[5]) >> 8) & empty
+        captures = (((pawns & NOT_FILE_A) >> 9, 9), ((pawns & NOT_FILE_H) >> 7, 7))
+        promotion_rank = RANKS[0]
+    else:
+        push = 8
+        single = (pawns << 8) & empty
+        double = ((single & RANKS[2]) << 8) & empty
+        captures = (((pawns & NOT_FILE_A) << 7, -7), ((pawns & NOT_FILE_H) << 9, -9))
+        promotion_rank = RANKS[7]
+
+    for targets, delta, flags in ((single & check_mask, -push, 0),
+                                  (double & check_mask, -2 * push, FLAG_DOUBLE_PUSH),
+                                  (captures[0][0] & enemies & check_mask, captures[0][1], 0),
+                                  (captures[1][0] & enemies & check_mask, captures[1][1], 0)):
+        while targets:
+            lsb = targets & -targets
+            to_sq = lsb.bit_length() - 1
+            from_sq = to_sq + delta
+            if not (pinned & SQUARE_BB[from_sq]) or pin_masks[from_sq] & lsb:
+                _add_pawn_moves(moves, from_sq, to_sq, promotion_rank, flags)
+            targets ^= lsb
+
+    # Captura al paso: se verifica quitando ambos peones del tablero, lo que
+    # cubre también la clavada horizontal a través de los dos peones
+    ep_square = board.ep_square
+    if ep_square is not None:
+        captured_sq = ep_square - push
+        candidates = PAWN_ATTACKS[them][ep_square] & pawns
+        while candidates:
+            lsb = candidates & -candidates
+            from_sq = lsb.bit_length() - 1
+            after = (occupied ^ lsb ^ SQUARE_BB[captured_sq]) | SQUARE_BB[ep_square]
+            if not (attackers_to(board, king_sq, them, after) &
+                    ~SQUARE_BB[captured_sq]):
+                moves.append(from_sq | ep_square << 6 | FLAG_EN_PASSANT)
+            candidates ^= lsb
+
+    # Enroques: sin jaque, con el camino libre y sin atravesar casillas atacadas
+    if not checkers and board.castling:
+        for right, king_to, path, crossed in CASTLING_RULES[us]:
+            if (board.castling & right and not occupied & path and
+                    not any(attackers_to(board, sq, them, occupied) for sq in crossed)):
+                moves.append(king_sq | king_to << 6 | FLAG_CASTLE)
+
+    return moves
+
+
+def move_to_uci(move):
+    """
+    Convierte un movimiento codificado a notación UCI (por ejemplo 'e7e8q').
+    """
+    from_sq = move & 63
+    to_sq = (move >> 6) & 63
+    uci = ('abcdefgh'[from_sq & 7] + str(8 - (from_sq >> 3)) +
+           'abcdefgh'[to_sq & 7] + str(8 - (to_sq >> 3)))
+    promotion = (move >> PROMOTION_SHIFT) & 7
+    if promotion:
+        uci += PROMOTION_CHARS[promotion]
+    return uci
+
+
+def find_move(board, from_sq, to_sq, promotion=QUEEN):
+    """
+    Busca el movimiento legal de from_sq a to_sq (con la promoción indicada si
+    la hubiera).
+
+    Returns:
+        int: El movimiento codificado, o None si no es legal.
+    """
+    for move in generate_legal_moves(board):
+        if move & 63 == from_sq and (move >> 6) & 63 == to_sq:
+            move_promotion = (move >> PROMOTION_SHIFT) & 7
+            if not move_promotion or move_promotion == promotion:
+                return move
+    return None
+
+
+def uci_squares(uci):
+    """
+    Descompone un movimiento UCI sin comprobar su legalidad.
+
+    Returns:
+        tuple: (casilla de origen, casilla de destino, promoción), o None si
+        la cadena no tiene formato UCI o la pieza de promoción no existe. Sin
+        sufijo la promoción es a dama.
+    """
+    if len(uci) not in (4, 5):
+        return None
+    files, ranks = 'abcdefgh', '12345678'
+    if (uci[0] not in files or uci[2] not in files or
+            uci[1] not in ranks or uci[3] not in ranks):
+        return None
+    if len(uci) == 5 and uci[4] not in PROMOTION_FROM_CHAR:
+        return None
+    from_sq = (8 - int(uci[1])) * 8 + files.index(uci[0])
+    to_sq = (8 - int(uci[3])) * 8 + files.index(uci[2])
+    promotion = PROMOTION_FROM_CHAR[uci[4]] if len(uci) == 5 else QUEEN
+    return from_sq, to_sq, promotion
+
+
+def matches_uci(move, uci):
+    """
+    Indica si el movimiento encontrado para 'uci' (ver uci_squares) le
+    corresponde: un sufijo de promoción solo es válido en una promoción.
+    """
+    return move is not None and (len(uci) == 4 or
+                                 bool((move >> PROMOTION_SHIFT) & 7))
+
+
+def parse_uci(board, uci):
+    """
+    Convierte un movimiento UCI en el movimiento legal codificado.
+
+    Returns:
+        int: El movimiento codificado, o None si no es legal en la posición.
+    """
+    squares = uci_squares(uci)
+    if squares is None:
+        return None
+    move = find_move(board, *squares)
+    return move if matches_uci(move, uci) else None
@@ -2,7 +2,22 @@ import pygame
 from game import ChessGame
 from settings import *
 from button import Button
+from text_cache import render_text
+from profiler import PROFILER
 import sys
+import time
+
+# Botones del menú principal (se crean aquí para que settings no dependa de
+# pygame y el núcleo de reglas pueda importarse sin él)
+pvp_button = Button(center_x, HEIGHT//2 - button_height - 20,
+                    button_width, button_height,
+                    "JUGADOR vs JUGADOR",
+                    primary_color, secondary_color)
+
+pvc_button = Button(center_x, HEIGHT//2 + 20,
+                    button_width, button_height,
+                    "JUGADOR vs CPU",
+                    primary_color, secondary_color)
 
 
 def main():
@@ -19,58 +34,67 @@ def main():
             if new_state:
                 # creamos un estado de juego (al pasar el menú)
                 game_state = new_state
+            pygame.display.flip()
         elif game_state == 'difficulty_select':
             new_state, new_game = handle_difficulty_select(
                 screen, difficulty_buttons)
             if new_state:
                 game_state = new_state
                 if new_game:
+                    game.close()
                     game = new_game
+            pygame.display.flip()
 
         else:  # Estados de juego (pvp o pvc)
-            # manejamos el juego hasta su reinicio
-            new_state = handle_game(screen, game)
+            # manejamos el juego hasta su reinicio (handle_game actualiza
+            # solo los rectángulos de pantalla que han cambiado)
+            new_state = handle_game(screen, game, clock)
             if new_state:
                 game_state = new_state
+                game.close()  # Detener la IA de la partida abandonada
                 game = ChessGame(screen)  # Reiniciar juego al volver al menú
 
-        pygame.display.flip()
         clock.tick(60)
 
 
-def handle_game(screen, game):
+def handle_game(screen, game, clock):
     """
     Maneja la lógica del juego activo
     """
+    frame_start = time.perf_counter()
+
     # Actualizar estado del juego
     game.update()
 
-    # Dibujar elementos base
-    game.draw_board()
-
-    # Dibujar efectos visuales de la CPU
-
-    # Dibujar piezas y otros elementos
-    game.draw_pieces()
-    game.draw_time()
-
-    # Dibujar movimientos posibles si hay pieza seleccionada
-    if hasattr(game, 'highlighted_moves') and game.highlighted_moves:
-        draw_highlighted_moves(screen, game.highlighted_moves)
+    # Dibujar solo lo que ha cambiado (tablero, efectos de la CPU, piezas,
+    # movimientos destacados y marcador), más el panel de tiempos si está
+    # activo, y enviarlo a pantalla
+    fps = clock.get_fps() if PROFILER.overlay else None
+    dirty_rects = game.renderer.render(game, fps)
+    if dirty_rects:
+        pygame.display.update(dirty_rects)
 
     # Manejar eventos
     for event in pygame.event.get():
         if event.type == pygame.QUIT:  # Salir del juego
-            pygame.quit()
-            sys.exit()
+            quit_game()
         elif event.type == pygame.KEYDOWN:
             # Volver al menú (con la tecla ESC)
             if event.key == pygame.K_ESCAPE:
+                game.cancel_cpu_move()
                 return 'menu'
+            # Retroceso: deshacer la última jugada
+            elif event.key == pygame.K_BACKSPACE:
+                game.undo_move()
+            # Mostrar u ocultar el panel de tiempos
+            elif event.key == pygame.K_F3:
+                PROFILER.overlay = not PROFILER.overlay
         # Manejar clicks en el tablero
         elif event.type == pygame.MOUSEBUTTONDOWN:
             game.handle_click(event.pos)
 
+    if PROFILER.enabled:
+        PROFILER.record('frame', (time.perf_counter() - frame_start) * 1000)
     return None
 
 
@@ -91,8 +115,7 @@ def handle_menu(screen):
     screen.fill(background_color)
 
     # Dibujar título del menú
-    font = pygame.font.Font(None, 74)
-    title = font.render("Ajedrez", True, (255, 255, 255))
+    title = render_text("Ajedrez", 74, (255, 255, 255))
     title_rect = title.get_rect(center=(WIDTH//2, 100))
     screen.blit(title, title_rect)
 
@@ -103,8 +126,7 @@ def handle_menu(screen):
     # Manejar eventos del menú
     for event in pygame.event.get():
         if event.type == pygame.QUIT:
-            pygame.quit()
-            sys.exit()
+            quit_game()
 
         # Manejar eventos de los botones
         if pvp_button.handle_event(event):
@@ -124,25 +146,22 @@ def handle_difficulty_select(screen, difficulty_buttons):
     screen.fill(background_color)
 
     # Dibujar título
-    font = pygame.font.Font(None, 74)
-    title = font.render("Selecciona Dificultad", True, (255, 255, 255))
+    title = render_text("Selecciona Dificultad", 74, (255, 255, 255))
     title_rect = title.get_rect(center=(WIDTH//2, 100))
     screen.blit(title, title_rect)
 
     # Dibujar botones y descripciones
-    font_desc = pygame.font.Font(None, 28)
     for diff_key, button in difficulty_buttons:
         button.draw(screen)
-        desc = font_desc.render(DIFFICULTY[diff_key]['description'],
-                                True, (200, 200, 200))
+        desc = render_text(DIFFICULTY[diff_key]['description'],
+                           28, (200, 200, 200))
         desc_rect = desc.get_rect(
             center=(WIDTH//2, button.rect.bottom + 10))
         screen.blit(desc, desc_rect)
 
     for event in pygame.event.get():
         if event.type == pygame.QUIT:
-            pygame.quit()
-            sys.exit()
+            quit_game()
         elif event.type == pygame.KEYDOWN:
             if event.key == pygame.K_ESCAPE:
                 return 'menu', None
@@ -169,6 +188,17 @@ def create_difficulty_buttons():
     return difficulty_buttons
 
 
+def quit_game():
+    """
+    Cierra pygame y el programa, guardando antes los tiempos del perfilador
+    (ver settings.PROFILE_PATH).
+    """
+    if PROFILE_PATH and PROFILER.counts:
+        PROFILER.dump(PROFILE_PATH)
+    pygame.quit()
+    sys.exit()
+
+
 def getConf():
     pygame.init()
     screen = pygame.display.set_mode((WIDTH, HEIGHT))
@@ -178,23 +208,5 @@ def getConf():
     return screen, game, clock
 
 
-def draw_highlighted_moves(screen, highlighted_moves):
-    """
-    Dibuja los movimientos destacados en la pantalla.
-
-    Parámetros:
-    - screen: La superficie de la pantalla donde se dibujan los movimientos.
-    - highlighted_moves: Una lista de movimientos destacados, cada uno representado como una tupla (fila, columna).
-
-    Esta función itera sobre los movimientos destacados y dibuja un círculo blanco en la posición correspondiente en el tablero.
-    """
-    if highlighted_moves:
-        for move in highlighted_moves:
-            center_x = move[1] * SQUARE_SIZE + SQUARE_SIZE // 2
-            center_y = move[0] * SQUARE_SIZE + SQUARE_SIZE // 2 + MARGIN_TOP
-            pygame.draw.circle(screen, (255, 255, 255),
-                               (center_x, center_y), 5)
-
-
 if __name__ == "__main__":
     main()
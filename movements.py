@@ -1,4 +1,33 @@
-from settings import knight_moves, rook_moves, bishop_moves, king_moves
+"""
+Generadores de movimientos por pieza.
+
+Cada función devuelve los destinos (fila, columna) pseudolegales de una pieza.
+La generación legal (legal_moves.py) no se construye sobre ellos sino
+directamente sobre los bitboards de attacks.py: estos destinos no llevan el
+bando al que le toca, los derechos de enroque ni la casilla al paso, y filtrar
+jaques y clavadas sobre ellos obligaría a probar cada destino por separado.
+Los usan los benchmarks (benchmarks/attack_tables.py, benchmarks/suite.py,
+benchmarks/positions.py).
+"""
+from bitboard import BLACK_SIDE, ROOK, SQUARE_BB, PIECE_COLOR, piece_index
+from attacks import (KNIGHT_TARGETS, KING_TARGETS, PAWN_CAPTURE_TARGETS,
+                     ROOK_RAY_TARGETS, BISHOP_RAY_TARGETS, QUEEN_RAY_TARGETS)
+
+
+def _ray_moves(possible_moves, rays, occupied, enemies):
+    """
+    Recorre los rayos precalculados de una pieza deslizante hasta el primer
+    bloqueador, que se incluye si es una pieza enemiga.
+    """
+    for ray in rays:
+        for bit, target in ray:
+            if occupied & bit:
+                if enemies & bit:
+                    possible_moves.append(target)
+                break
+            possible_moves.append(target)
+
+    return possible_moves
 
 
 def get_pawn_moves(piece, possible_moves, row, col, board, game_state):
@@ -11,7 +40,7 @@ def get_pawn_moves(piece, possible_moves, row, col, board, game_state):
     - possible_moves (list): La lista de movimientos posibles que se van a calcular.
     - row (int): La fila actual de la pieza en el tablero.
     - col (int): La columna actual de la pieza en el tablero.
-    - board (list): La representación del tablero de ajedrez como una lista de listas.
+    - board (BitBoard): La posición del tablero en bitboards.
 
     Esta función determina los movimientos posibles para un peón, considerando su color y posición en el tablero.
     Los peones pueden moverse una o dos casillas hacia adelante si la casilla está vacía, dependiendo de si están en su posición inicial.
@@ -19,31 +48,30 @@ def get_pawn_moves(piece, possible_moves, row, col, board, game_state):
     """
     # Si es modo PvC y es una pieza negra, no permitir movimientos
     moves = possible_moves
-    if game_state == 'pvc' and piece.startswith("black"):
+    color = PIECE_COLOR[piece]
+    if game_state == 'pvc' and color == BLACK_SIDE:
         return possible_moves
 
-    direction = 1 if piece.startswith('black') else -1
-    enemy_color = 'white' if piece.startswith('black') else 'black'
+    direction = 1 if color == BLACK_SIDE else -1
+    occupied = board.occupied
+    enemies = board.occupancy[color ^ 1]
 
     # Movimiento hacia adelante
     if 0 <= row + direction < 8:
         # Movimiento simple hacia adelante si no hay pieza
-        if not board[row + direction][col]:
+        if not occupied & SQUARE_BB[(row + direction) * 8 + col]:
             moves.append((row + direction, col))
 
             # Movimiento doble desde la posición inicial
-            initial_row = 1 if piece.startswith('black') else 6
-            if row == initial_row and not board[row + 2*direction][col]:
+            initial_row = 1 if color == BLACK_SIDE else 6
+            if (row == initial_row and
+                    not occupied & SQUARE_BB[(row + 2*direction) * 8 + col]):
                 moves.append((row + 2*direction, col))
 
     # Capturas diagonales
-    for dx in [-1, 1]:  # Revisar ambas diagonales
-        new_col = col + dx
-        new_row = row + direction
-        if 0 <= new_row < 8 and 0 <= new_col < 8:  # Dentro del tablero
-            target_piece = board[new_row][new_col]
-            if target_piece and target_piece.startswith(enemy_color):
-                moves.append((new_row, new_col))
+    for bit, target in PAWN_CAPTURE_TARGETS[color][row * 8 + col]:
+        if enemies & bit:
+            moves.append(target)
 
     return moves
 
@@ -58,22 +86,21 @@ def get_knight_moves(piece, possible_moves, row, col, board, game_state):
     - possible_moves (list): La lista de movimientos posibles que se van a calcular.
     - row (int): La fila actual de la pieza en el tablero.
     - col (int): La columna actual de la pieza en el tablero.
-    - board (list): La representación del tablero de ajedrez como una lista de listas.
+    - board (BitBoard): La posición del tablero en bitboards.
     - game_state (str): El estado del juego, que puede ser 'pvp' o 'pvc'.
 
     Esta función determina los movimientos posibles para un caballo, considerando su color, posición en el tablero y el estado del juego.
     Los caballos pueden moverse en forma de L (dos casillas en una dirección y una en otra perpendicular).
     """
-    if game_state == 'pvc' and piece.startswith("black"):
+    color = PIECE_COLOR[piece]
+    if game_state == 'pvc' and color == BLACK_SIDE:
         return possible_moves
 
-    for move in knight_moves:
-        new_row, new_col = row + move[0], col + move[1]
-        if 0 <= new_row < 8 and 0 <= new_col < 8:
-            # Permitir movimiento si la casilla está vacía o tiene una pieza enemiga
-            if (board[new_row][new_col] is None or
-                    board[new_row][new_col].startswith("black" if piece.startswith("white") else "white")):
-                possible_moves.append((new_row, new_col))
+    own = board.occupancy[color]
+    for bit, target in KNIGHT_TARGETS[row * 8 + col]:
+        # Permitir movimiento si la casilla está vacía o tiene una pieza enemiga
+        if not own & bit:
+            possible_moves.append(target)
 
     return possible_moves
 
@@ -88,30 +115,17 @@ def get_rook_moves(piece, possible_moves, row, col, board, game_state):
     - possible_moves (list): La lista de movimientos posibles que se van a calcular.
     - row (int): La fila actual de la pieza en el tablero.
     - col (int): La columna actual de la pieza en el tablero.
-    - board (list): La representación del tablero de ajedrez como una lista de listas.
+    - board (BitBoard): La posición del tablero en bitboards.
 
     Esta función determina los movimientos posibles para una torre, considerando su color y posición en el tablero.
     Las torres pueden moverse horizontal o verticalmente cualquier número de casillas, siempre y cuando no haya otra pieza del mismo color en el camino.
     """
-    if game_state == 'pvc' and piece.startswith("black"):
+    color = PIECE_COLOR[piece]
+    if game_state == 'pvc' and color == BLACK_SIDE:
         return possible_moves
 
-    for direction in rook_moves:
-        for i in range(1, 8):
-            new_row, new_col = row + direction[0] * i, col + direction[1] * i
-            if 0 <= new_row < 8 and 0 <= new_col < 8:
-                target = board[new_row][new_col]
-                if target is None:
-                    possible_moves.append((new_row, new_col))
-                elif target.startswith("black" if piece.startswith("white") else "white"):
-                    possible_moves.append((new_row, new_col))
-                    break
-                else:
-                    break
-            else:
-                break
-
-    return possible_moves
+    return _ray_moves(possible_moves, ROOK_RAY_TARGETS[row * 8 + col],
+                      board.occupied, board.occupancy[color ^ 1])
 
 
 def get_bishop_moves(piece, possible_moves, row, col, board, game_state="pvc"):
@@ -124,30 +138,17 @@ def get_bishop_moves(piece, possible_moves, row, col, board, game_state="pvc"):
     - possible_moves (list): La lista de movimientos posibles que se van a calcular.
     - row (int): La fila actual de la pieza en el tablero.
     - col (int): La columna actual de la pieza en el tablero.
-    - board (list): La representación del tablero de ajedrez como una lista de listas.
+    - board (BitBoard): La posición del tablero en bitboards.
 
     Esta función determina los movimientos posibles para un alfil, considerando su color y posición en el tablero.
     Los alfiles pueden moverse en diagonal cualquier número de casillas, siempre y cuando no haya otra pieza del mismo color en el camino.
     """
-    if game_state == 'pvc' and piece.startswith("black"):
+    color = PIECE_COLOR[piece]
+    if game_state == 'pvc' and color == BLACK_SIDE:
         return possible_moves
 
-    for direction in bishop_moves:
-        for i in range(1, 8):
-            new_row, new_col = row + direction[0] * i, col + direction[1] * i
-            if 0 <= new_row < 8 and 0 <= new_col < 8:
-                target = board[new_row][new_col]
-                if target is None:
-                    possible_moves.append((new_row, new_col))
-                elif target.startswith("black" if piece.startswith("white") else "white"):
-                    possible_moves.append((new_row, new_col))
-                    break
-                else:
-                    break
-            else:
-                break
-
-    return possible_moves
+    return _ray_moves(possible_moves, BISHOP_RAY_TARGETS[row * 8 + col],
+                      board.occupied, board.occupancy[color ^ 1])
 
 
 def get_queen_moves(piece, possible_moves, row, col, board, game_state='pvc'):
@@ -160,41 +161,37 @@ def get_queen_moves(piece, possible_moves, row, col, board, game_state='pvc'):
     - possible_moves (list): La lista de movimientos posibles que se van a calcular.
     - row (int): La fila actual de la pieza en el tablero.
     - col (int): La columna actual de la pieza en el tablero.
-    - board (list): La representación del tablero de ajedrez como una lista de listas.
+    - board (BitBoard): La posición del tablero en bitboards.
 
     Esta función determina los movimientos posibles para una reina, considerando su color y posición en el tablero.
     Las reinas pueden moverse en cualquier dirección (horizontal, vertical o diagonal) cualquier número de casillas,
     siempre y cuando no haya otra pieza del mismo color en el camino.
     """
     # Si es modo PvC y es una pieza negra, no permitir movimientos
-    if game_state == 'pvc' and piece.startswith("black"):
+    color = PIECE_COLOR[piece]
+    if game_state == 'pvc' and color == BLACK_SIDE:
         return possible_moves
 
-    possible_moves = get_rook_moves(piece, possible_moves, row, col,
-                                    board, game_state)  # Movimientos de torre
-    possible_moves = get_bishop_moves(piece, possible_moves, row, col,
-                                      board, game_state)  # Movimientos de alfil
-
-    return possible_moves
+    # Movimientos de torre y de alfil en una sola consulta
+    return _ray_moves(possible_moves, QUEEN_RAY_TARGETS[row * 8 + col],
+                      board.occupied, board.occupancy[color ^ 1])
 
 
 def get_king_moves(piece, possible_moves, row, col, board, game_state):
-    if game_state == 'pvc' and piece.startswith("black"):
+    color = PIECE_COLOR[piece]
+    if game_state == 'pvc' and color == BLACK_SIDE:
         return possible_moves
 
     # Movimientos normales del rey
-    for move in king_moves:
-        new_row, new_col = row + move[0], col + move[1]
-        if 0 <= new_row < 8 and 0 <= new_col < 8:
-            target = board[new_row][new_col]
-            if (target is None or
-                    target.startswith("black" if piece.startswith("white") else "white")):
-                possible_moves.append((new_row, new_col))
+    own = board.occupancy[color]
+    for bit, target in KING_TARGETS[row * 8 + col]:
+        if not own & bit:
+            possible_moves.append(target)
 
     # Verificar enroque
     if can_castle(piece, row, col, board):
         # Posición inicial del rey
-        initial_row = 7 if piece.startswith("white") else 0
+        initial_row = 0 if color == BLACK_SIDE else 7
 
         # Enroque corto (lado del rey)
         if can_castle_kingside(piece, initial_row, board):
@@ -212,7 +209,7 @@ def can_castle(piece, row, col, board):
     Verifica si el rey está en su posición inicial para el enroque
     """
     # El rey debe estar en su posición inicial
-    initial_row = 7 if piece.startswith("white") else 0
+    initial_row = 0 if PIECE_COLOR[piece] == BLACK_SIDE else 7
     initial_col = 4
 
     return row == initial_row and col == initial_col
@@ -223,15 +220,13 @@ def can_castle_kingside(piece, initial_row, board):
     Verifica si es posible hacer enroque corto
     """
     # Verificar que las casillas entre el rey y la torre estén vacías
-    if (board[initial_row][5] is None and
-        board[initial_row][6] is None and
-            board[initial_row][7] is not None):
-
-        # Verificar que la torre esté en su lugar
-        tower = "white_rook" if piece.startswith("white") else "black_rook"
-        return board[initial_row][7] == tower
+    base = initial_row * 8
+    if board.occupied & (SQUARE_BB[base + 5] | SQUARE_BB[base + 6]):
+        return False
 
-    return False
+    # Verificar que la torre esté en su lugar
+    tower = piece_index(PIECE_COLOR[piece], ROOK)
+    return board.mailbox[base + 7] == tower
 
 
 def can_castle_queenside(piece, initial_row, board):
@@ -239,13 +234,16 @@ def can_castle_queenside(piece, initial_row, board):
     Verifica si es posible hacer enroque largo
     """
     # Verificar que las casillas entre el rey y la torre estén vacías
-    if (board[initial_row][3] is None and
-        board[initial_row][2] is None and
-        board[initial_row][1] is None and
-            board[initial_row][0] is not None):
+    base = initial_row * 8
+    if board.occupied & (SQUARE_BB[base + 1] | SQUARE_BB[base + 2] |
+                         SQUARE_BB[base + 3]):
+        return False
+
+    # Verificar que la torre esté en su lugar
+    tower = piece_index(PIECE_COLOR[piece], ROOK)
+    return board.mailbox[base] == tower
 
-        # Verificar que la torre esté en su lugar
-        tower = "white_rook" if piece.startswith("white") else "black_rook"
-        return board[initial_row][0] == tower
 
-    return False
+# Generador de movimientos por tipo de pieza (índice PAWN..KING de bitboard.py)
+MOVE_GENERATORS = (get_pawn_moves, get_knight_moves, get_bishop_moves,
+                   get_rook_moves, get_queen_moves, get_king_moves)
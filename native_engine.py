@@ -0,0 +1,546 @@
+"""
+Motor de ajedrez nativo en Python, alternativa a Stockfish.
+
+Usa la generación de movimientos del propio proyecto (legal_moves.py) con una
+búsqueda alfa-beta de profundidad iterativa, ordenación de movimientos (jugada
+de la tabla de transposición, MVV-LVA, killers e historial), búsqueda de
+quietud y una tabla de transposición de tamaño fijo.
+
+Expone la misma interfaz que ChessAI (get_best_move, make_move,
+reset_position), de modo que el juego puede usar cualquiera de los dos.
+"""
+import threading
+import time
+
+from bitboard import (BitBoard, START_FEN, WHITE_SIDE, PAWN, KNIGHT, BISHOP,
+                      ROOK, QUEEN, KING, PROMOTION_SHIFT, FLAG_EN_PASSANT)
+from eval_cache import position_key
+from legal_moves import generate_legal_moves, in_check, move_to_uci, parse_uci
+from profiler import profiled
+from zobrist import PositionHistory
+
+INFINITY = 1_000_000
+MATE_SCORE = 100_000
+# Puntuaciones por encima de este valor representan un mate a distancia
+MATE_BOUND = MATE_SCORE - 1000
+
+PIECE_VALUES = (100, 320, 330, 500, 900, 0)
+
+# Tablas pieza-casilla desde el punto de vista de las blancas, con la fila 0
+# como octava fila (mismo orden de casillas que el tablero)
+_PST = {
+    PAWN: (
+        0, 0, 0, 0, 0, 0, 0, 0,
+        50, 50, 50, 50, 50, 50, 50, 50,
+        10, 10, 20, 30, 30, 20, 10, 10,
+        5, 5, 10, 25, 25, 10, 5, 5,
+        0, 0, 0, 20, 20, 0, 0, 0,
+        5, -5, -10, 0, 0, -10, -5, 5,
+        5, 10, 10, -20, -20, 10, 10, 5,
+        0, 0, 0, 0, 0, 0, 0, 0),
+    KNIGHT: (
+        -50, -40, -30, -30, -30, -30, -40, -50,
+        -40, -20, 0, 0, 0, 0, -20, -40,
+        -30, 0, 10, 15, 15, 10, 0, -30,
+        -30, 5, 15, 20, 20, 15, 5, -30,
+        -30, 0, 15, 20, 20, 15, 0, -30,
+        -30, 5, 10, 15, 15, 10, 5, -30,
+        -40, -20, 0, 5, 5, 0, -20, -40,
+        -50, -40, -30, -30, -30, -30, -40, -50),
+    BISHOP: (
+        -20, -10, -10, -10, -10, -10, -10, -20,
+        -10, 0, 0, 0, 0, 0, 0, -10,
+        -10, 0, 5, 10, 10, 5, 0, -10,
+        -10, 5, 5, 10, 10, 5, 5, -10,
+        -10, 0, 10, 10, 10, 10, 0, -10,
+        -10, 10, 10, 10, 10, 10, 10, -10,
+        -10, 5, 0, 0, 0, 0, 5, -10,
+        -20, -10, -10, -10, -10, -10, -10, -20),
+    ROOK: (
+        0, 0, 0, 0, 0, 0, 0, 0,
+        5, 10, 10, 10, 10, 10, 10, 5,
+        -5, 0, 0, 0, 0, 0, 0, -5,
+        -5, 0, 0, 0, 0, 0, 0, -5,
+        -5, 0, 0, 0, 0, 0, 0, -5,
+        -5, 0, 0, 0, 0, 0, 0, -5,
+        -5, 0, 0, 0, 0, 0, 0, -5,
+        0, 0, 0, 5, 5, 0, 0, 0),
+    QUEEN: (
+        -20, -10, -10, -5, -5, -10, -10, -20,
+        -10, 0, 0, 0, 0, 0, 0, -10,
+        -10, 0, 5, 5, 5, 5, 0, -10,
+        -5, 0, 5, 5, 5, 5, 0, -5,
+        0, 0, 5, 5, 5, 5, 0, -5,
+        -10, 5, 5, 5, 5, 5, 0, -10,
+        -10, 0, 5, 0, 0, 0, 0, -10,
+        -20, -10, -10, -5, -5, -10, -10, -20),
+    KING: (
+        -30, -40, -40, -50, -50, -40, -40, -30,
+        -30, -40, -40, -50, -50, -40, -40, -30,
+        -30, -40, -40, -50, -50, -40, -40, -30,
+        -30, -40, -40, -50, -50, -40, -40, -30,
+        -20, -30, -30, -40, -40, -30, -30, -20,
+        -10, -20, -20, -20, -20, -20, -20, -10,
+        20, 20, 0, 0, 0, 0, 20, 20,
+        20, 30, 10, 0, 0, 10, 30, 20),
+}
+
+# Valor (material + posición) de cada pieza en cada casilla, positivo para
+# las blancas y negativo para las negras; las negras usan la tabla reflejada
+PIECE_SQUARE_VALUES = tuple(
+    tuple(PIECE_VALUES[ptype] + _PST[ptype][sq] for sq in range(64))
+    for ptype in range(6)
+) + tuple(
+    tuple(-(PIECE_VALUES[ptype] + _PST[ptype][sq ^ 56]) for sq in range(64))
+    for ptype in range(6)
+)
+
+# Tipos de entrada de la tabla de transposición
+EXACT, LOWER_BOUND, UPPER_BOUND = 0, 1, 2
+
+MAX_PLY = 64
+NO_KILLERS = (None, None)
+
+
+def evaluate(board):
+    """
+    Evalúa la posición (material y tablas pieza-casilla) desde el punto de
+    vista del bando al que le toca mover.
+    """
+    score = 0
+    pieces = board.pieces
+    for index in range(12):
+        bb = pieces[index]
+        if bb:
+            table = PIECE_SQUARE_VALUES[index]
+            while bb:
+                lsb = bb & -bb
+                score += table[lsb.bit_length() - 1]
+                bb ^= lsb
+    return score if board.turn == WHITE_SIDE else -score
+
+
+class SearchStopped(Exception):
+    """
+    Se lanza dentro de la búsqueda cuando se agota el tiempo o se cancela.
+    """
+
+
+class TranspositionTable:
+    """
+    Tabla de transposición de tamaño fijo indexada por la clave Zobrist.
+
+    Cada casilla guarda una única entrada (clave, profundidad, tipo,
+    puntuación, movimiento); una entrada nueva reemplaza a la anterior salvo
+    que esta sea de la misma posición y con mayor profundidad.
+    """
+
+    def __init__(self, size=1 << 18):
+        # El tamaño se redondea a potencia de dos para indexar con una máscara
+        self.size = 1 << max(size - 1, 1).bit_length()
+        self.mask = self.size - 1
+        self.entries = [None] * self.size
+
+    def get(self, key):
+        """
+        Devuelve la entrada de la posición o None.
+        """
+        entry = self.entries[key & self.mask]
+        if entry is not None and entry[0] == key:
+            return entry
+        return None
+
+    def store(self, key, depth, flag, score, move):
+        """
+        Guarda el resultado de búsqueda de una posición.
+        """
+        index = key & self.mask
+        entry = self.entries[index]
+        if entry is None or entry[0] != key or depth >= entry[1]:
+            self.entries[index] = (key, depth, flag, score, move)
+
+    def clear(self):
+        """
+        Vacía la tabla.
+        """
+        self.entries = [None] * self.size
+
+
+class NativeAI:
+    """
+    Motor de búsqueda alfa-beta con la misma interfaz que ChessAI.
+
+    Atributos:
+    -----------
+    max_depth : int
+        Profundidad máxima de la profundización iterativa.
+    time_limit : float
+        Tiempo máximo de búsqueda por jugada en segundos (None sin límite).
+    board : BitBoard
+        Posición actual del motor.
+    history : PositionHistory
+        Claves de la partida para detectar repeticiones en la búsqueda.
+    nodes : int
+        Nodos visitados en la última búsqueda.
+    last_pv : list
+        Variante principal (UCI) de la última jugada devuelta.
+    stop_event : threading.Event
+        Aviso de cancelación de la búsqueda en curso (ver stop()).
+    stopped : bool
+        Si la última búsqueda se cortó (por stop() o por tiempo).
+    """
+
+    def __init__(self, difficulty, tt_size=1 << 18, eval_cache=None):
+        """
+        Inicializa el motor nativo.
+
+        Args:
+            difficulty (dict): Diccionario con la configuración de dificultad
+            tt_size (int): Número de entradas de la tabla de transposición
+            eval_cache (EvalCache): Caché de análisis consultada antes de
+                buscar (None para no usarla)
+        """
+        self.max_depth = difficulty.get('native_depth', 4)
+        time_ms = difficulty.get('time')
+        self.time_limit = time_ms / 1000 if time_ms else None
+        self.tt = TranspositionTable(tt_size)
+        self.eval_cache = eval_cache
+        # Solo se guardan búsquedas completas, que no dependen del tiempo
+        self.cache_params = f"nativo:depth={self.max_depth}"
+        self.last_pv = []
+        self.nodes = 0
+        self.stopped = False
+        self.stop_event = threading.Event()
+        self.reset_position()
+
+    def reset_position(self, fen=START_FEN):
+        """Reinicia el tablero a la posición inicial (o a la FEN indicada)"""
+        self.start_fen = fen
+        self.board = BitBoard.from_fen(fen)
+        self.history = PositionHistory(self.board.key)
+        self.tt.clear()
+
+    @profiled('engine.get_best_move')
+    def get_best_move(self, moves, movetime=None, stop_event=None):
+        """
+        Obtiene el mejor movimiento según la búsqueda nativa, o de la caché de
+        análisis si la posición ya se analizó con los mismos parámetros.
+
+        Args:
+            moves (list): Lista de movimientos previos en notación UCI
+            movetime (int): Tiempo máximo de búsqueda en ms (por defecto, el
+                'time' de la dificultad; ver time_manager)
+            stop_event (threading.Event): Aviso de cancelación de esta
+                búsqueda, creado al encargarla (ver AIWorker); si ya está
+                activo se devuelve enseguida la primera jugada legal
+
+        Returns:
+            str: Mejor movimiento en notación UCI (None si no hay jugadas)
+        """
+        self.stop_event = stop_event or threading.Event()
+        # Actualiza la posición con los movimientos previos
+        if moves:
+            self.board = BitBoard.from_fen(self.start_fen)
+            self.history = PositionHistory(self.board.key)
+            for move in moves:
+                self.make_move(move)
+
+        position = None
+        if self.eval_cache is not None:
+            position = position_key(self.board.to_fen())
+            cached = self.eval_cache.get(position, self.cache_params)
+            if cached is not None:
+                self.last_pv = cached[2]
+                return cached[0]
+
+        time_limit = movetime / 1000 if movetime else self.time_limit
+        best_move, score = self.search(self.max_depth, time_limit)
+        if best_move is None:
+            self.last_pv = []
+            return None
+
+        self.last_pv = [move_to_uci(move)
+                        for move in self.principal_variation(best_move)]
+        # Una búsqueda cancelada no se guarda: no es el análisis completo
+        if position is not None and not self.stopped:
+            self.eval_cache.put(position, self.cache_params, self.last_pv[0],
+                                score, self.last_pv)
+        return self.last_pv[0]
+
+    def make_move(self, move):
+        """
+        Realiza un movimiento en el motor.
+
+        Args:
+            move (str): Movimiento en notación UCI
+        """
+        encoded = parse_uci(self.board, move)
+        if encoded is None:
+            raise ValueError(f"Movimiento ilegal para el motor: {move}")
+        self.board.apply_move(encoded)
+        self.history.push(self.board.key,
+                          irreversible=self.board.halfmove_clock == 0)
+
+    def convert_to_uci(self, start_pos, end_pos):
+        """
+        Convierte las coordenadas del tablero a notación UCI.
+        """
+        files = 'abcdefgh'
+        ranks = '87654321'
+        return (files[start_pos[1]] + ranks[start_pos[0]] +
+                files[end_pos[1]] + ranks[end_pos[0]])
+
+    def principal_variation(self, first_move):
+        """
+        Reconstruye la variante principal desde la posición del motor
+        siguiendo las jugadas de la tabla de transposición.
+
+        Returns:
+            list: Movimientos codificados, empezando por first_move.
+        """
+        board = self.board.copy()
+        pv = []
+        move = first_move
+        seen = set()
+        while move is not None and len(pv) < MAX_PLY and board.key not in seen:
+            seen.add(board.key)
+            if move not in generate_legal_moves(board):
+                break
+            pv.append(move)
+            board.apply_move(move)
+            entry = self.tt.get(board.key)
+            move = entry[4] if entry is not None else None
+        return pv
+
+    def stop(self, stop_event=None):
+        """
+        Cancela la búsqueda de 'stop_event' (por defecto, la actual); se
+        devuelve la última iteración completa. Si esa búsqueda aún no ha
+        empezado, terminará nada más empezar.
+        """
+        (stop_event or self.stop_event).set()
+
+    def close(self):
+        """
+        Libera el motor. El motor nativo no tiene recursos externos.
+        """
+
+    # Búsqueda
+
+    def search(self, max_depth, time_limit=None):
+        """
+        Busca con profundización iterativa hasta max_depth o hasta agotar el
+        tiempo.
+
+        Returns:
+            tuple: (mejor movimiento codificado o None, puntuación)
+        """
+        self.nodes = 0
+        self.stopped = False
+        self.deadline = time.perf_counter() + time_limit if time_limit else None
+        self.killers = [[None, None] for _ in range(MAX_PLY)]
+        self.history_scores = {}
+        # Posiciones ya vistas (partida + camino de búsqueda) para repeticiones
+        self.seen = dict(self.history.counts)
+
+        # Se busca sobre una copia: si la búsqueda se detiene a mitad de un
+        # camino, la posición del motor no queda con movimientos sin deshacer
+        root = self.board.copy()
+        best_move, best_score = None, 0
+        root_moves = generate_legal_moves(root)
+        if not root_moves:
+            return None, 0
+        if len(root_moves) == 1:
+            return root_moves[0], 0
+
+        for depth in range(1, max_depth + 1):
+            try:
+                self._check_limits()
+                score = self._negamax(root, depth, -INFINITY, INFINITY, 0)
+            except SearchStopped:
+                break
+            best_move, best_score = self.root_best, score
+            if abs(score) >= MATE_BOUND:
+                break
+
+        if best_move is None:
+            best_move = root_moves[0]
+        return best_move, best_score
+
+    def _check_limits(self):
+        """
+        Lanza SearchStopped si se canceló la búsqueda o se agotó el tiempo.
+        """
+        if (self.stop_event.is_set() or
+                (self.deadline and time.perf_counter() >= self.deadline)):
+            self.stopped = True
+            raise SearchStopped()
+
+    def _order_moves(self, board, moves, tt_move, killers):
+        """
+        Ordena los movimientos: jugada de la tabla, capturas por MVV-LVA,
+        promociones, killers y finalmente por puntuación de historial.
+        """
+        mailbox = board.mailbox
+        history = self.history_scores
+        scored = []
+        for move in moves:
+            if move == tt_move:
+                score = 10_000_000
+            else:
+                victim = mailbox[(move >> 6) & 63]
+                if victim is not None:
+                    score = 1_000_000 + PIECE_VALUES[victim % 6] * 10 - mailbox[move & 63] % 6
+                elif move & FLAG_EN_PASSANT:
+                    score = 1_000_000 + PIECE_VALUES[PAWN] * 10
+                elif move >> PROMOTION_SHIFT & 7:
+                    score = 900_000
+                elif move == killers[0]:
+                    score = 800_000
+                elif move == killers[1]:
+                    score = 700_000
+                else:
+                    score = history.get(move, 0)
+            scored.append((score, move))
+        scored.sort(reverse=True)
+        return [move for _, move in scored]
+
+    def _negamax(self, board, depth, alpha, beta, ply):
+        """
+        Búsqueda alfa-beta (variante de ventana nula) en formato negamax.
+        """
+        self.nodes += 1
+        if not self.nodes & 1023:
+            self._check_limits()
+
+        checked = in_check(board)
+        if checked and ply < MAX_PLY // 2:
+            depth += 1  # Extensión de jaque
+
+        if depth <= 0 or ply >= MAX_PLY - 1:
+            return self._quiescence(board, alpha, beta, ply)
+
+        key = board.key
+        tt_move = None
+        entry = self.tt.get(key)
+        if entry is not None:
+            tt_move = entry[4]
+            if ply and entry[1] >= depth:
+                score = _score_from_tt(entry[3], ply)
+                flag = entry[2]
+                if flag == EXACT:
+                    return score
+                if flag == LOWER_BOUND and score >= beta:
+                    return score
+                if flag == UPPER_BOUND and score <= alpha:
+                    return score
+
+        moves = generate_legal_moves(board)
+        if not moves:
+            return -MATE_SCORE + ply if checked else 0
+
+        original_alpha = alpha
+        best_score = -INFINITY
+        best_move = None
+        seen = self.seen
+        mailbox = board.mailbox
+
+        ordered = self._order_moves(board, moves, tt_move, self.killers[ply])
+        for index, move in enumerate(ordered):
+            undo = board.make_move(move)
+            child_key = board.key
+
+            if board.halfmove_clock >= 100 or seen.get(child_key):
+                score = 0  # Tablas por repetición o por la regla de 50 movimientos
+            else:
+                seen[child_key] = 1
+                try:
+                    if index == 0:
+                        score = -self._negamax(board, depth - 1, -beta, -alpha, ply + 1)
+                    else:
+                        score = -self._negamax(board, depth - 1, -alpha - 1, -alpha, ply + 1)
+                        if alpha < score < beta:
+                            score = -self._negamax(board, depth - 1, -beta, -alpha, ply + 1)
+                finally:
+                    del seen[child_key]
+            board.unmake_move(undo)
+
+            if score > best_score:
+                best_score = score
+                best_move = move
+            if score > alpha:
+                alpha = score
+            if alpha >= beta:
+                # Corte: registrar killers e historial para jugadas tranquilas
+                if mailbox[(move >> 6) & 63] is None and not move & FLAG_EN_PASSANT:
+                    killers = self.killers[ply]
+                    if killers[0] != move:
+                        killers[1] = killers[0]
+                        killers[0] = move
+                    self.history_scores[move] = self.history_scores.get(move, 0) + depth * depth
+                break
+
+        if best_score <= original_alpha:
+            flag = UPPER_BOUND
+        elif best_score >= beta:
+            flag = LOWER_BOUND
+        else:
+            flag = EXACT
+        self.tt.store(key, depth, flag, _score_to_tt(best_score, ply), best_move)
+        if not ply:
+            self.root_best = best_move
+        return best_score
+
+    def _quiescence(self, board, alpha, beta, ply):
+        """
+        Búsqueda de quietud: solo capturas y promociones hasta que la posición
+        se estabiliza.
+        """
+        self.nodes += 1
+        if not self.nodes & 1023:
+            self._check_limits()
+
+        stand_pat = evaluate(board)
+        if stand_pat >= beta:
+            return stand_pat
+        if stand_pat > alpha:
+            alpha = stand_pat
+
+        mailbox = board.mailbox
+        noisy = [move for move in generate_legal_moves(board)
+                 if mailbox[(move >> 6) & 63] is not None
+                 or move & FLAG_EN_PASSANT or move >> PROMOTION_SHIFT & 7]
+        if not noisy:
+            return alpha
+
+        for move in self._order_moves(board, noisy, None, NO_KILLERS):
+            undo = board.make_move(move)
+            score = -self._quiescence(board, -beta, -alpha, ply + 1)
+            board.unmake_move(undo)
+            if score >= beta:
+                return score
+            if score > alpha:
+                alpha = score
+        return alpha
+
+
+def _score_to_tt(score, ply):
+    """
+    Convierte una puntuación de mate relativa a la raíz en relativa al nodo.
+    """
+    if score >= MATE_BOUND:
+        return score + ply
+    if score <= -MATE_BOUND:
+        return score - ply
+    return score
+
+
+def _score_from_tt(score, ply):
+    """
+    Convierte una puntuación de mate guardada en la tabla a relativa a la raíz.
+    """
+    if score >= MATE_BOUND:
+        return score - ply
+    if score <= -MATE_BOUND:
+        return score + ply
+    return score
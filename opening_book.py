@@ -0,0 +1,276 @@
+"""
+Libro de aperturas Polyglot delante de los motores.
+
+El libro (.bin) es una lista de entradas de 16 bytes ordenadas por clave
+(clave de 64 bits, movimiento de 16, peso de 16 y 32 de aprendizaje, en big
+endian). Se proyecta en memoria con mmap y se busca con búsqueda binaria, de
+modo que abrirlo no lee el fichero entero y cada consulta toca unas pocas
+páginas. BookEngine envuelve a ChessAI o NativeAI: mientras la posición esté en
+el libro responde desde él y solo las posiciones que faltan llegan al motor.
+"""
+import mmap
+import os
+import random
+import struct
+import threading
+
+from bitboard import BitBoard, PROMOTION_SHIFT, START_FEN
+from legal_moves import generate_legal_moves, move_to_uci, parse_uci
+from polyglot import decode_book_move, encode_book_move, polyglot_key
+
+ENTRY = struct.Struct('>QHHI')
+ENTRY_SIZE = ENTRY.size
+_KEY = struct.Struct('>Q')
+
+
+class OpeningBook:
+    """
+    Libro Polyglot proyectado en memoria.
+
+    Atributos:
+    -----------
+    path : str
+        Ruta del fichero .bin.
+    size : int
+        Número de entradas del libro.
+    """
+
+    def __init__(self, path):
+        """
+        Raises:
+            OSError: Si el fichero no puede abrirse.
+        """
+        self.path = path
+        with open(path, 'rb') as stream:
+            length = os.fstat(stream.fileno()).st_size
+            self._data = (mmap.mmap(stream.fileno(), 0, access=mmap.ACCESS_READ)
+                          if length else b'')
+        self.size = length // ENTRY_SIZE
+
+    def __len__(self):
+        return self.size
+
+    def _first_index(self, key):
+        """
+        Búsqueda binaria de la primera entrada con clave >= key.
+        """
+        data = self._data
+        low, high = 0, self.size
+        while low < high:
+            middle = (low + high) // 2
+            if _KEY.unpack_from(data, middle * ENTRY_SIZE)[0] < key:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def raw_entries(self, key):
+        """
+        Devuelve las entradas (movimiento de 16 bits, peso) de una clave.
+        """
+        data = self._data
+        entries = []
+        index = self._first_index(key)
+        while index < self.size:
+            entry_key, raw, weight, _ = ENTRY.unpack_from(data, index * ENTRY_SIZE)
+            if entry_key != key:
+                break
+            entries.append((raw, weight))
+            index += 1
+        return entries
+
+    def entries(self, board):
+        """
+        Devuelve los movimientos legales del libro para la posición como
+        lista de (movimiento codificado, peso).
+        """
+        raw_entries = self.raw_entries(polyglot_key(board))
+        if not raw_entries:
+            return []
+
+        # Se generan los movimientos legales una sola vez por consulta
+        legal = {(move & 63, (move >> 6) & 63, (move >> PROMOTION_SHIFT) & 7): move
+                 for move in generate_legal_moves(board)}
+        entries = []
+        for raw, weight in raw_entries:
+            move = legal.get(decode_book_move(board, raw))
+            if move is not None:
+                entries.append((move, weight))
+        return entries
+
+    def choose(self, board, variety=0.0, rng=random):
+        """
+        Elige un movimiento del libro.
+
+        Args:
+            board (BitBoard): Posición actual
+            variety (float): 0 juega siempre el de más peso; 1 sortea en
+                proporción al peso; valores mayores igualan las opciones
+            rng (random.Random): Generador para el sorteo
+
+        Returns:
+            int: Movimiento codificado, o None si la posición no está en el libro.
+        """
+        entries = [entry for entry in self.entries(board) if entry[1] > 0]
+        if not entries:
+            return None
+        if variety <= 0:
+            return max(entries, key=lambda entry: entry[1])[0]
+        weights = [weight ** (1 / variety) for _, weight in entries]
+        return rng.choices([move for move, _ in entries], weights)[0]
+
+    def close(self):
+        """
+        Libera la proyección en memoria.
+        """
+        if isinstance(self._data, mmap.mmap):
+            self._data.close()
+        self._data = b''
+        self.size = 0
+
+
+def write_book(path, entries):
+    """
+    Escribe un libro Polyglot. Las entradas repetidas (misma posición y
+    movimiento) se funden sumando sus pesos.
+
+    Args:
+        path (str): Ruta del fichero .bin
+        entries (iterable): Tuplas (BitBoard, movimiento codificado, peso)
+    """
+    weights = {}
+    for board, move, weight in entries:
+        row = (polyglot_key(board), encode_book_move(move))
+        weights[row] = weights.get(row, 0) + weight
+    with open(path, 'wb') as stream:
+        for (key, raw), weight in sorted(weights.items()):
+            stream.write(ENTRY.pack(key, raw, min(weight, 0xFFFF), 0))
+
+
+_books = {}
+_books_lock = threading.Lock()
+
+
+def get_book(path):
+    """
+    Devuelve el libro compartido de una ruta, abriéndolo la primera vez
+    (None si la ruta es None o el fichero no existe).
+    """
+    if not path:
+        return None
+    with _books_lock:
+        if path not in _books:
+            try:
+                _books[path] = OpeningBook(path)
+            except OSError:
+                _books[path] = None
+        return _books[path]
+
+
+class BookEngine:
+    """
+    Motor que responde desde el libro de aperturas y delega en el motor
+    envuelto cuando la posición no está en él.
+
+    Atributos:
+    -----------
+    engine : ChessAI | NativeAI
+        Motor que busca las posiciones fuera del libro.
+    book : OpeningBook
+        Libro consultado.
+    variety : float
+        Variedad al elegir entre las jugadas del libro (ver choose).
+    board : BitBoard
+        Posición de la partida, seguida en paralelo al motor.
+    book_hits : int
+        Jugadas respondidas desde el libro.
+    last_pv : list
+        Variante principal (UCI) de la última jugada devuelta (solo la
+        jugada si salió del libro).
+    """
+
+    def __init__(self, engine, book, variety=0.0, rng=None):
+        self.engine = engine
+        self.book = book
+        self.variety = variety
+        self.rng = rng or random.Random()
+        self.book_hits = 0
+        self.last_pv = []
+        self.start_fen = START_FEN
+        self.board = BitBoard.from_fen(START_FEN)
+        self.in_book = True
+
+    def __getattr__(self, name):
+        # El resto de atributos (stockfish, tt, nodes...) son los del motor
+        return getattr(self.engine, name)
+
+    def reset_position(self, fen=START_FEN):
+        """Reinicia el tablero a la posición inicial (o a la FEN indicada)"""
+        self.engine.reset_position(fen)
+        self.start_fen = fen
+        self.board = BitBoard.from_fen(fen)
+        self.in_book = True
+
+    def get_best_move(self, moves, movetime=None, stop_event=None):
+        """
+        Devuelve la jugada del libro si la posición está en él; si no, la del
+        motor. Una vez fuera del libro no se vuelve a consultar.
+
+        Args:
+            moves (list): Lista de movimientos previos en notación UCI
+            movetime (int): Tiempo máximo de búsqueda del motor en ms
+            stop_event (threading.Event): Aviso de cancelación de la búsqueda
+                del motor
+        """
+        if moves:
+            self.board = BitBoard.from_fen(self.start_fen)
+            for move in moves:
+                self._push(move)
+            self.in_book = True
+
+        if self.in_book:
+            book_move = self.book.choose(self.board, self.variety, self.rng)
+            if book_move is not None:
+                self.book_hits += 1
+                self.last_pv = [move_to_uci(book_move)]
+                return self.last_pv[0]
+            self.in_book = False
+        best_move = self.engine.get_best_move(moves, movetime, stop_event)
+        self.last_pv = self.engine.last_pv
+        return best_move
+
+    def make_move(self, move):
+        """
+        Realiza un movimiento en el motor y en el tablero seguido (que deja
+        de actualizarse al salir del libro).
+        """
+        self.engine.make_move(move)
+        if self.in_book:
+            self._push(move)
+
+    def _push(self, move):
+        """
+        Aplica un movimiento UCI al tablero seguido.
+        """
+        encoded = parse_uci(self.board, move)
+        if encoded is None:
+            raise ValueError(f"Movimiento ilegal para el libro: {move}")
+        self.board.apply_move(encoded)
+
+    def convert_to_uci(self, start_pos, end_pos):
+        """
+        Convierte las coordenadas del tablero a notación UCI.
+        """
+        return self.engine.convert_to_uci(start_pos, end_pos)
+
+    def stop(self, stop_event=None):
+        """
+        Cancela la búsqueda del motor de 'stop_event' (por defecto, la actual).
+        """
+        self.engine.stop(stop_event)
+
+    def close(self):
+        """
+        Libera el motor envuelto (el libro es compartido y sigue abierto).
+        """
+        self.engine.close()
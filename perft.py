@@ -0,0 +1,200 @@
+"""
+Perft: cuenta los nodos del árbol de movimientos legales hasta una profundidad
+dada, para validar el generador de movimientos y medir su rendimiento.
+
+Con --attack-maps se comprueban además los mapas de ataques incrementales
+(attack_map.py) en partidas aleatorias desde las posiciones de PERFT_SUITE.
+
+Uso:
+    python perft.py --depth 4
+    python perft.py --depth 3 --fen "<FEN>" --divide
+    python perft.py --suite
+    python perft.py --attack-maps 100
+"""
+import argparse
+import random
+import time
+
+from attack_map import AttackMap, move_squares
+from bitboard import BitBoard, START_FEN
+from legal_moves import generate_legal_moves, in_check, move_to_uci
+
+# Posiciones de referencia con sus recuentos conocidos por profundidad
+PERFT_SUITE = [
+    ("inicial", START_FEN, [20, 400, 8902, 197281]),
+    ("kiwipete",
+     "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1",
+     [48, 2039, 97862]),
+    ("posición 3", "8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1",
+     [14, 191, 2812, 43238]),
+    ("posición 4",
+     "r3k2r/Pppp1ppp/1b3nbN/nP6/BBP1P3/q4N2/Pp1P2PP/R2Q1RK1 w kq - 0 1",
+     [6, 264, 9467]),
+    ("posición 5", "rnbq1k1r/pp1Pbppp/2p5/8/2B5/8/PPP1NnPP/RNBQK2R w KQ - 1 8",
+     [44, 1486, 62379]),
+    ("posición 6",
+     "r4rk1/1pp1qppp/p1np1n2/2b1p1B1/2B1P1b1/P1NP1N2/1PP1QPPP/R4RK1 w - - 0 10",
+     [46, 2079, 89890]),
+]
+
+
+def perft(board, depth):
+    """
+    Cuenta las posiciones hoja alcanzables en 'depth' medios movimientos.
+    """
+    moves = generate_legal_moves(board)
+    if depth <= 1:
+        return len(moves) if depth == 1 else 1
+
+    nodes = 0
+    for move in moves:
+        undo = board.make_move(move)
+        nodes += perft(board, depth - 1)
+        board.unmake_move(undo)
+    return nodes
+
+
+def divide(board, depth):
+    """
+    Devuelve el recuento perft de cada movimiento raíz, en notación UCI.
+    """
+    result = {}
+    for move in generate_legal_moves(board):
+        undo = board.make_move(move)
+        result[move_to_uci(move)] = perft(board, depth - 1)
+        board.unmake_move(undo)
+    return result
+
+
+def timed_perft(board, depth):
+    """
+    Ejecuta perft y devuelve (nodos, segundos, nodos por segundo).
+    """
+    start = time.perf_counter()
+    nodes = perft(board, depth)
+    elapsed = time.perf_counter() - start
+    return nodes, elapsed, nodes / elapsed if elapsed > 0 else 0.0
+
+
+def run_suite(max_depth):
+    """
+    Valida el generador contra PERFT_SUITE y muestra el rendimiento.
+
+    Returns:
+        bool: True si todos los recuentos coinciden.
+    """
+    ok = True
+    for name, fen, expected in PERFT_SUITE:
+        for depth, count in enumerate(expected[:max_depth], start=1):
+            nodes, elapsed, nps = timed_perft(BitBoard.from_fen(fen), depth)
+            status = "OK" if nodes == count else f"ERROR (esperado {count})"
+            ok = ok and nodes == count
+            print(f"{name:<12} prof. {depth}: {nodes:>9} nodos "
+                  f"{elapsed:8.3f}s {nps:>10,.0f} nps  {status}")
+    return ok
+
+
+def attack_map_matches(board, attack_map):
+    """
+    Indica si el mapa de ataques mantenido de forma incremental coincide con
+    uno reconstruido desde cero, y su jaque y su existencia de jugadas
+    legales con los de legal_moves.
+    """
+    fresh = AttackMap(board)
+    return (attack_map.attacks == fresh.attacks and
+            attack_map.owners == fresh.owners and
+            attack_map.counts == fresh.counts and
+            attack_map.maps == fresh.maps and
+            attack_map.in_check(board) == in_check(board) and
+            attack_map.has_legal_move(board) == bool(generate_legal_moves(board)))
+
+
+def check_attack_maps(games, plies=200, seed=0):
+    """
+    Juega partidas aleatorias (semilla fija) desde las posiciones de
+    PERFT_SUITE, deshaciendo jugadas al azar, y comprueba el mapa de ataques
+    incremental tras cada movimiento y cada vuelta atrás.
+
+    Returns:
+        list: FEN de las posiciones en las que el mapa no coincide.
+    """
+    rng = random.Random(seed)
+    fens = [fen for _, fen, _ in PERFT_SUITE]
+    errors = []
+    for game in range(games):
+        board = BitBoard.from_fen(fens[game % len(fens)])
+        attack_map = AttackMap(board)
+        undos = []
+        for _ in range(plies):
+            moves = generate_legal_moves(board)
+            if undos and (not moves or rng.random() < 0.1):
+                undo = undos.pop()
+                board.unmake_move(undo)
+                attack_map.update(board, move_squares(undo[0], board.turn))
+            elif moves:
+                move = rng.choice(moves)
+                color = board.turn
+                undos.append(board.make_move(move))
+                attack_map.update(board, move_squares(move, color))
+            else:
+                break
+            if not attack_map_matches(board, attack_map):
+                errors.append(board.to_fen())
+    return errors
+
+
+def run_attack_map_check(games):
+    """
+    Ejecuta check_attack_maps y muestra el resultado.
+
+    Returns:
+        bool: True si los mapas coinciden en todas las posiciones.
+    """
+    start = time.perf_counter()
+    errors = check_attack_maps(games)
+    elapsed = time.perf_counter() - start
+    for fen in errors[:10]:
+        print(f"ERROR en el mapa de ataques: {fen}")
+    print(f"Mapas de ataques: {games} partidas, {len(errors)} errores "
+          f"({elapsed:.1f}s)")
+    return not errors
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Perft del generador de movimientos")
+    parser.add_argument('--depth', type=int, default=3)
+    parser.add_argument('--fen', default=START_FEN)
+    parser.add_argument('--divide', action='store_true',
+                        help="muestra el recuento de cada movimiento raíz")
+    parser.add_argument('--suite', action='store_true',
+                        help="valida las posiciones de referencia")
+    parser.add_argument('--attack-maps', type=int, metavar='PARTIDAS',
+                        help="comprueba los mapas de ataques incrementales en "
+                             "PARTIDAS partidas aleatorias")
+    args = parser.parse_args()
+
+    if args.suite or args.attack_maps:
+        ok = True
+        if args.suite:
+            ok = run_suite(args.depth)
+        if args.attack_maps:
+            ok = run_attack_map_check(args.attack_maps) and ok
+        raise SystemExit(0 if ok else 1)
+
+    board = BitBoard.from_fen(args.fen)
+    if args.divide:
+        start = time.perf_counter()
+        result = divide(board, args.depth)
+        elapsed = time.perf_counter() - start
+        for uci, nodes in sorted(result.items()):
+            print(f"{uci}: {nodes}")
+        total = sum(result.values())
+    else:
+        total, elapsed, _ = timed_perft(board, args.depth)
+
+    nps = total / elapsed if elapsed > 0 else 0.0
+    print(f"\nNodos: {total}  Tiempo: {elapsed:.3f}s  {nps:,.0f} nps")
+
+
+if __name__ == '__main__':
+    main()
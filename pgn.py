@@ -0,0 +1,396 @@
+"""
+Lectura y escritura de partidas en PGN con notación algebraica estándar (SAN).
+
+read_games es un generador: lee el fichero por bloques de tamaño fijo y
+entrega las partidas de una en una, así que la memoria usada no depende del
+tamaño del fichero (sirve para bases de datos de varios gigabytes). Las jugadas
+se guardan en SAN tal y como vienen y solo se validan contra las reglas al
+llamar a PgnGame.decode().
+
+Uso:
+    for game in read_games('partidas.pgn'):
+        moves = game.decode()
+"""
+import re
+
+from bitboard import (BitBoard, FEN_PIECES, FLAG_CASTLE, FLAG_EN_PASSANT,
+                      PAWN, PROMOTION_SHIFT, START_FEN)
+from legal_moves import generate_legal_moves, in_check, move_to_uci
+
+FILES = 'abcdefgh'
+# Letras SAN indexadas por tipo de pieza (PAWN..KING)
+SAN_PIECES = FEN_PIECES[:6]
+RESULTS = ('1-0', '0-1', '1/2-1/2', '*')
+SEVEN_TAG_ROSTER = ('Event', 'Site', 'Date', 'Round', 'White', 'Black', 'Result')
+CASTLING_SAN = {'O-O': 6, 'O-O-O': 2, '0-0': 6, '0-0-0': 2}
+
+# Tamaño de bloque de lectura por defecto
+CHUNK_SIZE = 1 << 16
+
+_TAG_RE = re.compile(r'\[\s*(\w+)\s+"((?:[^"\\]|\\.)*)"\s*\]')
+_TOKEN_RE = re.compile(r'[{}();]|[^\s{}();]+')
+
+
+def square_name(sq):
+    """
+    Nombre algebraico de una casilla (por ejemplo 'e4').
+    """
+    return FILES[sq & 7] + str(8 - (sq >> 3))
+
+
+def move_to_san(board, move, legal_moves=None):
+    """
+    Convierte un movimiento legal codificado a SAN (por ejemplo 'Nbd7',
+    'exd8=Q+', 'O-O').
+
+    Args:
+        board (BitBoard): Posición antes del movimiento (no se modifica)
+        move (int): Movimiento codificado
+        legal_moves (list): Movimientos legales ya generados, si se tienen
+    """
+    from_sq = move & 63
+    to_sq = (move >> 6) & 63
+    mailbox = board.mailbox
+
+    if move & FLAG_CASTLE:
+        san = 'O-O' if to_sq & 7 == 6 else 'O-O-O'
+    else:
+        moving = mailbox[from_sq]
+        ptype = moving % 6
+        capture = mailbox[to_sq] is not None or move & FLAG_EN_PASSANT
+        if ptype == PAWN:
+            san = FILES[from_sq & 7] + 'x' if capture else ''
+            san += square_name(to_sq)
+            promotion = (move >> PROMOTION_SHIFT) & 7
+            if promotion:
+                san += '=' + SAN_PIECES[promotion]
+        else:
+            san = SAN_PIECES[ptype]
+            if legal_moves is None:
+                legal_moves = generate_legal_moves(board)
+            # Desambiguar entre piezas iguales que pueden ir al mismo destino
+            rivals = [other & 63 for other in legal_moves
+                      if other != move and (other >> 6) & 63 == to_sq
+                      and mailbox[other & 63] == moving]
+            if rivals:
+                if all(sq & 7 != from_sq & 7 for sq in rivals):
+                    san += FILES[from_sq & 7]
+                elif all(sq >> 3 != from_sq >> 3 for sq in rivals):
+                    san += str(8 - (from_sq >> 3))
+                else:
+                    san += square_name(from_sq)
+            if capture:
+                san += 'x'
+            san += square_name(to_sq)
+
+    undo = board.make_move(move)
+    if in_check(board):
+        san += '+' if generate_legal_moves(board) else '#'
+    board.unmake_move(undo)
+    return san
+
+
+def parse_san(board, san, legal_moves=None):
+    """
+    Convierte una jugada en SAN al movimiento legal codificado. Acepta
+    también la forma larga ('Ng1-f3', 'Ng1f3') y promociones sin '='.
+
+    Raises:
+        ValueError: Si la jugada no es legal o es ambigua en la posición.
+    """
+    if legal_moves is None:
+        legal_moves = generate_legal_moves(board)
+    text = san.rstrip('+#!?')
+
+    castle_col = CASTLING_SAN.get(text)
+    if castle_col is not None:
+        for move in legal_moves:
+            if move & FLAG_CASTLE and (move >> 6) & 7 == castle_col:
+                return move
+        raise ValueError(f"Jugada SAN ilegal: {san}")
+
+    promotion = 0
+    if '=' in text:
+        text, _, piece = text.partition('=')
+        promotion = SAN_PIECES.find(piece[:1].upper())
+        if promotion <= PAWN or promotion == len(SAN_PIECES) - 1:
+            raise ValueError(f"Jugada SAN no válida: {san}")
+    elif len(text) > 2 and text[-1] in 'NBRQ' and text[-2] in '18':
+        promotion = SAN_PIECES.index(text[-1])
+        text = text[:-1]
+
+    ptype = PAWN
+    if text and text[0] in 'NBRQK':
+        ptype = SAN_PIECES.index(text[0])
+        text = text[1:]
+    text = text.replace('x', '').replace('-', '').replace(':', '')
+    if len(text) < 2 or text[-2] not in FILES or text[-1] not in '12345678':
+        raise ValueError(f"Jugada SAN no válida: {san}")
+    to_sq = (8 - int(text[-1])) * 8 + FILES.index(text[-2])
+
+    from_file = from_rank = None
+    for char in text[:-2]:
+        if char in FILES:
+            from_file = FILES.index(char)
+        elif char in '12345678':
+            from_rank = 8 - int(char)
+        else:
+            raise ValueError(f"Jugada SAN no válida: {san}")
+
+    mailbox = board.mailbox
+    candidates = [
+        move for move in legal_moves
+        if (move >> 6) & 63 == to_sq
+        and mailbox[move & 63] % 6 == ptype
+        and (move >> PROMOTION_SHIFT) & 7 == promotion
+        and (from_file is None or move & 7 == from_file)
+        and (from_rank is None or (move & 63) >> 3 == from_rank)
+    ]
+    if len(candidates) != 1:
+        problem = "ambigua" if candidates else "ilegal"
+        raise ValueError(f"Jugada SAN {problem}: {san}")
+    return candidates[0]
+
+
+class PgnGame:
+    """
+    Partida PGN: etiquetas, jugadas en SAN y resultado.
+
+    Atributos:
+    -----------
+    headers : dict
+        Etiquetas de la partida ('Event', 'White', 'FEN', ...).
+    moves : list
+        Jugadas en SAN, sin números, comentarios ni variantes.
+    result : str
+        Resultado ('1-0', '0-1', '1/2-1/2' o '*').
+    """
+
+    def __init__(self, headers=None, moves=None, result='*'):
+        self.headers = headers if headers is not None else {}
+        self.moves = moves if moves is not None else []
+        self.result = result
+
+    @property
+    def start_fen(self):
+        """
+        Posición inicial de la partida (etiqueta FEN o la posición estándar).
+        """
+        return self.headers.get('FEN', START_FEN)
+
+    def board(self):
+        """
+        Devuelve un BitBoard con la posición inicial de la partida.
+        """
+        return BitBoard.from_fen(self.start_fen)
+
+    def decode(self):
+        """
+        Valida las jugadas contra las reglas.
+
+        Returns:
+            list: Movimientos codificados de la partida.
+
+        Raises:
+            ValueError: Si alguna jugada no es legal.
+        """
+        board = self.board()
+        moves = []
+        for san in self.moves:
+            move = parse_san(board, san)
+            board.apply_move(move)
+            moves.append(move)
+        return moves
+
+    def uci_moves(self):
+        """
+        Devuelve las jugadas en notación UCI.
+        """
+        return [move_to_uci(move) for move in self.decode()]
+
+    @classmethod
+    def from_moves(cls, moves, headers=None, start_fen=START_FEN, result='*'):
+        """
+        Construye una partida a partir de movimientos codificados.
+        """
+        headers = dict(headers or {})
+        if start_fen != START_FEN:
+            headers['SetUp'] = '1'
+            headers['FEN'] = start_fen
+        headers['Result'] = result
+
+        board = BitBoard.from_fen(start_fen)
+        sans = []
+        for move in moves:
+            sans.append(move_to_san(board, move))
+            board.apply_move(move)
+        return cls(headers, sans, result)
+
+    @classmethod
+    def from_state(cls, state, headers=None):
+        """
+        Construye una partida a partir de un core.GameState.
+        """
+        if state.winner == 'white':
+            result = '1-0'
+        elif state.winner == 'black':
+            result = '0-1'
+        elif state.game_over:
+            result = '1/2-1/2'
+        else:
+            result = '*'
+        return cls.from_moves([undo[0] for undo in state.move_stack], headers,
+                              state.start_fen, result)
+
+
+def _read_lines(stream, chunk_size):
+    """
+    Lee un flujo de texto por bloques y entrega sus líneas sin cargarlo
+    entero en memoria.
+    """
+    pending = ''
+    while True:
+        chunk = stream.read(chunk_size)
+        if not chunk:
+            break
+        lines = (pending + chunk).split('\n')
+        pending = lines.pop()
+        yield from lines
+    if pending:
+        yield pending
+
+
+def read_games(source, chunk_size=CHUNK_SIZE):
+    """
+    Lee partidas PGN de una en una.
+
+    Args:
+        source (str | file): Ruta del fichero o flujo de texto abierto
+        chunk_size (int): Caracteres leídos en cada bloque
+
+    Yields:
+        PgnGame: Cada partida del fichero, en orden.
+    """
+    if isinstance(source, str):
+        with open(source, encoding='utf-8', errors='replace') as stream:
+            yield from read_games(stream, chunk_size)
+        return
+
+    headers = {}
+    moves = []
+    in_comment = False
+    variation_depth = 0
+
+    for line in _read_lines(source, chunk_size):
+        if not in_comment:
+            stripped = line.strip()
+            if not stripped or line.startswith('%'):
+                continue
+            if stripped.startswith('[') and not variation_depth:
+                if moves:
+                    # Partida sin resultado final: empieza la siguiente
+                    yield PgnGame(headers, moves)
+                    headers, moves = {}, []
+                for name, value in _TAG_RE.findall(stripped):
+                    headers[name] = value.replace('\\"', '"').replace('\\\\', '\\')
+                continue
+
+        for token in _TOKEN_RE.findall(line):
+            if in_comment:
+                if token == '}':
+                    in_comment = False
+            elif token == '{':
+                in_comment = True
+            elif token == ';':
+                break  # Comentario hasta el final de la línea
+            elif token == '(':
+                variation_depth += 1
+            elif token == ')':
+                variation_depth = max(0, variation_depth - 1)
+            elif variation_depth or token[0] in '$!?':
+                continue
+            elif token in RESULTS:
+                yield PgnGame(headers, moves, token)
+                headers, moves = {}, []
+            else:
+                if token[0].isdigit() and token not in CASTLING_SAN:
+                    # Número de jugada ('12.', '12...' o pegado: '12.e4')
+                    token = token.lstrip('0123456789').lstrip('.')
+                    if not token:
+                        continue
+                moves.append(token)
+
+    if moves or headers:
+        yield PgnGame(headers, moves, headers.get('Result', '*'))
+
+
+def format_game(game, line_length=79):
+    """
+    Devuelve el texto PGN de una partida (etiquetas y jugadas numeradas).
+    """
+    headers = dict(game.headers)
+    headers['Result'] = game.result
+    lines = []
+    for name in SEVEN_TAG_ROSTER:
+        value = headers.pop(name, '?' if name != 'Result' else '*')
+        lines.append(_format_tag(name, value))
+    for name, value in headers.items():
+        lines.append(_format_tag(name, value))
+    lines.append('')
+
+    fields = game.start_fen.split()
+    black_to_move = len(fields) > 1 and fields[1] == 'b'
+    number = int(fields[5]) if len(fields) > 5 else 1
+
+    tokens = []
+    for san in game.moves:
+        if not black_to_move:
+            tokens.append(f"{number}.")
+        elif not tokens:
+            tokens.append(f"{number}...")
+        tokens.append(san)
+        if black_to_move:
+            number += 1
+        black_to_move = not black_to_move
+    tokens.append(game.result)
+
+    line = ''
+    for token in tokens:
+        if line and len(line) + 1 + len(token) > line_length:
+            lines.append(line)
+            line = token
+        else:
+            line = f"{line} {token}" if line else token
+    lines.append(line)
+    return '\n'.join(lines) + '\n\n'
+
+
+def _format_tag(name, value):
+    """
+    Formatea una etiqueta PGN escapando comillas y barras.
+    """
+    value = str(value).replace('\\', '\\\\').replace('"', '\\"')
+    return f'[{name} "{value}"]'
+
+
+def write_games(destination, games):
+    """
+    Escribe partidas en PGN de una en una (acepta cualquier iterable, también
+    generadores).
+
+    Args:
+        destination (str | file): Ruta del fichero o flujo de texto abierto
+        games (iterable): Partidas PgnGame
+
+    Returns:
+        int: Número de partidas escritas.
+    """
+    if isinstance(destination, str):
+        with open(destination, 'w', encoding='utf-8') as stream:
+            return write_games(stream, games)
+
+    count = 0
+    for game in games:
+        destination.write(format_game(game))
+        count += 1
+    return count
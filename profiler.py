@@ -0,0 +1,207 @@
+"""
+Medición de tiempos de los caminos calientes del juego.
+
+Los tiempos se guardan por nombre (ms) en ventanas deslizantes con las últimas
+muestras, de las que salen los percentiles y los histogramas; además se lleva
+el total y el número de llamadas desde el inicio. El decorador profiled()
+envuelve una función y, con el perfilador desactivado, solo añade una
+comprobación por llamada. Con aliased() las medidas de un nombre hechas en un
+hilo se guardan, durante un bloque, con otro (por ejemplo, las búsquedas
+anticipadas de la IA como engine.ponder). Las muestras se pueden volcar a JSON (al salir del
+juego, ver settings.PROFILE_PATH) para comparar entre versiones.
+"""
+import functools
+import json
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+# Muestras que se guardan de cada medida
+WINDOW = 600
+
+# Límites superiores (ms) de los intervalos de los histogramas
+HISTOGRAM_EDGES = (0.1, 0.25, 0.5, 1, 2, 4, 8, 16, 33, 66, 133, 250, 500,
+                   1000, 2000, 4000)
+
+
+def percentile(values, fraction):
+    """
+    Percentil por rango más cercano de una lista ordenada.
+    """
+    if not values:
+        return 0.0
+    index = max(0, min(len(values) - 1, int(round(fraction * len(values))) - 1))
+    return values[index]
+
+
+class Profiler:
+    """
+    Registro de tiempos por nombre.
+
+    Atributos:
+    -----------
+    enabled : bool
+        Si se registran medidas.
+    overlay : bool
+        Si se muestra el panel de tiempos en pantalla (tecla F3).
+    samples : dict
+        Últimas WINDOW medidas (ms) de cada nombre.
+    totals : dict
+        Tiempo acumulado (ms) de cada nombre desde el inicio.
+    counts : dict
+        Número de medidas de cada nombre desde el inicio.
+    """
+
+    def __init__(self, enabled=True, window=WINDOW):
+        self.enabled = enabled
+        self.overlay = False
+        self.window = window
+        self.samples = {}
+        self.totals = {}
+        self.counts = {}
+        self._local = threading.local()
+
+    def record(self, name, elapsed):
+        """
+        Añade una medida de 'elapsed' milisegundos. Se llama también desde
+        el hilo de la IA: append sobre un deque es atómico.
+        """
+        aliases = getattr(self._local, 'aliases', None)
+        if aliases:
+            name = aliases.get(name, name)
+        samples = self.samples.get(name)
+        if samples is None:
+            samples = self.samples.setdefault(name, deque(maxlen=self.window))
+        samples.append(elapsed)
+        self.totals[name] = self.totals.get(name, 0.0) + elapsed
+        self.counts[name] = self.counts.get(name, 0) + 1
+
+    @contextmanager
+    def aliased(self, name, alias):
+        """
+        Durante el bloque, las medidas de 'name' hechas en este hilo se
+        guardan como 'alias'.
+        """
+        aliases = getattr(self._local, 'aliases', None)
+        if aliases is None:
+            aliases = self._local.aliases = {}
+        previous = aliases.get(name)
+        aliases[name] = alias
+        try:
+            yield
+        finally:
+            if previous is None:
+                del aliases[name]
+            else:
+                aliases[name] = previous
+
+    def last(self, name):
+        """
+        Última medida de 'name' en ms, o None si aún no hay ninguna.
+        """
+        samples = self.samples.get(name)
+        return samples[-1] if samples else None
+
+    def percentile(self, name, fraction):
+        """
+        Percentil de las medidas de la ventana de 'name'.
+        """
+        return percentile(sorted(self.samples.get(name, ())), fraction)
+
+    def histogram(self, name, edges=HISTOGRAM_EDGES):
+        """
+        Reparto de las medidas de la ventana de 'name' por intervalos.
+
+        Returns:
+            list: Pares (límite superior en ms, medidas) por intervalo; el
+            último límite es None (medidas mayores que todos los límites).
+        """
+        counts = [0] * (len(edges) + 1)
+        for elapsed in self.samples.get(name, ()):
+            index = 0
+            while index < len(edges) and elapsed > edges[index]:
+                index += 1
+            counts[index] += 1
+        return list(zip(tuple(edges) + (None,), counts))
+
+    def summary(self):
+        """
+        Estadísticas de cada medida: llamadas y media desde el inicio,
+        percentiles, máximo e histograma de la ventana.
+        """
+        summary = {}
+        for name, samples in sorted(self.samples.items()):
+            values = sorted(samples)
+            count = self.counts[name]
+            summary[name] = {
+                'count': count,
+                'mean_ms': round(self.totals[name] / count, 4),
+                'last_ms': round(samples[-1], 4),
+                'p50_ms': round(percentile(values, 0.50), 4),
+                'p90_ms': round(percentile(values, 0.90), 4),
+                'p99_ms': round(percentile(values, 0.99), 4),
+                'max_ms': round(values[-1], 4),
+                'histogram': [[edge, hits] for edge, hits in self.histogram(name)
+                              if hits],
+            }
+        return summary
+
+    def dump(self, path):
+        """
+        Guarda el resumen en un fichero JSON.
+        """
+        with open(path, 'w', encoding='utf-8') as handle:
+            json.dump({'created': time.time(), 'window': self.window,
+                       'timings': self.summary()}, handle, indent=2)
+
+    def reset(self):
+        """
+        Borra todas las medidas.
+        """
+        self.samples.clear()
+        self.totals.clear()
+        self.counts.clear()
+
+
+PROFILER = Profiler()
+
+
+def get_profiler():
+    """
+    Devuelve el perfilador compartido por todo el proceso.
+    """
+    return PROFILER
+
+
+def profiled(name):
+    """
+    Decorador que registra en PROFILER el tiempo de cada llamada con 'name'.
+    """
+    def decorator(function):
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            if not PROFILER.enabled:
+                return function(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                PROFILER.record(name, (time.perf_counter() - start) * 1000)
+        return wrapper
+    return decorator
+
+
+def overlay_lines(fps, profiler=PROFILER):
+    """
+    Textos del panel en pantalla: FPS, percentiles del fotograma y latencia
+    de la última jugada de la CPU (y de su búsqueda en el motor).
+    """
+    def ms(value):
+        return f"{value:.0f} ms" if value is not None else "-"
+
+    return (f"FPS: {fps:5.1f}",
+            f"Fotograma p50/p99: {profiler.percentile('frame', 0.50):5.2f} / "
+            f"{profiler.percentile('frame', 0.99):5.2f} ms",
+            f"CPU: {ms(profiler.last('cpu_move'))} "
+            f"(motor: {ms(profiler.last('engine.get_best_move'))})")
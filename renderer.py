@@ -0,0 +1,195 @@
+"""
+Dibujado por rectángulos sucios del tablero.
+
+En lugar de repintar las 64 casillas, todas las piezas y el marcador en cada
+fotograma y volcar la pantalla completa, el BoardRenderer lleva la cuenta de
+las casillas que han cambiado (movimientos, selección, resaltados) y solo
+repinta y envía a pantalla esos rectángulos con pygame.display.update(rects).
+"""
+import pygame
+from profiler import PROFILER, overlay_lines, profiled
+from settings import (BOARD_SIZE, ROWS, COLS, SQUARE_SIZE, WHITE, BLACK,
+                      MARGIN_TOP, WIDTH, background_color)
+from text_cache import get_font
+
+ALL_SQUARES = frozenset((row, col) for row in range(ROWS) for col in range(COLS))
+BOARD_RECT = pygame.Rect(0, MARGIN_TOP, BOARD_SIZE, BOARD_SIZE)
+HEADER_RECT = pygame.Rect(0, 0, WIDTH, MARGIN_TOP)
+
+# Panel de tiempos (esquina inferior izquierda del tablero)
+OVERLAY_MARGIN = 8
+OVERLAY_FONT_SIZE = 24
+OVERLAY_COLOR = (255, 255, 255)
+OVERLAY_BACKGROUND = (0, 0, 0, 170)
+
+_board_surface = None
+
+
+def get_board_surface():
+    """
+    Devuelve el tablero vacío pre-renderizado en una sola superficie. Se
+    construye la primera vez y se comparte entre partidas.
+    """
+    global _board_surface
+    if _board_surface is None:
+        surface = pygame.Surface((BOARD_SIZE, BOARD_SIZE))
+        for row in range(ROWS):
+            for col in range(COLS):
+                color = WHITE if (row + col) % 2 == 0 else BLACK
+                pygame.draw.rect(surface, color,
+                                 (col * SQUARE_SIZE, row * SQUARE_SIZE,
+                                  SQUARE_SIZE, SQUARE_SIZE))
+        _board_surface = surface
+    return _board_surface
+
+
+def square_rect(row, col):
+    """
+    Rectángulo de pantalla de una casilla.
+    """
+    return pygame.Rect(col * SQUARE_SIZE, row * SQUARE_SIZE + MARGIN_TOP,
+                       SQUARE_SIZE, SQUARE_SIZE)
+
+
+@profiled('draw_highlighted_moves')
+def draw_highlighted_moves(screen, highlighted_moves):
+    """
+    Dibuja los movimientos destacados en la pantalla.
+
+    Parámetros:
+    - screen: La superficie de la pantalla donde se dibujan los movimientos.
+    - highlighted_moves: Una lista de movimientos destacados, cada uno representado como una tupla (fila, columna).
+
+    Esta función itera sobre los movimientos destacados y dibuja un círculo blanco en la posición correspondiente en el tablero.
+    """
+    if highlighted_moves:
+        for move in highlighted_moves:
+            center_x = move[1] * SQUARE_SIZE + SQUARE_SIZE // 2
+            center_y = move[0] * SQUARE_SIZE + SQUARE_SIZE // 2 + MARGIN_TOP
+            pygame.draw.circle(screen, (255, 255, 255),
+                               (center_x, center_y), 5)
+
+
+def draw_overlay(screen, fps, profiler=PROFILER):
+    """
+    Dibuja el panel de tiempos del perfilador sobre el tablero. Los textos
+    cambian en cada fotograma, así que no pasan por la caché de textos.
+
+    Returns:
+        pygame.Rect: Zona de pantalla ocupada por el panel.
+    """
+    font = get_font(OVERLAY_FONT_SIZE)
+    surfaces = [font.render(line, True, OVERLAY_COLOR)
+                for line in overlay_lines(fps, profiler)]
+    width = max(surface.get_width() for surface in surfaces) + 2 * OVERLAY_MARGIN
+    height = sum(surface.get_height() for surface in surfaces) + 2 * OVERLAY_MARGIN
+    rect = pygame.Rect(OVERLAY_MARGIN, BOARD_RECT.bottom - height - OVERLAY_MARGIN,
+                       width, height)
+
+    panel = pygame.Surface(rect.size, pygame.SRCALPHA)
+    panel.fill(OVERLAY_BACKGROUND)
+    screen.blit(panel, rect)
+    y = rect.y + OVERLAY_MARGIN
+    for surface in surfaces:
+        screen.blit(surface, (rect.x + OVERLAY_MARGIN, y))
+        y += surface.get_height()
+    return rect
+
+
+def squares_in_rect(rect):
+    """
+    Casillas (fila, columna) que se solapan con un rectángulo de pantalla.
+    """
+    return [square for square in ALL_SQUARES if square_rect(*square).colliderect(rect)]
+
+
+class BoardRenderer:
+    """
+    Registro de casillas sucias y dibujado incremental de una partida.
+
+    Atributos:
+    -----------
+    dirty : set
+        Casillas (fila, columna) que deben repintarse en el próximo fotograma.
+    full_redraw : bool
+        Si el próximo fotograma debe repintar toda la pantalla de juego.
+    hud_texts : tuple
+        Textos del marcador dibujados por última vez.
+    overlay_rect : pygame.Rect
+        Zona del panel de tiempos dibujado en el último fotograma, o None.
+    """
+
+    def __init__(self):
+        self.dirty = set()
+        self.full_redraw = True
+        self.hud_texts = None
+        self.overlay_rect = None
+
+    def mark_square(self, position):
+        """
+        Marca una casilla (fila, columna) para repintarla; ignora None.
+        """
+        if position is not None:
+            self.dirty.add(tuple(position))
+
+    def mark_squares(self, positions):
+        """
+        Marca varias casillas para repintarlas.
+        """
+        for position in positions:
+            self.mark_square(position)
+
+    def mark_all(self):
+        """
+        Fuerza el repintado completo en el próximo fotograma (por ejemplo,
+        después de dibujar encima del tablero).
+        """
+        self.full_redraw = True
+
+    def render(self, game, fps=None):
+        """
+        Repinta lo que ha cambiado desde el último fotograma y, si 'fps' no es
+        None, el panel de tiempos encima.
+
+        Returns:
+            list: Rectángulos de pantalla a actualizar (vacía si nada cambió).
+        """
+        screen = game.screen
+        # El panel es translúcido: las casillas que tapaba se repintan antes
+        # de volver a dibujarlo (o para borrarlo al ocultarlo)
+        if self.overlay_rect is not None:
+            self.mark_squares(squares_in_rect(self.overlay_rect))
+            self.overlay_rect = None
+
+        if self.full_redraw:
+            squares = ALL_SQUARES
+            pygame.draw.rect(screen, background_color, HEADER_RECT)
+            rects = [HEADER_RECT, BOARD_RECT]
+            self.hud_texts = None
+        else:
+            squares = self.dirty
+            rects = [square_rect(*square) for square in squares]
+
+        if squares:
+            game.draw_board(squares)
+            game.draw_cpu_move(squares)
+            game.draw_pieces(squares)
+            draw_highlighted_moves(screen, [move for move in game.highlighted_moves
+                                            if move in squares])
+
+        # El marcador solo se repinta cuando cambia el texto mostrado
+        hud_texts = game.time_texts()
+        if hud_texts != self.hud_texts:
+            game.draw_time()
+            self.hud_texts = hud_texts
+            if not self.full_redraw:
+                rects.append(game.time_rect)
+
+        if fps is not None:
+            self.overlay_rect = draw_overlay(screen, fps)
+            if not self.full_redraw:
+                rects.append(self.overlay_rect)
+
+        self.dirty = set()
+        self.full_redraw = False
+        return rects
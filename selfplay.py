@@ -0,0 +1,254 @@
+"""
+Partidas automáticas sin interfaz para medir el rendimiento de toda la pila
+(reglas, motores y pool de Stockfish).
+
+Cada jugador es una dificultad de DIFFICULTY (con el motor que indique, o el
+de --engine), 'random' (jugadas legales al azar) o 'greedy' (la jugada que
+deja la mejor evaluación inmediata). Las partidas se reparten entre procesos,
+cada resultado se escribe como una línea JSON y al final se muestran partidas
+por segundo, medios movimientos por segundo y percentiles de latencia por
+jugada de cada jugador.
+
+Uso:
+    python selfplay.py --games 20 --white FÁCIL --black random
+    python selfplay.py --games 8 --white MEDIO --black FÁCIL --swap --engine nativo
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import random
+import time
+
+from core import GameState
+from legal_moves import move_to_uci
+from profiler import percentile
+from settings import DIFFICULTY
+
+SIMPLE_PLAYERS = ('random', 'greedy')
+
+# Motores ya creados en cada proceso de trabajo, reutilizados entre partidas
+_ENGINES = {}
+
+
+def player_names():
+    """
+    Nombres válidos para --white y --black.
+    """
+    return list(DIFFICULTY) + list(SIMPLE_PLAYERS)
+
+
+def random_move(state, rng):
+    """
+    Elige una jugada legal al azar.
+    """
+    return rng.choice(state.legal_moves())
+
+
+def greedy_move(state, rng):
+    """
+    Elige la jugada que deja la mejor evaluación estática tras moverla
+    (empates al azar).
+    """
+    from native_engine import evaluate
+
+    board = state.position
+    best_score = None
+    best_moves = []
+    for move in state.legal_moves():
+        undo = board.make_move(move)
+        score = -evaluate(board)
+        board.unmake_move(undo)
+        if best_score is None or score > best_score:
+            best_score = score
+            best_moves = [move]
+        elif score == best_score:
+            best_moves.append(move)
+    return rng.choice(best_moves)
+
+
+def get_engine(name, engine_type=None, movetime=None):
+    """
+    Devuelve el motor del proceso para una dificultad, creándolo la primera
+    vez y reiniciando su posición en las siguientes.
+    """
+    cache_key = (name, engine_type, movetime)
+    engine = _ENGINES.get(cache_key)
+    if engine is None:
+        from ai_engine import create_engine
+
+        difficulty = dict(DIFFICULTY[name])
+        if engine_type:
+            difficulty['engine'] = engine_type
+        if movetime:
+            difficulty['time'] = movetime
+        engine = create_engine(difficulty)
+        _ENGINES[cache_key] = engine
+    else:
+        engine.reset_position()
+    return engine
+
+
+def play_game(task):
+    """
+    Juega una partida completa. Se ejecuta en los procesos de trabajo.
+
+    Args:
+        task (dict): Índice de partida, jugadores, semilla y opciones
+
+    Returns:
+        dict: Resultado de la partida, jugadas y latencias por jugada (ms)
+    """
+    rng = random.Random(task['seed'])
+    names = {'white': task['white'], 'black': task['black']}
+    engines = {}
+    for color, name in names.items():
+        if name not in SIMPLE_PLAYERS:
+            engines[color] = get_engine(name, task['engine'], task['movetime'])
+    # Con el mismo jugador en los dos bandos ambos comparten motor
+    unique_engines = list({id(engine): engine for engine in engines.values()}.values())
+
+    # Contadores de la caché de análisis antes de la partida (por proceso)
+    caches = {id(cache): cache for cache in
+              (getattr(engine, 'eval_cache', None) for engine in unique_engines)
+              if cache is not None}
+    cache_before = {key: cache.stats() for key, cache in caches.items()}
+
+    state = GameState()
+    latencies = {'white': [], 'black': []}
+    start = time.perf_counter()
+
+    while not state.game_over and len(state.move_stack) < task['max_plies']:
+        color = state.current_turn
+        name = names[color]
+        move_start = time.perf_counter()
+        if name == 'random':
+            uci = move_to_uci(random_move(state, rng))
+        elif name == 'greedy':
+            uci = move_to_uci(greedy_move(state, rng))
+        else:
+            uci = engines[color].get_best_move([])
+        latencies[color].append((time.perf_counter() - move_start) * 1000)
+
+        if uci is None:
+            break
+        state.play_uci(uci)
+        for engine in unique_engines:
+            engine.make_move(uci)
+
+    cache_hits = cache_misses = 0
+    for key, cache in caches.items():
+        stats, before = cache.stats(), cache_before[key]
+        cache_hits += (stats['memory_hits'] + stats['disk_hits'] -
+                       before['memory_hits'] - before['disk_hits'])
+        cache_misses += stats['misses'] - before['misses']
+
+    if state.winner == 'white':
+        result = '1-0'
+    elif state.winner == 'black':
+        result = '0-1'
+    elif state.game_over:
+        result = '1/2-1/2'
+    else:
+        result = '*'  # Límite de medios movimientos alcanzado
+
+    return {
+        'game': task['game'],
+        'white': names['white'],
+        'black': names['black'],
+        'result': result,
+        'reason': state.result_reason,
+        'plies': len(state.move_stack),
+        'seconds': round(time.perf_counter() - start, 4),
+        'moves': state.uci_moves(),
+        'latency_ms': {color: [round(value, 3) for value in values]
+                       for color, values in latencies.items()},
+        'eval_cache': {'hits': cache_hits, 'misses': cache_misses},
+    }
+
+
+def build_tasks(args):
+    """
+    Genera las partidas a jugar, alternando colores con --swap.
+    """
+    tasks = []
+    for game in range(args.games):
+        white, black = args.white, args.black
+        if args.swap and game % 2:
+            white, black = black, white
+        tasks.append({
+            'game': game,
+            'white': white,
+            'black': black,
+            'seed': args.seed + game,
+            'engine': args.engine,
+            'movetime': args.movetime,
+            'max_plies': args.max_plies,
+        })
+    return tasks
+
+
+def report(results, elapsed):
+    """
+    Muestra el rendimiento global y las latencias de cada jugador.
+    """
+    plies = sum(result['plies'] for result in results)
+    print(f"\n{len(results)} partidas, {plies} medios movimientos en {elapsed:.2f}s")
+    print(f"{len(results) / elapsed:.2f} partidas/s, {plies / elapsed:.1f} medios movimientos/s")
+
+    scores = {}
+    for result in results:
+        scores[result['result']] = scores.get(result['result'], 0) + 1
+    print("Resultados: " + ", ".join(f"{key} x{count}" for key, count in sorted(scores.items())))
+
+    hits = sum(result['eval_cache']['hits'] for result in results)
+    misses = sum(result['eval_cache']['misses'] for result in results)
+    if hits + misses:
+        print(f"Caché de análisis: {hits} aciertos, {misses} fallos "
+              f"({hits / (hits + misses):.1%} de acierto)")
+
+    by_player = {}
+    for result in results:
+        for color in ('white', 'black'):
+            by_player.setdefault(result[color], []).extend(result['latency_ms'][color])
+    print("\nLatencia por jugada (ms):")
+    for name, values in sorted(by_player.items()):
+        values.sort()
+        print(f"  {name:<12} n={len(values):<6} p50={percentile(values, 0.5):8.2f} "
+              f"p90={percentile(values, 0.9):8.2f} p99={percentile(values, 0.99):8.2f} "
+              f"max={values[-1] if values else 0.0:8.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Partidas automáticas sin interfaz")
+    parser.add_argument('--games', type=int, default=10)
+    parser.add_argument('--white', choices=player_names(), default='FÁCIL')
+    parser.add_argument('--black', choices=player_names(), default='random')
+    parser.add_argument('--swap', action='store_true',
+                        help="alternar colores entre partidas")
+    parser.add_argument('--engine', choices=('stockfish', 'nativo'),
+                        help="forzar el motor de las dificultades")
+    parser.add_argument('--movetime', type=int,
+                        help="tiempo por jugada de los motores en ms")
+    parser.add_argument('--max-plies', type=int, default=300)
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', default='selfplay.jsonl')
+    args = parser.parse_args()
+
+    tasks = build_tasks(args)
+    results = []
+    start = time.perf_counter()
+    with open(args.output, 'w', encoding='utf-8') as output, \
+            multiprocessing.Pool(min(args.workers, len(tasks)) or 1) as pool:
+        for result in pool.imap_unordered(play_game, tasks):
+            output.write(json.dumps(result, ensure_ascii=False) + '\n')
+            output.flush()
+            results.append(result)
+            print(f"Partida {result['game']}: {result['white']} - {result['black']} "
+                  f"{result['result']} ({result['plies']} medios movimientos)")
+    report(results, time.perf_counter() - start)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,390 @@
+"""
+Servidor asyncio de partidas contra el motor, para muchas partidas a la vez.
+
+Cada conexión TCP (localhost) intercambia líneas JSON. Las partidas viven en
+memoria como GameState, las jugadas del cliente se validan con las reglas del
+proyecto y las respuestas del motor se calculan en un conjunto acotado de
+procesos de trabajo (los motores se reutilizan entre peticiones, como en
+selfplay.py).
+
+Peticiones (una por línea; 'id' opcional se devuelve tal cual):
+    {"op": "new", "difficulty": "FÁCIL", "color": "white", "fen": "..."}
+    {"op": "move", "game": 1, "move": "e2e4"}
+    {"op": "close", "game": 1}
+
+Respuestas:
+    {"ok": true, "game": 1, "reply": "e7e5", "fen": "...", "game_over": false,
+     "winner": null, "reason": null}
+    {"ok": false, "error": "..."}
+
+Contrapresión: cada partida admite como mucho max_pending peticiones en cola
+(las demás se rechazan con 'ocupada'), cada conexión deja de leer del socket
+cuando tiene max_pending_per_connection peticiones en curso, y las escrituras
+esperan a que el socket drene.
+
+Uso:
+    python server.py --port 8765 --workers 4 --engine nativo
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from bitboard import START_FEN
+from core import GameState
+from settings import DIFFICULTY
+
+DEFAULT_PORT = 8765
+
+
+def engine_reply(difficulty, engine_type, movetime, start_fen, moves):
+    """
+    Calcula la respuesta del motor. Se ejecuta en los procesos de trabajo.
+
+    Args:
+        difficulty (str): Clave de DIFFICULTY
+        engine_type (str): Motor a forzar ('stockfish', 'nativo' o None)
+        movetime (int): Tiempo por jugada en ms (None para el de la dificultad)
+        start_fen (str): Posición inicial de la partida
+        moves (list): Jugadas de la partida en notación UCI
+
+    Returns:
+        str: Jugada del motor en notación UCI, o None si no hay ninguna.
+    """
+    from selfplay import get_engine
+
+    engine = get_engine(difficulty, engine_type, movetime)
+    engine.reset_position(start_fen)
+    return engine.get_best_move(moves)
+
+
+class ServerGame:
+    """
+    Partida alojada en el servidor.
+
+    Atributos:
+    -----------
+    game_id : int
+        Identificador de la partida.
+    state : GameState
+        Reglas y posición de la partida.
+    difficulty : str
+        Dificultad del motor rival (clave de DIFFICULTY).
+    engine_color : str
+        Color que juega el motor ('white' o 'black').
+    lock : asyncio.Lock
+        Serializa las peticiones de la partida.
+    pending : int
+        Peticiones de la partida en cola o en curso.
+    """
+
+    def __init__(self, game_id, difficulty, engine_color, fen=START_FEN):
+        self.game_id = game_id
+        self.state = GameState()
+        self.state.reset(fen)
+        self.difficulty = difficulty
+        self.engine_color = engine_color
+        self.lock = asyncio.Lock()
+        self.pending = 0
+
+    def snapshot(self):
+        """
+        Devuelve el estado visible de la partida para las respuestas.
+        """
+        state = self.state
+        return {
+            'game': self.game_id,
+            'fen': state.fen(),
+            'turn': state.current_turn,
+            'game_over': state.game_over,
+            'winner': state.winner,
+            'reason': state.result_reason,
+        }
+
+
+class GameServer:
+    """
+    Servidor de partidas con un conjunto acotado de procesos de motor.
+
+    Atributos:
+    -----------
+    host : str
+        Dirección de escucha.
+    port : int
+        Puerto de escucha (0 elige uno libre; tras start() es el real).
+    workers : int
+        Procesos de motor calculando a la vez.
+    engine_type : str
+        Motor a forzar en todas las dificultades (None para el configurado).
+    movetime : int
+        Tiempo por jugada del motor en ms (None para el de la dificultad).
+    max_games : int
+        Partidas simultáneas máximas.
+    max_pending : int
+        Peticiones máximas en cola por partida.
+    max_pending_per_connection : int
+        Peticiones máximas en curso por conexión antes de dejar de leer.
+    games : dict
+        Partidas abiertas por identificador.
+    moves_served : int
+        Jugadas del cliente procesadas (para métricas).
+    """
+
+    def __init__(self, host='127.0.0.1', port=DEFAULT_PORT, workers=None,
+                 engine_type=None, movetime=None, max_games=1000, max_pending=2,
+                 max_pending_per_connection=64):
+        self.host = host
+        self.port = port
+        self.workers = workers or os.cpu_count() or 1
+        self.engine_type = engine_type
+        self.movetime = movetime
+        self.max_games = max_games
+        self.max_pending = max_pending
+        self.max_pending_per_connection = max_pending_per_connection
+        self.games = {}
+        self.moves_served = 0
+        self._ids = itertools.count(1)
+        self._executor = None
+        self._engine_slots = None
+        self._server = None
+        self._connections = {}
+
+    async def start(self):
+        """
+        Arranca los procesos de motor y empieza a aceptar conexiones.
+        """
+        # Con 'spawn' los procesos no heredan los sockets abiertos: con fork un
+        # proceso de trabajo mantendría vivas las conexiones cerradas
+        self._executor = ProcessPoolExecutor(
+            self.workers, mp_context=multiprocessing.get_context('spawn'))
+        # Sin este límite las peticiones se amontonarían en la cola del
+        # executor; así esperan en el bucle y se atienden en orden
+        self._engine_slots = asyncio.Semaphore(self.workers)
+        self._server = await asyncio.start_server(self._handle_connection,
+                                                  self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def serve_forever(self):
+        """
+        Atiende conexiones hasta que se cancela.
+        """
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def close(self):
+        """
+        Cierra el servidor y los procesos de motor.
+        """
+        if self._server is not None:
+            self._server.close()
+            # Cerrar los sockets termina las conexiones abiertas sin cancelarlas
+            for writer in list(self._connections.values()):
+                writer.close()
+            await asyncio.gather(*self._connections, return_exceptions=True)
+            await self._server.wait_closed()
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+        self.games.clear()
+
+    async def _handle_connection(self, reader, writer):
+        """
+        Lee peticiones de una conexión y las atiende de forma concurrente.
+        Las partidas creadas por la conexión se cierran al desconectarse.
+        """
+        self._connections[asyncio.current_task()] = writer
+        owned = set()
+        in_flight = asyncio.Semaphore(self.max_pending_per_connection)
+        write_lock = asyncio.Lock()
+        tasks = set()
+
+        async def respond(message):
+            async with write_lock:
+                writer.write((json.dumps(message, ensure_ascii=False) + '\n').encode())
+                await writer.drain()
+
+        async def process(line):
+            request = {}
+            try:
+                try:
+                    request = json.loads(line)
+                    if not isinstance(request, dict):
+                        raise ValueError("La petición debe ser un objeto JSON")
+                    response = await self._dispatch(request, owned)
+                except KeyError as error:
+                    response = {'ok': False, 'error': f"Falta el campo {error}"}
+                except (ValueError, TypeError) as error:
+                    response = {'ok': False, 'error': str(error)}
+                except Exception as error:
+                    # Cualquier otro fallo (p. ej. un proceso de motor caído)
+                    # también se responde: el cliente espera su 'id'
+                    response = {'ok': False,
+                                'error': f"Error interno: {error!r}"}
+                if isinstance(request, dict) and 'id' in request:
+                    response['id'] = request['id']
+                await respond(response)
+            except ConnectionError:
+                pass
+            finally:
+                in_flight.release()
+
+        try:
+            while True:
+                # Con demasiadas peticiones en curso se deja de leer el socket
+                await in_flight.acquire()
+                line = await reader.readline()
+                if not line:
+                    in_flight.release()
+                    break
+                task = asyncio.create_task(process(line))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+        except ConnectionError:
+            pass
+        finally:
+            for task in tasks:
+                task.cancel()
+            for game_id in owned:
+                self.games.pop(game_id, None)
+            writer.close()
+            self._connections.pop(asyncio.current_task(), None)
+
+    async def _dispatch(self, request, owned):
+        """
+        Atiende una petición ya decodificada.
+
+        Raises:
+            ValueError: Si la petición o la jugada no son válidas.
+            KeyError: Si falta un campo obligatorio.
+        """
+        op = request['op']
+        if op == 'new':
+            return await self._new_game(request, owned)
+        if op == 'move':
+            return await self._play(request)
+        if op == 'close':
+            # Solo se cierran las partidas creadas por esta conexión
+            if request['game'] not in owned:
+                raise ValueError(f"Partida desconocida: {request['game']}")
+            self.games.pop(request['game'], None)
+            owned.discard(request['game'])
+            return {'ok': True, 'game': request['game']}
+        raise ValueError(f"Operación desconocida: {op}")
+
+    async def _new_game(self, request, owned):
+        """
+        Crea una partida; si el motor lleva blancas responde ya con su jugada.
+        """
+        if len(self.games) >= self.max_games:
+            raise ValueError("Servidor lleno")
+        difficulty = request.get('difficulty', 'FÁCIL')
+        if difficulty not in DIFFICULTY:
+            raise ValueError(f"Dificultad desconocida: {difficulty}")
+        color = request.get('color', 'white')
+        if color not in ('white', 'black'):
+            raise ValueError(f"Color desconocido: {color}")
+
+        game_id = next(self._ids)
+        game = ServerGame(game_id, difficulty,
+                          'black' if color == 'white' else 'white',
+                          request.get('fen') or START_FEN)
+        self.games[game_id] = game
+        owned.add(game_id)
+
+        async with game.lock:
+            try:
+                reply = await self._engine_turn(game)
+            except Exception:
+                # Sin la jugada del motor la partida no podría continuar
+                self.games.pop(game_id, None)
+                owned.discard(game_id)
+                raise
+        return dict(game.snapshot(), ok=True, reply=reply)
+
+    async def _play(self, request):
+        """
+        Valida y aplica la jugada del cliente y devuelve la respuesta del motor.
+        """
+        game = self.games.get(request['game'])
+        if game is None:
+            raise ValueError(f"Partida desconocida: {request['game']}")
+        if game.pending >= self.max_pending:
+            raise ValueError("Partida ocupada: espera a la respuesta anterior")
+
+        game.pending += 1
+        try:
+            async with game.lock:
+                state = game.state
+                if state.game_over:
+                    raise ValueError("La partida ha terminado")
+                if state.current_turn == game.engine_color:
+                    raise ValueError("No es tu turno")
+                state.play_uci(request['move'])
+                try:
+                    reply = await self._engine_turn(game)
+                except Exception:
+                    # Se deshace la jugada del cliente: si no, la partida
+                    # quedaría esperando al motor y no admitiría más jugadas
+                    state.undo()
+                    raise
+                self.moves_served += 1
+                return dict(game.snapshot(), ok=True, reply=reply)
+        finally:
+            game.pending -= 1
+
+    async def _engine_turn(self, game):
+        """
+        Si le toca al motor, calcula su jugada en un proceso de trabajo y la
+        aplica.
+
+        Returns:
+            str: Jugada del motor en notación UCI, o None si no movió.
+        """
+        state = game.state
+        if state.game_over or state.current_turn != game.engine_color:
+            return None
+        async with self._engine_slots:
+            reply = await asyncio.get_running_loop().run_in_executor(
+                self._executor, engine_reply, game.difficulty, self.engine_type,
+                self.movetime, state.start_fen, state.uci_moves())
+        # La partida pudo cerrarse mientras el motor pensaba
+        if reply is not None and game.game_id in self.games:
+            state.play_uci(reply)
+        return reply
+
+
+async def run_server(args):
+    server = GameServer(args.host, args.port, args.workers, args.engine,
+                        args.movetime, args.max_games, args.max_pending)
+    await server.start()
+    print(f"Servidor de partidas en {server.host}:{server.port} "
+          f"({server.workers} procesos de motor)")
+    try:
+        await server.serve_forever()
+    finally:
+        await server.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Servidor de partidas asyncio")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--engine', choices=('stockfish', 'nativo'),
+                        help="forzar el motor de las dificultades")
+    parser.add_argument('--movetime', type=int,
+                        help="tiempo por jugada del motor en ms")
+    parser.add_argument('--max-games', type=int, default=1000)
+    parser.add_argument('--max-pending', type=int, default=2,
+                        help="peticiones en cola por partida")
+    args = parser.parse_args()
+    try:
+        asyncio.run(run_server(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
@@ -1,5 +1,3 @@
-from button import Button
-
 # Dimensiones
 BOARD_SIZE = 800
 TIME_HEIGHT = 40  # Espacio para el tiempo
@@ -25,16 +23,6 @@ button_width = 280
 button_height = 60
 center_x = WIDTH // 2 - button_width // 2
 
-pvp_button = Button(center_x, HEIGHT//2 - button_height - 20,
-                    button_width, button_height,
-                    "JUGADOR vs JUGADOR",
-                    primary_color, secondary_color)
-
-pvc_button = Button(center_x, HEIGHT//2 + 20,
-                    button_width, button_height,
-                    "JUGADOR vs CPU",
-                    primary_color, secondary_color)
-
 # MOVES (Movimientos posibles para las piezas)
 knight_moves = [
     (2, 1), (2, -1), (-2, 1), (-2, -1),
@@ -53,18 +41,37 @@ rook_moves = [(1, 0), (-1, 0), (0, 1), (0, -1)]
 # Tiempo inicial para cada jugador (en segundos)
 INITIAL_TIME = 600  # 10 minutos
 
+# Libro de aperturas Polyglot (opcional: sin fichero se busca desde la jugada 1)
+BOOK_PATH = 'assets/books/book.bin'
+
+# Pensar durante el turno del jugador en la respuesta que se espera de él
+PONDER = True
+
+# Tiempos del juego (ver profiler): fichero JSON que se escribe al salir
+# (None para no escribirlo); F3 muestra el panel de tiempos en pantalla
+PROFILE_PATH = 'profile.json'
+
+# Caché persistente de análisis de los motores (None para desactivarla)
+EVAL_CACHE_PATH = 'eval_cache.sqlite3'
+
 DIFFICULTY = {
     'FÁCIL': {
         'name': "PRINCIPIANTE",
+        'engine': 'stockfish',  # 'stockfish' o 'nativo' (motor alfa-beta propio)
+        'native_depth': 2,  # Profundidad del motor nativo
+        'book_variety': 1.5,  # 0 = jugada más fuerte del libro, más = más variedad
         'skill_level': 5,
         'depth': 5,
-        'time': 1000,
+        'time': 1000,  # Tiempo base por jugada en ms (ver time_manager)
         'description': "Para jugadores nuevos",
         'color': (46, 139, 87),  # Verde suave
         'hover_color': (32, 178, 170)  # Turquesa
     },
     'MEDIO': {
         'name': "INTERMEDIO",
+        'engine': 'stockfish',
+        'native_depth': 3,
+        'book_variety': 1.0,
         'skill_level': 10,
         'depth': 10,
         'time': 2000,
@@ -74,6 +81,9 @@ DIFFICULTY = {
     },
     'DIFÍCIL': {
         'name': "AVANZADO",
+        'engine': 'stockfish',
+        'native_depth': 4,
+        'book_variety': 0.5,
         'skill_level': 15,
         'depth': 15,
         'time': 3000,
@@ -83,6 +93,9 @@ DIFFICULTY = {
     },
     'MAESTRO': {
         'name': "MAESTRO",
+        'engine': 'stockfish',
+        'native_depth': 5,
+        'book_variety': 0.0,
         'skill_level': 20,
         'depth': 20,
         'time': 4000,
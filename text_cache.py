@@ -0,0 +1,82 @@
+"""
+Caché de fuentes y de textos renderizados.
+
+Crear un pygame.font.Font y llamar a render() en cada fotograma aparece en los
+perfiles del bucle de dibujado (marcador, botones y títulos de los menús). Las
+fuentes se crean una sola vez por (nombre, tamaño) y las superficies de texto
+se guardan por (texto, tamaño, color, fuente) con expulsión LRU, de modo que
+los textos que no cambian solo se renderizan la primera vez.
+"""
+from collections import OrderedDict
+from functools import lru_cache
+
+import pygame
+
+
+@lru_cache(maxsize=None)
+def get_font(size, name=None):
+    """
+    Devuelve la fuente compartida para un tamaño (y fichero, None para la
+    fuente por defecto de pygame).
+    """
+    return pygame.font.Font(name, size)
+
+
+class TextCache:
+    """
+    Superficies de texto renderizadas con expulsión de las menos usadas.
+
+    Atributos:
+    -----------
+    max_size : int
+        Número máximo de superficies guardadas.
+    hits : int
+        Consultas servidas desde la caché.
+    misses : int
+        Consultas que han tenido que renderizar el texto.
+    """
+
+    def __init__(self, max_size=256):
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._surfaces = OrderedDict()
+
+    def __len__(self):
+        return len(self._surfaces)
+
+    def render(self, text, size, color, font_name=None, antialias=True):
+        """
+        Devuelve la superficie del texto, renderizándola solo si no está en
+        caché. La superficie es compartida: no debe modificarse.
+        """
+        key = (text, size, tuple(color), font_name, antialias)
+        surface = self._surfaces.get(key)
+        if surface is not None:
+            self._surfaces.move_to_end(key)
+            self.hits += 1
+            return surface
+
+        self.misses += 1
+        surface = get_font(size, font_name).render(text, antialias, color)
+        self._surfaces[key] = surface
+        if len(self._surfaces) > self.max_size:
+            self._surfaces.popitem(last=False)
+        return surface
+
+    def clear(self):
+        """
+        Vacía la caché (las fuentes se conservan).
+        """
+        self._surfaces.clear()
+
+
+# Caché compartida por el marcador, los botones y los menús
+TEXT_CACHE = TextCache()
+
+
+def render_text(text, size, color, font_name=None):
+    """
+    Atajo para renderizar con la caché compartida.
+    """
+    return TEXT_CACHE.render(text, size, color, font_name)
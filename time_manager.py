@@ -0,0 +1,47 @@
+"""
+Reparto del reloj entre las jugadas de los motores.
+
+El tiempo de cada jugada parte del tiempo base de la dificultad ('time' en
+DIFFICULTY, en ms) y se recorta según lo que queda en el reloj: se reparte el
+tiempo restante entre las jugadas que se espera que queden y nunca se gasta en
+una sola jugada más de una fracción del reloj. Los motores buscan con ese
+tiempo como límite duro (movetime de Stockfish, plazo del motor nativo), así
+que la latencia de cada jugada de la CPU queda acotada.
+"""
+
+# Jugadas que se espera que dure una partida y mínimo de jugadas por jugar
+EXPECTED_MOVES = 40
+MIN_MOVES_TO_GO = 10
+
+# Fracción máxima del reloj restante para una jugada
+MAX_CLOCK_FRACTION = 0.2
+
+# Margen por jugada para la comunicación con el motor y el dibujado (ms)
+MOVE_OVERHEAD = 50
+
+# Tiempo mínimo de búsqueda (ms)
+MIN_MOVE_TIME = 10
+
+
+def move_time(remaining, base_time, ply, increment=0):
+    """
+    Calcula el tiempo de búsqueda de una jugada.
+
+    Args:
+        remaining (float): Tiempo restante en el reloj del motor (segundos),
+            o None si la partida no tiene reloj
+        base_time (int): Tiempo base por jugada de la dificultad (ms)
+        ply (int): Medios movimientos jugados en la partida
+        increment (float): Incremento por jugada (segundos)
+
+    Returns:
+        int: Tiempo máximo de búsqueda en milisegundos.
+    """
+    if remaining is None:
+        return max(MIN_MOVE_TIME, int(base_time))
+
+    remaining_ms = max(0.0, remaining * 1000 - MOVE_OVERHEAD)
+    moves_to_go = max(MIN_MOVES_TO_GO, EXPECTED_MOVES - ply // 2)
+    share = remaining_ms / moves_to_go + increment * 1000
+    budget = min(base_time, share, remaining_ms * MAX_CLOCK_FRACTION)
+    return max(MIN_MOVE_TIME, int(budget))
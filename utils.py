@@ -2,13 +2,107 @@ import pygame
 import os
 from settings import SQUARE_SIZE
 
+PIECE_NAMES = ["black_pawn", "black_rook", "black_knight", "black_bishop", "black_queen", "black_king",
+               "white_pawn", "white_rook", "white_knight", "white_bishop", "white_queen", "white_king"]
+
+# Resoluciones disponibles en assets/images/imgs-<tamaño>px/
+IMAGE_SIZES = (80, 128)
+IMAGE_DIR = "assets/images/imgs-{size}px"
+
+
+def source_image_size(target=SQUARE_SIZE):
+    """
+    Elige la resolución de origen más cercana a 'target' que no obligue a
+    ampliar la imagen (ampliar emborrona las piezas); si todas son menores,
+    la mayor.
+    """
+    larger = [size for size in IMAGE_SIZES if size >= target]
+    return min(larger) if larger else max(IMAGE_SIZES)
+
+
+class SpriteAtlas:
+    """
+    Las doce piezas escaladas a un tamaño y empaquetadas en una sola
+    superficie (una fila de casillas), convertida al formato de la pantalla.
+
+    Atributos:
+    -----------
+    size : int
+        Lado de cada pieza en píxeles.
+    surface : pygame.Surface
+        Superficie con todas las piezas.
+    sprites : dict
+        Subsuperficie de cada pieza por nombre (comparten los píxeles del
+        atlas).
+    converted : bool
+        Si el atlas ya está en el formato de la pantalla.
+    """
+
+    def __init__(self, size=SQUARE_SIZE):
+        self.size = size
+        self.converted = False
+        self.surface = pygame.Surface((size * len(PIECE_NAMES), size),
+                                      pygame.SRCALPHA)
+        source_dir = IMAGE_DIR.format(size=source_image_size(size))
+
+        for index, name in enumerate(PIECE_NAMES):
+            path = os.path.join(source_dir, f"{name}.png")
+            if os.path.exists(path):  # si no existe sale
+                image = pygame.image.load(path)
+                if image.get_size() != (size, size):
+                    image = pygame.transform.smoothscale(image, (size, size))
+                # Copia exacta de los píxeles (y su alfa) sobre el atlas vacío
+                self.surface.blit(image, (index * size, 0),
+                                  special_flags=pygame.BLEND_RGBA_MAX)
+            else:
+                print(f"Warning: {path} does not exist.")
+        self._split()
+        self.convert()
+
+    def _split(self):
+        """
+        Crea las subsuperficies de cada pieza sobre el atlas actual.
+        """
+        size = self.size
+        self.sprites = {name: self.surface.subsurface((index * size, 0, size, size))
+                        for index, name in enumerate(PIECE_NAMES)}
+
+    def convert(self):
+        """
+        Convierte el atlas al formato de píxel de la pantalla (una sola vez),
+        para que cada blit no tenga que convertirlo. Sin pantalla creada no
+        hace nada y se reintenta en el siguiente get_sprite_atlas.
+        """
+        if self.converted or pygame.display.get_surface() is None:
+            return
+        self.surface = self.surface.convert_alpha()
+        self._split()
+        self.converted = True
+
+
+_atlases = {}
+
+
+def get_sprite_atlas(size=SQUARE_SIZE):
+    """
+    Devuelve el atlas compartido por todas las partidas del proceso,
+    cargándolo la primera vez.
+    """
+    atlas = _atlases.get(size)
+    if atlas is None:
+        atlas = _atlases[size] = SpriteAtlas(size)
+    else:
+        atlas.convert()
+    return atlas
+
 
 def load_images():
     """
-    Carga imágenes de piezas de ajedrez desde archivos PNG y las escala al tamaño de los cuadrados del tablero.
+    Devuelve las imágenes de piezas de ajedrez escaladas al tamaño de los cuadrados del tablero.
 
-    La función busca imágenes de piezas de ajedrez en la carpeta "assets/images/imgs-128px/" y las carga en un diccionario.
-    Las imágenes se escalan al tamaño definido por la constante SQUARE_SIZE.
+    Las imágenes se leen una sola vez por proceso (ver get_sprite_atlas) de la carpeta
+    "assets/images/" con la resolución más adecuada para SQUARE_SIZE, y se guardan ya
+    convertidas al formato de la pantalla en un atlas común.
 
     Return:
         dict: Un diccionario donde las claves son los nombres de las piezas y los valores son las imágenes escaladas.
@@ -16,19 +110,4 @@ def load_images():
     Advertencia:
         Si alguna imagen no se encuentra en la ruta especificada, se imprimirá una advertencia en la consola.
     """
-
-    pieces = {}
-    names = ["black_pawn", "black_rook", "black_knight", "black_bishop", "black_queen", "black_king",
-             "white_pawn", "white_rook", "white_knight", "white_bishop", "white_queen", "white_king"]
-
-    for name in names:
-        path = os.path.join(f"assets/images/imgs-128px/{name}.png")
-        if os.path.exists(path):  # si no existe sale
-            image = pygame.image.load(path)
-            pieces[name] = pygame.transform.scale(
-                image, (SQUARE_SIZE, SQUARE_SIZE))  # redimensionamos la imagen
-
-        else:
-            print(f"Warning: {path} does not exist.")
-
-    return pieces
+    return get_sprite_atlas().sprites
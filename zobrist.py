@@ -0,0 +1,105 @@
+"""
+Claves Zobrist para identificar posiciones y detección de repeticiones.
+
+Cada posición se resume en un entero de 64 bits obtenido como XOR de claves
+aleatorias (fijas entre ejecuciones) por pieza y casilla, derechos de enroque,
+columna de captura al paso y turno. El BitBoard mantiene su clave de forma
+incremental, de modo que puede usarse como índice de cachés.
+"""
+import random
+
+_rng = random.Random(0x5A0B1257)
+
+# ZOBRIST_PIECES[índice de pieza][casilla]
+ZOBRIST_PIECES = tuple(tuple(_rng.getrandbits(64) for _ in range(64))
+                       for _ in range(12))
+# Una clave por combinación de derechos de enroque (0..15)
+ZOBRIST_CASTLING = tuple(_rng.getrandbits(64) for _ in range(16))
+# Una clave por columna de la casilla de captura al paso
+ZOBRIST_EP = tuple(_rng.getrandbits(64) for _ in range(8))
+# Se aplica cuando mueven las negras
+ZOBRIST_BLACK_TO_MOVE = _rng.getrandbits(64)
+
+del _rng
+
+
+def compute_key(board):
+    """
+    Calcula desde cero la clave Zobrist de una posición.
+    """
+    key = ZOBRIST_CASTLING[board.castling]
+    for sq, index in enumerate(board.mailbox):
+        if index is not None:
+            key ^= ZOBRIST_PIECES[index][sq]
+    if board.ep_square is not None:
+        key ^= ZOBRIST_EP[board.ep_square & 7]
+    if board.turn:
+        key ^= ZOBRIST_BLACK_TO_MOVE
+    return key
+
+
+class PositionHistory:
+    """
+    Historial de claves de la partida, con un contador por clave de las
+    posiciones desde el último movimiento irreversible (captura o movimiento
+    de peón) para consultar repeticiones en tiempo constante.
+
+    Atributos:
+    -----------
+    keys : list
+        Claves de todas las posiciones registradas, en orden.
+    cuts : list
+        Índices de 'keys' en los que hubo un movimiento irreversible.
+    counts : dict
+        Número de apariciones de cada clave desde el último corte.
+    """
+
+    def __init__(self, key=None):
+        self.keys = []
+        self.cuts = []
+        self.counts = {}
+        if key is not None:
+            self.push(key, irreversible=True)
+
+    def push(self, key, irreversible=False):
+        """
+        Registra la posición alcanzada. Un movimiento irreversible corta el
+        historial: ninguna posición anterior puede volver a repetirse.
+        """
+        if irreversible:
+            self.cuts.append(len(self.keys))
+            self.counts = {}
+        self.keys.append(key)
+        self.counts[key] = self.counts.get(key, 0) + 1
+
+    def pop(self):
+        """
+        Retira la última posición registrada (al deshacer un movimiento) y
+        devuelve su clave.
+        """
+        key = self.keys.pop()
+        if self.cuts and self.cuts[-1] == len(self.keys):
+            # Se deshace un corte: recontar desde el corte anterior
+            self.cuts.pop()
+            self.counts = {}
+            for previous in self.keys[self.cuts[-1] if self.cuts else 0:]:
+                self.counts[previous] = self.counts.get(previous, 0) + 1
+        else:
+            remaining = self.counts[key] - 1
+            if remaining:
+                self.counts[key] = remaining
+            else:
+                del self.counts[key]
+        return key
+
+    def repetitions(self, key):
+        """
+        Devuelve cuántas veces ha aparecido la posición desde el último corte.
+        """
+        return self.counts.get(key, 0)
+
+    def is_threefold(self, key):
+        """
+        Indica si la posición se ha repetido tres veces.
+        """
+        return self.counts.get(key, 0) >= 3